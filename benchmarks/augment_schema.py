@@ -0,0 +1,88 @@
+"""
+ * Startup cost of schema augmentation: extending the GraphQLSchema with the generated mutations
+ * compared with the previous print_schema / re-parse / build_ast_schema round-trip, on generated schemas.
+ *
+ *   python -m benchmarks.augment_schema
+ *   python -m benchmarks.augment_schema --json augment.json
+ *
+ * Only the schema construction step is compared, resolver assignment is shared by both paths.
+ * The augment_schema[N types] cases time the whole augmentation from 10 to 2,000 types, p50 grows linearly with N.
+"""
+import sys
+
+from graphql import print_schema, extend_schema
+
+from neo4j_graphql_py import make_executable_schema, augment_schema
+from neo4j_graphql_py.augment_schema import (types_to_augment, mutation_extension, relationship_mutations,
+                                             create_mutation_arguments)
+from neo4j_graphql_py.utils import index_schema
+from benchmarks.harness import main
+from benchmarks.translation import synthetic_schema
+
+
+def augment_mutations(types, schema):
+    # SDL of the Create and Add mutations of the previous implementation
+    primary_keys = {}
+    return ' '.join(f'{create_mutation(schema.type_map[t])} '
+                    f'{add_relationship_mutations(schema.type_map[t], primary_keys)}' for t in types)
+
+
+def create_mutation(field_type):
+    arguments = ''.join(f' {name}: {type_name}, ' for name, type_name in create_mutation_arguments(field_type))
+    return f'Create{field_type.name}({arguments}): {field_type.name}'
+
+
+def add_relationship_mutations(field_type, primary_keys):
+    return ''.join(f'{mutation.name}({", ".join(f"{name}: {type_name}!" for name, type_name in mutation.arguments)}): '
+                   f'{mutation.from_type} @MutationMeta(relationship: "{mutation.relationship}", '
+                   f'from: "{mutation.from_type}", to: "{mutation.to_type}")'
+                   for mutation in relationship_mutations(field_type, primary_keys))
+
+
+def print_parse_augment(schema):
+    # the previous implementation: print the schema, append the mutation SDL and build it again
+    types = types_to_augment(schema)
+    sdl = (print_schema(schema) +
+           f'extend schema {{ mutation: Mutation }} type Mutation {{ {augment_mutations(types, schema)} }}')
+    return make_executable_schema(sdl, {})
+
+
+def extend_augment(schema):
+    types = types_to_augment(schema)
+    augmented = extend_schema(schema, mutation_extension(types, schema), assume_valid=True, assume_valid_sdl=True)
+    index_schema(augmented)
+    return augmented
+
+
+def field_signatures(schema_type):
+    return {name: (str(field.type), [(argument_name, str(argument.type)) for argument_name, argument in field.args.items()])
+            for name, field in schema_type.fields.items()}
+
+
+def assert_equivalent(previous, extended):
+    # the previous implementation only generates the Create and Add mutations, which must match their extended ones
+    previous_mutations = field_signatures(previous.mutation_type)
+    extended_mutations = field_signatures(extended.mutation_type)
+    assert previous_mutations == {name: extended_mutations[name] for name in previous_mutations}
+    for name, schema_type in previous.type_map.items():
+        if schema_type is not previous.mutation_type:
+            assert str(schema_type) in extended.type_map, name
+
+
+def cases(type_counts=(50, 200, 400), scaling_type_counts=(10, 100, 500, 2000), iterations=20):
+    all_cases = {}
+    for type_count in type_counts:
+        schema = make_executable_schema(synthetic_schema(type_count), {})
+        assert_equivalent(print_parse_augment(schema), extend_augment(schema))
+        scale = max(1, iterations * 50 // type_count)
+        all_cases[f'print/parse[{type_count} types]'] = (lambda schema=schema: print_parse_augment(schema), scale)
+        all_cases[f'extend_schema[{type_count} types]'] = (lambda schema=schema: extend_augment(schema), scale)
+    for type_count in scaling_type_counts:
+        schema = make_executable_schema(synthetic_schema(type_count), {})
+        scale = max(1, iterations * 50 // type_count)
+        all_cases[f'augment_schema[{type_count} types]'] = (lambda schema=schema: augment_schema(schema), scale)
+    return all_cases
+
+
+if __name__ == '__main__':
+    sys.exit(main(cases(), description=__doc__))
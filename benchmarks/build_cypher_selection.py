@@ -0,0 +1,123 @@
+"""
+ * Compare build_cypher_selection with the previous recursive implementation on wide selection sets.
+ *
+ *   python -m benchmarks.build_cypher_selection
+"""
+import sys
+import timeit
+
+from graphql import graphql_sync
+
+from neo4j_graphql_py import make_executable_schema
+from neo4j_graphql_py.selections import build_cypher_selection
+from neo4j_graphql_py.utils import (cypher_directive_args, is_graphql_scalar_type, is_array_type, inner_type,
+                                    cypher_directive, relation_directive, inner_filter_params, compute_skip_limit,
+                                    extract_selections)
+
+
+def recursive_build_cypher_selection(initial, selections, variable_name, schema_type, resolve_info):
+    # the recursive implementation replaced by the iterative builder, kept for comparison
+    if len(selections) == 0:
+        return initial
+    head_selection, *tail_selections = selections
+
+    tail_params = {
+        'selections': tail_selections,
+        'variable_name': variable_name,
+        'schema_type': schema_type,
+        'resolve_info': resolve_info
+    }
+
+    field_name = head_selection.name.value
+    comma_if_tail = ',' if len(tail_selections) > 0 else ''
+    if not schema_type.fields.get(field_name):
+        return recursive_build_cypher_selection(initial[1:initial.rfind(',')] if len(tail_selections) == 0
+                                                else initial, **tail_params)
+
+    field_type = schema_type.fields[field_name].type
+    inner_schema_type = inner_type(field_type)
+    custom_cypher = cypher_directive(schema_type, field_name).get('statement')
+
+    if field_name == '_id':
+        return recursive_build_cypher_selection(f'{initial}{field_name}: ID({variable_name}){comma_if_tail}',
+                                                **tail_params)
+    if is_graphql_scalar_type(inner_schema_type):
+        if custom_cypher:
+            return recursive_build_cypher_selection(
+                (f'{initial}{field_name}: apoc.cypher.runFirstColumn("{custom_cypher}", '
+                 f'{cypher_directive_args(variable_name, head_selection, schema_type, resolve_info)}, false)'
+                 f'{comma_if_tail}'), **tail_params)
+        return recursive_build_cypher_selection(f'{initial} .{field_name} {comma_if_tail}', **tail_params)
+
+    nested_variable = variable_name + '_' + field_name
+    skip_limit = compute_skip_limit(head_selection, resolve_info.variable_values)
+    nested_params = {
+        'initial': '',
+        'selections': head_selection.selection_set.selections,
+        'variable_name': nested_variable,
+        'schema_type': inner_schema_type,
+        'resolve_info': resolve_info
+    }
+    if custom_cypher:
+        field_is_list = not not getattr(field_type, 'of_type', None)
+        return recursive_build_cypher_selection(
+            (f'{initial}{field_name}: {"" if field_is_list else "head("}'
+             f'[ {nested_variable} IN apoc.cypher.runFirstColumn("{custom_cypher}", '
+             f'{cypher_directive_args(variable_name, head_selection, schema_type, resolve_info)}, true) | '
+             f'{nested_variable} {{{recursive_build_cypher_selection(**nested_params)}}}]'
+             f'{"" if field_is_list else ")"}{skip_limit} {comma_if_tail}'), **tail_params)
+
+    rel = relation_directive(schema_type, field_name)
+    rel_type = rel.get('name')
+    rel_direction = rel.get('direction')
+    subquery_args = inner_filter_params(head_selection)
+    return recursive_build_cypher_selection(
+        (f"{initial}{field_name}: {'head(' if not is_array_type(field_type) else ''}"
+         f"[({variable_name}){'<' if rel_direction in ['in', 'IN'] else ''}"
+         f"-[:{rel_type}]-{'>' if rel_direction in ['out', 'OUT'] else ''}"
+         f"({nested_variable}:{inner_schema_type.name} {subquery_args}) | {nested_variable} "
+         f"{{{recursive_build_cypher_selection(**nested_params)}}}]"
+         f"{')' if not is_array_type(field_type) else ''}{skip_limit} {comma_if_tail}"), **tail_params)
+
+
+def wide_selection(field_count):
+    # resolve info and selections for `{ Wide { f0 f1 ... } }` on a type with field_count scalar fields
+    fields = '\n'.join(f'  f{i}: String' for i in range(field_count))
+    type_defs = f'type Wide {{\n{fields}\n}}\ntype Query {{\n  Wide: [Wide]\n}}\n'
+    captured = {}
+
+    def resolve(_, info, **kwargs):
+        captured['info'] = info
+
+    schema = make_executable_schema(type_defs, {'Query': {'Wide': resolve}})
+    graphql_sync(schema, f'{{ Wide {{ {" ".join(f"f{i}" for i in range(field_count))} }} }}')
+    info = captured['info']
+    selections = extract_selections(info.field_nodes[0].selection_set.selections, info.fragments)
+    return info, selections, schema.get_type('Wide')
+
+
+def run(field_counts=(10, 100, 500), number=50):
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * max(field_counts)))
+    results = []
+    for field_count in field_counts:
+        info, selections, schema_type = wide_selection(field_count)
+        iterative = build_cypher_selection('', selections, 'wide', schema_type, info)
+        recursive = recursive_build_cypher_selection('', selections, 'wide', schema_type, info)
+        assert iterative == recursive
+        iterative_time = min(timeit.repeat(
+            lambda: build_cypher_selection('', selections, 'wide', schema_type, info), number=number, repeat=5))
+        recursive_time = min(timeit.repeat(
+            lambda: recursive_build_cypher_selection('', selections, 'wide', schema_type, info), number=number,
+            repeat=5))
+        results.append({'fields': field_count,
+                        'iterative_ms': iterative_time / number * 1000,
+                        'recursive_ms': recursive_time / number * 1000,
+                        'speedup': recursive_time / iterative_time})
+    return results
+
+
+if __name__ == '__main__':
+    print(f'{"fields":>8} {"iterative ms":>14} {"recursive ms":>14} {"speedup":>8}')
+    for result in run():
+        print(f'{result["fields"]:>8} {result["iterative_ms"]:>14.3f} {result["recursive_ms"]:>14.3f} '
+              f'{result["speedup"]:>7.2f}x')
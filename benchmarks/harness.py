@@ -0,0 +1,110 @@
+"""
+ * Minimal benchmark harness: per-call latency percentiles, throughput and allocations,
+ * JSON output and comparison against a saved baseline.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(fn, iterations=200, warmup=20):
+    for _ in range(min(warmup, iterations)):
+        fn()
+
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+
+    # allocations are measured in a separate pass, tracing would skew the timings
+    allocation_iterations = max(1, iterations // 10)
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for _ in range(allocation_iterations):
+        fn()
+    _, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated_blocks = sum(stat.count for stat in snapshot.statistics('filename'))
+
+    total = sum(durations)
+    return {
+        'iterations': iterations,
+        'ops_per_sec': iterations / total if total else float('inf'),
+        'mean_ms': total / iterations * 1000,
+        'p50_ms': percentile(durations, 0.5) * 1000,
+        'p99_ms': percentile(durations, 0.99) * 1000,
+        'peak_kib': (peak - before) / 1024,
+        'live_blocks_per_call': allocated_blocks / allocation_iterations,
+    }
+
+
+def compare(results, baseline, threshold):
+    # a case regresses when its p50 latency grew by more than threshold (0.1 == 10%)
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        ratio = result['p50_ms'] / previous['p50_ms'] if previous['p50_ms'] else 1.0
+        result['baseline_p50_ms'] = previous['p50_ms']
+        result['p50_ratio'] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+def print_table(results):
+    print(f'{"case":<52} {"ops/s":>10} {"p50 ms":>9} {"p99 ms":>9} {"peak KiB":>9} {"vs base":>8}')
+    for name, result in results.items():
+        ratio = f'{result["p50_ratio"]:.2f}x' if 'p50_ratio' in result else ''
+        print(f'{name:<52} {result["ops_per_sec"]:>10.1f} {result["p50_ms"]:>9.3f} {result["p99_ms"]:>9.3f} '
+              f'{result["peak_kib"]:>9.1f} {ratio:>8}')
+
+
+def main(cases, argv=None, description=None):
+    """
+     * Run every case (a name -> (fn, iterations) mapping) and report the results.
+     *   --json PATH        write machine-readable results
+     *   --compare PATH     compare with a previous --json run, exit 1 on regressions
+     *   --threshold 0.1    allowed p50 slowdown before a case counts as a regression
+     *   --filter TEXT      only run cases whose name contains TEXT
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--json', dest='json_path')
+    parser.add_argument('--compare', dest='baseline_path')
+    parser.add_argument('--threshold', type=float, default=0.1)
+    parser.add_argument('--filter', default='')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply the iteration counts')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, (fn, iterations) in cases.items():
+        if args.filter in name:
+            results[name] = measure(fn, max(1, int(iterations * args.scale)))
+
+    regressions = []
+    if args.baseline_path:
+        with open(args.baseline_path) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+
+    print_table(results)
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'python': platform.python_version(), 'platform': platform.platform(), 'results': results},
+                      f, indent=2)
+    if regressions:
+        print(f'regressions over {args.threshold:.0%}: {", ".join(regressions)}', file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,166 @@
+"""
+ * Translation benchmarks: throughput, p50/p99 latency and allocations of cypher_query, cypher_mutation,
+ * augment_schema and make_executable_schema on the test movie schema and on synthetic schemas
+ * (wide types, deep nesting, many fragments, many @cypher fields).
+ *
+ *   python -m benchmarks.translation --json baseline.json
+ *   python -m benchmarks.translation --compare baseline.json --threshold 0.1
+ *
+ * Query translation is measured both with a cold query plan cache (every call compiles) and a warm one.
+"""
+import sys
+
+from graphql import graphql_sync
+
+from tests.helpers.schema import test_schema
+from neo4j_graphql_py import make_executable_schema, augment_schema, cypher_query, cypher_mutation, query_plan_cache
+from benchmarks.harness import main
+
+DIRECTIVES = '''
+directive @cypher(statement: String!) on FIELD_DEFINITION
+directive @relation(name:String!, direction:String!) on FIELD_DEFINITION
+directive @MutationMeta(relationship: String, from:String, to:String) on FIELD_DEFINITION
+'''
+
+MOVIE_MUTATIONS = '''
+type Mutation {
+    CreateMovie(movieId: ID!, title: String, year: Int, plot: String, poster: String, imdbRating: Float): Movie
+    AddMovieGenre(moviemovieId: ID!, genrename: String): Movie
+        @MutationMeta(relationship: "IN_GENRE", from:"Movie", to:"Genre")
+}
+'''
+
+MOVIE_QUERY = '''
+{
+    Movie(title: "River Runs Through It, A", first: 10) {
+        title
+        year
+        actors(first: 3) { name movies { title } }
+        genres { name movies(first: 5) { title } }
+        similar(first: 3) { title degree scaleRating(scale: 5) }
+        filmedIn { name }
+    }
+}
+'''
+
+
+def wide_schema(field_count=200):
+    fields = '\n'.join(f'  f{i}: String' for i in range(field_count))
+    type_defs = f'{DIRECTIVES}type Wide {{\n  id: ID!\n{fields}\n}}\ntype Query {{\n  Wide(id: ID): [Wide]\n}}\n'
+    query = f'{{ Wide(id: "1") {{ id {" ".join(f"f{i}" for i in range(field_count))} }} }}'
+    return type_defs, query
+
+
+def deep_schema(depth=12):
+    types = '\n'.join(f'type Level{i} {{\n  name: String\n'
+                      f'  next(first: Int = 3): [Level{i + 1}] @relation(name: "NEXT", direction: "OUT")\n}}'
+                      for i in range(depth))
+    type_defs = f'{DIRECTIVES}{types}\ntype Level{depth} {{\n  name: String\n}}\ntype Query {{\n  Level0: [Level0]\n}}\n'
+    query = '{ Level0 ' + ''.join('{ name next ' for _ in range(depth)) + '{ name }' + ' }' * (depth + 1)
+    return type_defs, query
+
+
+def fragment_query(fragment_count=20):
+    # many fragments spread on the same Movie selection
+    fields = ['title', 'year', 'plot', 'poster', 'imdbRating', 'avgStars', 'degree', 'genres { name }',
+              'filmedIn { name }', 'actors { name }']
+    fragments = '\n'.join(f'fragment F{i} on Movie {{ {fields[i % len(fields)]} }}' for i in range(fragment_count))
+    spreads = ' '.join(f'...F{i}' for i in range(fragment_count))
+    return f'{{ Movie(year: 2000) {{ movieId {spreads} }} }}\n{fragments}'
+
+
+def cypher_fields_schema(field_count=50):
+    fields = '\n'.join(f'  c{i}(scale: Int = {i}): Float '
+                       f'@cypher(statement: "WITH $this AS this RETURN $scale * this.value{i}")'
+                       for i in range(field_count))
+    type_defs = f'{DIRECTIVES}type Computed {{\n  id: ID!\n{fields}\n}}\ntype Query {{\n  Computed: [Computed]\n}}\n'
+    query = f'{{ Computed {{ id {" ".join(f"c{i}" for i in range(field_count))} }} }}'
+    return type_defs, query
+
+
+def synthetic_schema(type_count=50):
+    # type_count types, each related to the previous one, used for schema construction timings
+    # (a forward chain would exceed the recursion limit of graphql-core's type map construction on large schemas)
+    types = '\n'.join(f'type T{i} {{\n  id: ID!\n  name: String\n  value: Float\n'
+                      f'  previous: [T{max(i - 1, 0)}] @relation(name: "PREVIOUS", direction: "OUT")\n}}'
+                      for i in range(type_count))
+    roots = '\n'.join(f'  T{i}(id: ID, name: String): [T{i}]' for i in range(type_count))
+    return f'{DIRECTIVES}{types}\ntype Query {{\n{roots}\n}}\n'
+
+
+def capture_info(type_defs, query, root_type='Query'):
+    # resolve info of the first root field of query, as the translation functions receive it
+    captured = {}
+
+    def resolve(_, info, **kwargs):
+        captured['info'] = info
+        captured['kwargs'] = kwargs
+
+    schema = make_executable_schema(type_defs, {})
+    for field in schema.get_type(root_type).fields.values():
+        field.resolve = resolve
+    result = graphql_sync(schema, query)
+    if 'info' not in captured:
+        raise RuntimeError(f'could not capture resolve info: {result.errors}')
+    return captured['info'], captured['kwargs']
+
+
+def query_cases(name, type_defs, query, iterations):
+    info, kwargs = capture_info(type_defs, query)
+
+    def cold():
+        query_plan_cache.clear()
+        cypher_query(None, info, **kwargs)
+
+    def warm():
+        cypher_query(None, info, **kwargs)
+
+    def parameterized():
+        cypher_query(None, info, parameterized=True, **kwargs)
+
+    return {f'cypher_query[{name}] cold': (cold, iterations),
+            f'cypher_query[{name}] warm': (warm, iterations * 5),
+            f'cypher_query[{name}] parameterized warm': (parameterized, iterations * 5)}
+
+
+def mutation_cases(iterations):
+    type_defs = test_schema + MOVIE_MUTATIONS
+    cases = {}
+    for name, mutation in [
+        ('create', 'mutation { CreateMovie(movieId: "12", title: "My Super Awesome Movie", year: 2018) '
+                   '{ _id title genres { name } } }'),
+        ('add relationship', 'mutation { AddMovieGenre(moviemovieId: "123", genrename: "Action") '
+                             '{ _id title genres { name } } }'),
+    ]:
+        info, kwargs = capture_info(type_defs, mutation, 'Mutation')
+        cases[f'cypher_mutation[{name}]'] = (lambda info=info, kwargs=kwargs: cypher_mutation(None, info, **kwargs),
+                                             iterations)
+    return cases
+
+
+def schema_cases(iterations):
+    cases = {}
+    for name, type_defs in [('movie', test_schema), ('50 types', synthetic_schema(50)),
+                            ('200 types', synthetic_schema(200))]:
+        schema = make_executable_schema(type_defs, {})
+        scale = max(1, iterations * 10 // len(schema.type_map))
+        cases[f'make_executable_schema[{name}]'] = (lambda type_defs=type_defs: make_executable_schema(type_defs, {}),
+                                                    scale)
+        cases[f'augment_schema[{name}]'] = (lambda schema=schema: augment_schema(schema), scale)
+    return cases
+
+
+def cases(iterations=200):
+    all_cases = {}
+    all_cases.update(query_cases('movie', test_schema, MOVIE_QUERY, iterations))
+    all_cases.update(query_cases('wide 200 fields', *wide_schema(200), iterations // 4))
+    all_cases.update(query_cases('deep 12 levels', *deep_schema(12), iterations))
+    all_cases.update(query_cases('20 fragments', test_schema, fragment_query(20), iterations))
+    all_cases.update(query_cases('50 @cypher fields', *cypher_fields_schema(50), iterations // 2))
+    all_cases.update(mutation_cases(iterations))
+    all_cases.update(schema_cases(iterations // 10))
+    return all_cases
+
+
+if __name__ == '__main__':
+    sys.exit(main(cases(), description=__doc__))
@@ -1,10 +1,42 @@
-from .main import neo4j_graphql, cypher_query, cypher_mutation, augment_schema
+from .main import neo4j_graphql, neo4j_graphql_async, cypher_query, cypher_mutation, augment_schema
 from .utils import make_executable_schema
+from .cache import query_plan_cache
+from .result_cache import ResultCache, MemoryBackend, FileBackend
+from .session import OperationSession, AsyncOperationSession
+from .driver_manager import DriverManager
+from .streaming import neo4j_graphql_stream, export_ndjson
+from .batching import QueryBatcher
+from .execution import SingleStatementExecutionContext, PreShapedExecutionContext, neo4j_resolver
+from .artifact import build_schema_artifact, load_schema_artifact, cached_schema
+from .instrumentation import Instrumentation, TimingInstrumentation, OpenTelemetryInstrumentation
+from .cost import QueryCostError, estimate_query_cost
 
 __all__ = [
     "neo4j_graphql",
+    "neo4j_graphql_async",
+    "neo4j_graphql_stream",
+    "export_ndjson",
     "cypher_query",
     "cypher_mutation",
     "augment_schema",
     "make_executable_schema",
+    "query_plan_cache",
+    "ResultCache",
+    "MemoryBackend",
+    "FileBackend",
+    "OperationSession",
+    "AsyncOperationSession",
+    "DriverManager",
+    "QueryBatcher",
+    "SingleStatementExecutionContext",
+    "PreShapedExecutionContext",
+    "neo4j_resolver",
+    "build_schema_artifact",
+    "load_schema_artifact",
+    "cached_schema",
+    "Instrumentation",
+    "TimingInstrumentation",
+    "OpenTelemetryInstrumentation",
+    "QueryCostError",
+    "estimate_query_cost",
 ]
@@ -0,0 +1,151 @@
+import os
+import pickle
+import hashlib
+from copy import copy
+from typing import Any, Mapping, NamedTuple
+
+from graphql import parse, build_ast_schema, version as graphql_version
+from graphql.language import (Node, DocumentNode, ObjectTypeDefinitionNode, ObjectTypeExtensionNode, SchemaDefinitionNode,
+                              SchemaExtensionNode, TypeDefinitionNode)
+
+from .utils import attach_resolvers, attach_key_resolvers, index_schema, schema_directives
+
+# bump whenever the artifact layout or the augmentation output changes
+ARTIFACT_VERSION = 6
+
+
+class SchemaArtifact(NamedTuple):
+    key: str
+    document: DocumentNode
+    mutation_type_name: str
+    mutation_fields: tuple
+    directives: Mapping[str, Any]
+    primary_keys: Mapping[str, str]
+    relationships: Mapping[str, tuple]
+
+
+def artifact_key(type_defs):
+    # the artifact is only valid for the same SDL, artifact layout and graphql-core AST classes
+    digest = hashlib.sha256(type_defs.encode('utf-8')).hexdigest()
+    return f'{ARTIFACT_VERSION}:{graphql_version}:{digest}'
+
+
+def build_schema_artifact(type_defs, path=None):
+    """
+     * Augment type_defs once and snapshot the result: the augmented schema document together with its
+     * directive, primary key and relationship metadata. Written to path when given, e.g. at build time,
+     * so workers can load_schema_artifact instead of parsing and augmenting the SDL again.
+     * @returns {SchemaArtifact}
+    """
+    from .augment_schema import types_to_augment, augmentation_extension, relationship_mutations, primary_key
+
+    document = parse(type_defs, no_location=True)
+    schema = build_ast_schema(document, assume_valid=True)
+    types = types_to_augment(schema)
+    mutation_type = schema.mutation_type
+    mutation_type_name = mutation_type.name if mutation_type else 'Mutation'
+    primary_keys = {t: primary_key(schema.type_map[t]) for t in types}
+    extension = augmentation_extension(types, schema, mutation_type_name, mutation_type.fields if mutation_type else {},
+                                       primary_keys)
+
+    relationships = {t: tuple(relationship_mutations(schema.type_map[t], primary_keys)) for t in types}
+    augmented_document = merge_extension(document, extension)
+    augmented_schema = build_ast_schema(augmented_document, assume_valid=True, assume_valid_sdl=True)
+
+    artifact = SchemaArtifact(
+        key=artifact_key(type_defs),
+        document=thaw(augmented_document),
+        mutation_type_name=mutation_type_name,
+        mutation_fields=tuple(field.name.value for field in extension.definitions[0].fields),
+        directives=schema_directives(augmented_schema),
+        primary_keys={type_name: field.ast_node.name.value for type_name, field in primary_keys.items()},
+        relationships=relationships)
+    if path is not None:
+        write_schema_artifact(artifact, path)
+    return artifact
+
+
+def merge_extension(document, extension):
+    """
+     * Fold the mutation extension into the definitions of document, as build_ast_schema ignores extensions.
+     * Without a schema definition the Mutation type is picked up by its name.
+    """
+    extensions = {node.name.value: node for node in extension.definitions if isinstance(node, ObjectTypeExtensionNode)}
+    definitions = [node for node in extension.definitions if isinstance(node, TypeDefinitionNode)]
+    operation_types = [operation_type for node in extension.definitions if isinstance(node, SchemaExtensionNode)
+                       for operation_type in node.operation_types]
+    for node in document.definitions:
+        if isinstance(node, ObjectTypeDefinitionNode) and node.name.value in extensions:
+            node = copy(node)
+            node.fields = [*node.fields, *extensions[node.name.value].fields]
+        elif isinstance(node, SchemaDefinitionNode):
+            node = copy(node)
+            node.operation_types = [*node.operation_types, *operation_types]
+        definitions.append(node)
+    return DocumentNode(definitions=definitions)
+
+
+def thaw(value):
+    # copy of an AST with plain lists in place of FrozenList, which can't be unpickled
+    if isinstance(value, Node):
+        node = copy(value)
+        for key in value.keys:
+            setattr(node, key, thaw(getattr(value, key)))
+        return node
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+def write_schema_artifact(artifact, path):
+    # write to a temporary file first, so a worker never reads a partially written artifact
+    temporary_path = f'{path}.{os.getpid()}.tmp'
+    with open(temporary_path, 'wb') as f:
+        pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_path, path)
+
+
+def read_schema_artifact(path, type_defs=None):
+    with open(path, 'rb') as f:
+        artifact = pickle.load(f)
+    if not isinstance(artifact, SchemaArtifact) or not artifact.key.startswith(f'{ARTIFACT_VERSION}:{graphql_version}:'):
+        raise ValueError(f'{path} was built by another version of neo4j-graphql-py or graphql-core')
+    if type_defs is not None and artifact.key != artifact_key(type_defs):
+        raise ValueError(f'{path} was built from different type definitions')
+    return artifact
+
+
+def load_schema_artifact(path, resolvers=None, type_defs=None, use_async=False, parameterized=False):
+    """
+     * Executable augmented schema from an artifact written by build_schema_artifact, equivalent to
+     *   augment_schema(make_executable_schema(type_defs, resolvers), use_async, parameterized)
+     * without parsing or augmenting the SDL. Resolvers are functions and are not part of the artifact,
+     * pass them again here. When type_defs is given the artifact must have been built from it,
+     * otherwise a ValueError is raised.
+    """
+    return schema_from_artifact(read_schema_artifact(path, type_defs), resolvers, use_async, parameterized)
+
+
+def schema_from_artifact(artifact, resolvers=None, use_async=False, parameterized=False):
+    from .augment_schema import neo4j_resolvers, add_filter_arguments
+
+    schema = build_ast_schema(artifact.document, assume_valid=True, assume_valid_sdl=True)
+    add_filter_arguments(schema)
+    attach_resolvers(schema, resolvers or {})
+    attach_resolvers(schema, neo4j_resolvers(schema, artifact.mutation_type_name, artifact.mutation_fields,
+                                             use_async, parameterized))
+    attach_key_resolvers(schema)
+    index_schema(schema, artifact.directives)
+    return schema
+
+
+def cached_schema(type_defs, path, resolvers=None, use_async=False, parameterized=False):
+    """
+     * Load the augmented schema from the artifact at path, building and writing the artifact first
+     * when it is missing or was built from other type definitions.
+    """
+    try:
+        artifact = read_schema_artifact(path, type_defs)
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError, AttributeError):
+        artifact = build_schema_artifact(type_defs, path)
+    return schema_from_artifact(artifact, resolvers, use_async, parameterized)
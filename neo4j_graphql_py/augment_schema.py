@@ -1,46 +1,62 @@
-from .main import neo4j_graphql
-from graphql import print_schema
-from pydash import filter_, reduce_
-from .utils import inner_type, make_executable_schema, low_first_letter
-
-
-def add_mutations_to_schema(schema):
+from .main import neo4j_graphql, neo4j_graphql_async
+from .execution import neo4j_resolver
+from typing import NamedTuple
+from graphql import (extend_schema, OperationType, GraphQLArgument, GraphQLList, GraphQLNonNull, GraphQLEnumType,
+                     GraphQLEnumValue)
+from graphql.language import (DocumentNode, ObjectTypeDefinitionNode, ObjectTypeExtensionNode, SchemaExtensionNode,
+                              OperationTypeDefinitionNode, FieldDefinitionNode, InputValueDefinitionNode, NameNode,
+                              NamedTypeNode, NonNullTypeNode, ListTypeNode, DirectiveNode, ArgumentNode, StringValueNode,
+                              InputObjectTypeDefinitionNode, EnumTypeDefinitionNode, EnumValueDefinitionNode)
+from pydash import filter_
+from .utils import (inner_type, attach_resolvers, attach_key_resolvers, index_schema, low_first_letter, is_array_type,
+                    field_directives, BULK_CREATE, BULK_ADD, BULK_INPUT)
+from .connections import CONNECTION, EDGE, PAGE_INFO
+from .filters import (filter_fields, filter_type_name, ordering_type_name, FILTER_OPERATORS, STRING_TYPES,
+                      ORDERED_TYPES, FILTER, ORDER_BY)
+
+
+def add_mutations_to_schema(schema, use_async=False, parameterized=False):
     types = types_to_augment(schema)
-
-    # FIXME: don't use printSchema (custom directives are lost), instead use extend schema
-    # FIXME: type extensions are lost
-    mutation_schema_sdl = print_schema(schema)
+    mutation_type = schema.mutation_type
+    mutation_type_name = mutation_type.name if mutation_type else 'Mutation'
+    existing_mutations = mutation_type.fields if mutation_type else {}
 
     # TODO: compose augment funcs
     # let mutationSchemaSDLWithTypes = augmentTypes(types, schema, mutationSchemaSDL);
 
-    mutation_schema_sdl_with_types_and_mutations = augment_mutations(types, schema, mutation_schema_sdl)
+    # the schema is extended in place of printing and re-parsing it, so custom directives and type extensions are kept
+    extension = augmentation_extension(types, schema, mutation_type_name, existing_mutations)
 
-    def resolve_neo4j(obj, info, **kwargs):
-        return neo4j_graphql(obj, info.context, info, **kwargs)
+    mutation_schema = extend_schema(schema, extension, assume_valid=True, assume_valid_sdl=True)
+    add_filter_arguments(mutation_schema)
+    resolvers = neo4j_resolvers(mutation_schema, mutation_type_name,
+                                [field.name.value for field in extension.definitions[0].fields], use_async, parameterized)
+    attach_resolvers(mutation_schema, resolvers)
+    attach_key_resolvers(mutation_schema)
+    index_schema(mutation_schema)
 
-    # console.log(mutationSchemaSDLWithTypesAndMutations);
-    def f(acc, t):
-        # FIXME: inspect actual mutations, not construct mutation names here
-        acc['Mutation'][f'Create{t}'] = resolve_neo4j
-        for field_type in types:
-            for rel_mutation in add_relationship_mutations(schema.type_map[field_type], True):
-                acc['Mutation'][rel_mutation] = resolve_neo4j
-        return acc
+    final_schema = mutation_schema
+    return final_schema
 
-    resolvers = reduce_(types, f, {'Query': {}, 'Mutation': {}})
 
-    # delegate query resolvers to original schema
-    def f2(acc, t):
-        acc['Query'][t] = resolve_neo4j
-        return acc
+def neo4j_resolvers(schema, mutation_type_name, mutation_names, use_async=False, parameterized=False):
+    """
+     * Resolvers of the augmented schema: every query field and generated mutation is resolved by neo4j_graphql
+    """
+    def resolve_neo4j_sync(obj, info, **kwargs):
+        return neo4j_graphql(obj, info.context, info, parameterized=parameterized, **kwargs)
 
-    resolvers = reduce_(list(schema.query_type.fields.keys()), f2, resolvers)
+    async def resolve_neo4j_async(obj, info, **kwargs):
+        return await neo4j_graphql_async(obj, info.context, info, parameterized=parameterized, **kwargs)
 
-    mutation_schema = make_executable_schema(mutation_schema_sdl_with_types_and_mutations, resolvers)
+    resolve_neo4j = resolve_neo4j_async if use_async else resolve_neo4j_sync
+    neo4j_resolver(resolve_neo4j)
 
-    final_schema = mutation_schema
-    return final_schema
+    # delegate query resolvers to original schema, and resolve the generated mutations
+    return {
+        schema.query_type.name: {name: resolve_neo4j for name in schema.query_type.fields},
+        mutation_type_name: {name: resolve_neo4j for name in mutation_names}
+    }
 
 
 def types_to_augment(schema):
@@ -57,143 +73,361 @@ def types_to_augment(schema):
                             t].ast_node.kind == 'object_type_definition' and t != 'Query' and t != 'Mutation')
 
 
-def augment_types(types, schema, sdl):
+def mutation_extension(types, schema, mutation_type_name='Mutation', existing_mutations=(), primary_keys=None):
     """
-    #  * Generate type extensions for each type:
-    #  *   - add _id field
-    #  * @param {string[]} types
-    #  * @param schema
-    #  * @param {string} sdl
-    #  * @returns {string} SDL type extensions
+     * Document extending the schema with the generated mutations: a Mutation type and schema extension,
+     * or an extension of the schema's own mutation type. Mutations the schema already defines are left as they are.
+     * The nodes are built directly, the generated SDL is never parsed.
+     * @param {string[]} types
+     * @param {GraphQLSchema} schema
+     * @returns {DocumentNode}
     """
-    return reduce_(types,
-                   lambda acc, t: acc + '' if t in ['Mutation', 'Query']
-                   else acc + f'extend type {t} {{ _id:ID }}', sdl)
-
-
-def augment_mutations(types, schema, sdl):
-    # FIXME: requires placeholder Query type
-    return (sdl +
-            f'''
-            extend schema {{
-              mutation: Mutation
-            }}
-        
-        
-            type Mutation {{
-                {reduce_(types, lambda acc, t: acc + f'{create_mutation(schema.type_map[t])} '
-                                                     f'{add_relationship_mutations(schema.type_map[t])} ', '')}
-            }}
-            '''
-            )
-
-
-def create_mutation(field_type):
-    return f'Create{field_type.name}({param_signature(field_type)}): {field_type.name}'
-
-
-def add_relationship_mutations(field_type, names_only=False):
-    mutations = ''
-    mutation_names = []
-
-    def f1(field):
-        i = 0
-        while i < len(field.ast_node.directives):
-            return field.ast_node.directives[i].name.value == 'relation'
-
-    relationship_fields = filter_(field_type.fields, f1)
+    fields = []
+    inputs = []
+    primary_keys = {} if primary_keys is None else primary_keys
+    for t in types:
+        field_type = schema.type_map[t]
+        arguments = create_mutation_arguments(field_type)
+        fields.append(field_definition(f'Create{t}', arguments, t))
+        fields.append(bulk_field_definition(f'{BULK_CREATE}{t}', f'_{t}Input', t))
+        inputs.append((f'{BULK_CREATE}{t}', f'_{t}Input', arguments, False))
+        if t not in primary_keys:
+            primary_keys[t] = primary_key(field_type)
+        key = (primary_keys[t].ast_node.name.value, inner_type(primary_keys[t].type).name)
+        properties = [argument for argument in arguments if argument[0] != key[0]]
+        if key[0] != '_id':
+            # a node can't be merged on its internal id
+            fields.append(keyed_field_definition('Merge', t, key, properties))
+        fields.append(keyed_field_definition('Update', t, key, properties))
+        fields.append(keyed_field_definition('Delete', t, key, []))
+        for mutation in relationship_mutations(field_type, primary_keys):
+            meta = DirectiveNode(name=NameNode(value='MutationMeta'), arguments=[
+                ArgumentNode(name=NameNode(value=name), value=StringValueNode(value=value))
+                for name, value in [('relationship', mutation.relationship), ('from', mutation.from_type),
+                                    ('to', mutation.to_type)]])
+            fields.append(field_definition(mutation.name, mutation.arguments, mutation.from_type, [meta], True))
+            bulk_name = f'{BULK_ADD}{mutation.from_type}{mutation.to_type}'
+            input_name = f'_{mutation.from_type}{mutation.to_type}Input'
+            fields.append(bulk_field_definition(bulk_name, input_name, mutation.from_type, [meta]))
+            inputs.append((bulk_name, input_name, mutation.arguments, True))
+    fields = [field for field in fields if field.name.value not in existing_mutations]
+    # the input types of the generated CreateMany and AddMany mutations, the rows of their input argument
+    generated = {field.name.value for field in fields}
+    input_types = [
+        InputObjectTypeDefinitionNode(name=NameNode(value=input_name), directives=[], fields=[
+            input_value(argument, named_type(type_name, non_null)) for argument, type_name in arguments])
+        for bulk_name, input_name, arguments, non_null in inputs
+        if bulk_name in generated and input_name not in schema.type_map]
+
+    name = NameNode(value=mutation_type_name)
+    if len(existing_mutations) > 0:
+        return DocumentNode(definitions=[ObjectTypeExtensionNode(name=name, interfaces=[], directives=[], fields=fields),
+                                         *input_types])
+    return DocumentNode(definitions=[
+        ObjectTypeDefinitionNode(name=name, interfaces=[], directives=[], fields=fields),
+        SchemaExtensionNode(directives=[], operation_types=[
+            OperationTypeDefinitionNode(operation=OperationType.MUTATION, type=NamedTypeNode(name=name))]),
+        *input_types])
+
+
+def augmentation_extension(types, schema, mutation_type_name='Mutation', existing_mutations=(), primary_keys=None):
+    # the generated mutations, first, followed by the filter and ordering types and the connection types and fields
+    primary_keys = {} if primary_keys is None else primary_keys
+    mutations = mutation_extension(types, schema, mutation_type_name, existing_mutations, primary_keys)
+    filters = filter_extension(types, schema)
+    connections = connection_extension(types, schema, primary_keys)
+    return DocumentNode(definitions=[*mutations.definitions, *filters.definitions, *connections.definitions])
+
+
+def filter_extension(types, schema):
+    """
+     * Document extending the schema with a filter input type and an ordering enum per type:
+     *   input _<Type>Filter { AND: [_<Type>Filter!] OR: [_<Type>Filter!] <field> <field>_in ... }
+     *   enum _<Type>Ordering { <field>_asc <field>_desc ... }
+     * over its stored scalar fields. Every field can be compared with eq and in, String and ID fields with contains
+     * and starts_with, and String, ID, Int and Float fields with gt and lt.
+     * add_filter_arguments then adds them as the filter and orderBy arguments of the lists of the type.
+     * @param {string[]} types
+     * @param {GraphQLSchema} schema
+     * @returns {DocumentNode}
+    """
+    definitions = []
+    for t in types:
+        fields = filter_fields(schema.type_map[t])
+        filter_name = filter_type_name(t)
+        if not fields or filter_name in schema.type_map:
+            continue
+        inputs = [input_value(operator, ListTypeNode(type=named_type(filter_name, True))) for operator in ('AND', 'OR')]
+        for name, type_name in fields:
+            inputs.append(input_value(name, named_type(type_name)))
+            for suffix in FILTER_OPERATORS:
+                if suffix == '_in':
+                    inputs.append(input_value(f'{name}{suffix}', ListTypeNode(type=named_type(type_name, True))))
+                elif (type_name in STRING_TYPES or suffix not in ('_contains', '_starts_with')) \
+                        and (type_name in ORDERED_TYPES or suffix not in ('_gt', '_lt')):
+                    inputs.append(input_value(f'{name}{suffix}', named_type(type_name)))
+        definitions.append(InputObjectTypeDefinitionNode(name=NameNode(value=filter_name), directives=[], fields=inputs))
+        definitions.append(EnumTypeDefinitionNode(name=NameNode(value=ordering_type_name(t)), directives=[], values=[
+            EnumValueDefinitionNode(name=NameNode(value=f'{name}_{direction}'), directives=[])
+            for name, _ in fields for direction in ('asc', 'desc')]))
+    return DocumentNode(definitions=definitions)
+
+
+def add_filter_arguments(schema):
+    """
+     * Add the filter and orderBy arguments to the query lists without @cypher and the @relation lists
+     * of every type with a filter type. Arguments of existing fields can't be added by a schema extension,
+     * so they are added to the fields of the extended schema in place.
+    """
+    query_type = schema.query_type
+    filtered_fields = []
+    for type_name, schema_type in schema.type_map.items():
+        if getattr(schema_type, 'ast_node', None) is None or schema_type.ast_node.kind != 'object_type_definition':
+            continue
+        for field in schema_type.fields.values():
+            field_inner_type = inner_type(field.type)
+            filter_type = schema.type_map.get(filter_type_name(field_inner_type.name))
+            directives = field_directives(field)
+            if filter_type is None or not is_array_type(field.type) or FILTER in field.args or \
+                    ('relation' not in directives if schema_type is not query_type else 'cypher' in directives):
+                continue
+            filtered_fields.append((field, filter_type, ordering_type_name(field_inner_type.name)))
+    # enum values built from SDL have no value and would be coerced to None, they are compared by name
+    named_enum_types = {}
+    for _, filter_type, ordering_name in filtered_fields:
+        for enum_type in [schema.type_map[ordering_name],
+                          *(inner_type(filter_field.type) for filter_field in filter_type.fields.values())]:
+            if isinstance(enum_type, GraphQLEnumType) and any(value.value is None for value in enum_type.values.values()):
+                named_enum_types[enum_type.name] = named_enum_type(enum_type)
+    replace_types(schema, named_enum_types)
+    for field, filter_type, ordering_name in filtered_fields:
+        field.args[FILTER] = GraphQLArgument(filter_type)
+        field.args[ORDER_BY] = GraphQLArgument(GraphQLList(GraphQLNonNull(schema.type_map[ordering_name])))
+
+
+def named_enum_type(enum_type):
+    # copy of enum_type whose values without a value are valued by their name
+    # the values are shared with the schema that was extended, so they are not changed in place
+    return GraphQLEnumType(**{**enum_type.to_kwargs(), 'values': {
+        name: value if value.value is not None else GraphQLEnumValue(
+            name, description=value.description, deprecation_reason=value.deprecation_reason, ast_node=value.ast_node)
+        for name, value in enum_type.values.items()}})
+
+
+def replace_types(schema, replacements):
+    """
+     * Replace named types of the extended schema by the types of replacements with the same names,
+     * in its type map and in the fields, arguments and input fields that refer to them.
+     * extend_schema builds new fields and arguments, so those of the schema that was extended are left as they were.
+    """
+    if not replacements:
+        return
+
+    def replaced(field_type):
+        # the type itself when it refers to none of replacements
+        if isinstance(field_type, (GraphQLList, GraphQLNonNull)):
+            of_type = replaced(field_type.of_type)
+            return field_type if of_type is field_type.of_type else type(field_type)(of_type)
+        return replacements.get(field_type.name, field_type)
+
+    schema.type_map.update(replacements)
+    for type_name, schema_type in schema.type_map.items():
+        # introspection types are shared by every schema
+        if type_name.startswith('__'):
+            continue
+        for field in getattr(schema_type, 'fields', {}).values():
+            field.type = replaced(field.type)
+            for argument in getattr(field, 'args', {}).values():
+                argument.type = replaced(argument.type)
+
+
+def connection_extension(types, schema, primary_keys=None):
+    """
+     * Document extending the schema with Relay connections:
+     *   - <Type>Connection { edges: [<Type>Edge] pageInfo: PageInfo! } and <Type>Edge { cursor: String! node: <Type> }
+     *     for every type a connection field pages
+     *   - <field>Connection(..., first: Int, after: String) on Query for every list of a type returned by a query field
+     *     without @cypher, with the same arguments except first and offset
+     *   - <field>Connection(first: Int, after: String) on every type for each of its @relation lists
+     * Connection fields are marked @connection(key: "<primary key>"), the property pages are ordered on.
+     * @param {string[]} types
+     * @param {GraphQLSchema} schema
+     * @returns {DocumentNode}
+    """
+    primary_keys = {} if primary_keys is None else primary_keys
+    augmented = set(types)
+
+    def connection_directive(type_name):
+        if type_name not in primary_keys:
+            primary_keys[type_name] = primary_key(schema.type_map[type_name])
+        return DirectiveNode(name=NameNode(value='connection'), arguments=[
+            ArgumentNode(name=NameNode(value='key'),
+                         value=StringValueNode(value=primary_keys[type_name].ast_node.name.value))])
+
+    def connection_field(name, type_name, arguments, directives):
+        filters = [input_value(FILTER, named_type(filter_type_name(type_name)))] if filter_fields(
+            schema.type_map[type_name]) else []
+        return FieldDefinitionNode(
+            name=NameNode(value=f'{name}{CONNECTION}'), type=named_type(f'{type_name}{CONNECTION}'),
+            arguments=[*arguments, input_value('first', named_type('Int')), input_value('after', named_type('String')),
+                       *filters],
+            directives=[connection_directive(type_name), *directives])
+
+    extensions = []
+    query_fields = [
+        connection_field(name, inner_type(field.type).name,
+                         [argument for argument in field.ast_node.arguments
+                          if argument.name.value not in ['first', 'offset']], [])
+        for name, field in schema.query_type.fields.items()
+        if field.ast_node is not None and is_array_type(field.type) and inner_type(field.type).name in augmented
+        and 'cypher' not in field_directives(field) and f'{name}{CONNECTION}' not in schema.query_type.fields]
+    if query_fields:
+        extensions.append(ObjectTypeExtensionNode(name=NameNode(value=schema.query_type.name), interfaces=[],
+                                                  directives=[], fields=query_fields))
+    for t in types:
+        field_type = schema.type_map[t]
+        fields = [
+            connection_field(name, inner_type(field.type).name, [],
+                             [directive for directive in field.ast_node.directives if directive.name.value == 'relation'])
+            for name, field in field_type.fields.items()
+            if field.ast_node is not None and is_array_type(field.type) and inner_type(field.type).name in augmented
+            and 'relation' in field_directives(field) and f'{name}{CONNECTION}' not in field_type.fields]
+        if fields:
+            extensions.append(ObjectTypeExtensionNode(name=NameNode(value=t), interfaces=[], directives=[],
+                                                      fields=fields))
+
+    # the connection and edge types of the types that are paged, by the order of the types
+    paged = {field.type.name.value[:-len(CONNECTION)] for extension in extensions for field in extension.fields}
+    definitions = []
+    if paged and PAGE_INFO not in schema.type_map:
+        definitions.append(object_type(PAGE_INFO, [('hasNextPage', named_type('Boolean', True)),
+                                                   ('hasPreviousPage', named_type('Boolean', True)),
+                                                   ('startCursor', named_type('String')),
+                                                   ('endCursor', named_type('String'))]))
+    for t in types:
+        if t in paged and f'{t}{CONNECTION}' not in schema.type_map:
+            definitions.append(object_type(f'{t}{EDGE}', [('cursor', named_type('String', True)),
+                                                          ('node', named_type(t))]))
+            definitions.append(object_type(f'{t}{CONNECTION}', [
+                ('edges', ListTypeNode(type=named_type(f'{t}{EDGE}'))), ('pageInfo', named_type(PAGE_INFO, True))]))
+    return DocumentNode(definitions=[*definitions, *extensions])
+
+
+def named_type(type_name, non_null=False):
+    node = NamedTypeNode(name=NameNode(value=type_name))
+    return NonNullTypeNode(type=node) if non_null else node
+
+
+def input_value(name, type_node):
+    return InputValueDefinitionNode(name=NameNode(value=name), type=type_node, directives=[])
+
+
+def object_type(name, fields):
+    return ObjectTypeDefinitionNode(name=NameNode(value=name), interfaces=[], directives=[], fields=[
+        FieldDefinitionNode(name=NameNode(value=field_name), type=type_node, arguments=[], directives=[])
+        for field_name, type_node in fields])
+
+
+def field_definition(name, arguments, return_type, directives=(), non_null_arguments=False):
+    def argument_type(type_name):
+        named_type = NamedTypeNode(name=NameNode(value=type_name))
+        return NonNullTypeNode(type=named_type) if non_null_arguments else named_type
+
+    return FieldDefinitionNode(
+        name=NameNode(value=name), directives=list(directives), type=NamedTypeNode(name=NameNode(value=return_type)),
+        arguments=[InputValueDefinitionNode(name=NameNode(value=argument), type=argument_type(type_name), directives=[])
+                   for argument, type_name in arguments])
+
+
+def bulk_field_definition(name, input_name, return_type, directives=()):
+    # <name>(input: [<input_name>!]!): [<return_type>], created by a single UNWIND statement per chunk of the input
+    return FieldDefinitionNode(
+        name=NameNode(value=name), directives=list(directives),
+        type=ListTypeNode(type=named_type(return_type)),
+        arguments=[input_value(BULK_INPUT, NonNullTypeNode(type=ListTypeNode(type=named_type(input_name, True))))])
+
+
+def keyed_field_definition(operation, return_type, key, arguments):
+    # <operation><return_type>(<key>: <key type>!, <arguments>): <return_type> @KeyedMutation(operation, key),
+    # the node is matched or merged on the primary key argument
+    key_name, key_type = key
+    directive = DirectiveNode(name=NameNode(value='KeyedMutation'), arguments=[
+        ArgumentNode(name=NameNode(value=name), value=StringValueNode(value=value))
+        for name, value in [('operation', operation), ('key', key_name)]])
+    return FieldDefinitionNode(
+        name=NameNode(value=f'{operation}{return_type}'), directives=[directive], type=named_type(return_type),
+        arguments=[input_value(key_name, named_type(key_type, True)),
+                   *(input_value(argument, named_type(type_name)) for argument, type_name in arguments)])
+
+
+class RelationshipMutation(NamedTuple):
+    name: str
+    arguments: list
+    from_type: str
+    to_type: str
+    relationship: str
+
+
+def relationship_mutations(field_type, primary_keys=None):
+    """
+     * The Add<From><To> mutations for the @relation fields of a type, with the primary keys of both ends as arguments
+     * @param {GraphQLObjectType} field_type
+     * @param {dict} primary_keys: primary key per type name, shared across the types of one augmentation
+     * @returns {RelationshipMutation[]}
+    """
+    primary_keys = {} if primary_keys is None else primary_keys
+    mutations = []
 
-    for field in relationship_fields:
-        relation_directive = (
-            filter_(field.ast_node.directives, lambda d: d.name.value == 'relation')[0])
-        rel_type = filter_(relation_directive.arguments, lambda a: a.name.value == 'name')[0]
-        rel_direction = filter_(relation_directive.arguments, lambda a: a.name.value == 'direction')[0]
+    for field in field_type.fields.values():
+        directives = field.ast_node.directives if field.ast_node else None
+        if not directives or directives[0].name.value != 'relation':
+            continue
+        relation = {argument.name.value: argument.value.value for argument in directives[0].arguments}
 
-        if rel_direction.value.value in ['out', 'OUT']:
+        if relation.get('direction') in ['out', 'OUT']:
             from_type = field_type
             to_type = inner_type(field.type)
         else:
             from_type = inner_type(field.type)
             to_type = field_type
-        from_pk = primary_key(from_type)
-        to_pk = primary_key(to_type)
+        for t in (from_type, to_type):
+            if t.name not in primary_keys:
+                primary_keys[t.name] = primary_key(t)
+        from_pk = primary_keys[from_type.name]
+        to_pk = primary_keys[to_type.name]
 
         # FIXME: could add relationship properties here
-        mutations += (f'Add{from_type.name}{to_type.name}'
-                      f'({low_first_letter(from_type.name + from_pk.ast_node.name.value)}: {inner_type(from_pk.type).name}!, '
-                      f'{low_first_letter(to_type.name + to_pk.ast_node.name.value)}: {inner_type(to_pk.type).name}!): '
-                      f'{from_type.name} @MutationMeta(relationship: "{rel_type.value.value}", from: "{from_type.name}", to: "{to_type.name}")')
-        mutation_names.append(f'Add{from_type.name}{to_type.name}')
-    if names_only:
-        return mutation_names
-    else:
-        return mutations
+        mutations.append(RelationshipMutation(
+            f'Add{from_type.name}{to_type.name}',
+            [(low_first_letter(from_type.name + from_pk.ast_node.name.value), inner_type(from_pk.type).name),
+             (low_first_letter(to_type.name + to_pk.ast_node.name.value), inner_type(to_pk.type).name)],
+            from_type.name, to_type.name, relation.get('name')))
+    return mutations
 
 
 def primary_key(field_type):
     """
-     * Returns the field to be treated as the "primary key" for this type
-     * Primary key is determined as the first of:
-     *   - non-null ID field
-     *   - ID field
-     *   - first String field
-     *   - first field
+     * Returns the field to be treated as the "primary key" for this type:
+     * the first ID field, or else the first field
      *
      * @param {object_type_definition} type
      * @returns {FieldDefinition} primary key field
     """
-    # Find the primary key for the type
-    # first field with a required ID
-    # if no required ID type then first required type
-    pk = first_non_null_and_id_field(field_type)
-    if not pk:
-        pk = first_id_field(field_type)
-    if not pk:
-        pk = first_non_null_field(field_type)
-    if not pk:
-        pk = first_field(field_type)
-
-    return pk
+    fields = list(field_type.fields.values())
+    return next((field for field in fields if inner_type(field.type).name == 'ID'), fields[0] if fields else None)
 
 
-def param_signature(field_type):
-    def fun(acc, f):
-        if f == '_id' or (getattr(inner_type(field_type.fields[f].type), 'ast_node', None) is not None and inner_type(
-                field_type.fields[f].type).ast_node.kind == 'object_type_definition'):
+def create_mutation_arguments(field_type):
+    """
+     * (name, type name) of the Create<Type> mutation arguments: the type's fields, except _id and object fields
+    """
+    arguments = []
+    for name, field in field_type.fields.items():
+        field_inner_type = inner_type(field.type)
+        if name == '_id' or (getattr(field_inner_type, 'ast_node', None) is not None
+                             and field_inner_type.ast_node.kind == 'object_type_definition'):
             # TODO: exclude @cypher fields
             # TODO: exclude object types?
-            return acc + ''
-        else:
-            return acc + f' {f}: {inner_type(field_type.fields[f].type).name}, '
-
-    return reduce_(list(field_type.fields.keys()), fun, '')
-
-
-def first_non_null_and_id_field(field_type):
-    fields = filter_(list(field_type.fields.keys()),
-                     lambda t: type(field_type.fields[t]).__name__ == 'GraphQLNonNull'
-                               and field_type.fields[t].type.name == 'ID')
-    if len(fields) > 0:
-        return field_type.fields[fields[0]]
-    else:
-        return None
-
-
-def first_id_field(field_type):
-    fields = filter_(list(field_type.fields.keys()), lambda t: inner_type(field_type.fields[t].type).name == 'ID')
-    if len(fields) > 0:
-        return field_type.fields[fields[0]]
-    else:
-        return None
-
-
-def first_non_null_field(field_type):
-    fields = filter_(list(field_type.fields.keys()), lambda t: type(field_type.fields[t]).__name__ == 'GraphQLNonNull')
-    if len(fields) > 0:
-        return field_type.fields[fields[0]]
-    else:
-        return None
-
-
-def first_field(field_type):
-    return field_type.fields[list(field_type.fields.keys())[0]]
+            continue
+        arguments.append((name, field_inner_type.name))
+    return arguments
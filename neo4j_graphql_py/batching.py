@@ -0,0 +1,101 @@
+import re
+import asyncio
+
+from neo4j import READ_ACCESS
+
+from .main import driver_session
+from .utils import rename_parameters, context_value
+
+
+class QueryBatcher:
+    """
+     * Per-request batching layer for neo4j_graphql_async. Queries issued by sibling resolvers within one
+     * event loop tick are grouped, and queries sharing the same parameterized Cypher text run as a single
+     * UNWIND statement whose rows are fanned back to the resolvers that asked for them:
+     *
+     *   context = {'driver': driver, 'neo4j_batcher': QueryBatcher(driver)}
+     *
+     * Only parameterized queries can share a statement (see parameterized=True), and mutations are never batched.
+     * Pass neo4j_session to run the batches on an AsyncOperationSession instead of a session per batch.
+     * A batch otherwise runs as a read transaction of a READ session, which waits for the bookmarks of the request.
+    """
+
+    def __init__(self, driver=None, neo4j_session=None):
+        self.driver = driver
+        self.neo4j_session = neo4j_session
+        self.pending = []
+        self.batches = 0
+
+    async def load(self, query, params, column, context=None):
+        # context is the request's, for its bookmarks and instrumentation
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self.pending.append((query, params, column, future, context))
+        if len(self.pending) == 1:
+            # dispatch once every resolver scheduled in this tick has queued its query
+            loop.call_soon(lambda: asyncio.ensure_future(self.dispatch()))
+        return await future
+
+    async def dispatch(self):
+        pending, self.pending = self.pending, []
+        groups = {}
+        for query, params, column, future, context in pending:
+            constants = constant_parameters(query, params)
+            groups.setdefault((query, column, repr(constants)), []).append((params, future, context))
+        await asyncio.gather(*(self.dispatch_group(query, column, loads)
+                               for (query, column, _), loads in groups.items()))
+
+    async def dispatch_group(self, query, column, loads):
+        context = loads[0][2]
+        try:
+            if len(loads) == 1:
+                params, future, _ = loads[0]
+                records = await self.run(context, query, params)
+                if not future.done():
+                    future.set_result(records)
+                return
+
+            batch_query, batch_params = batch_statement(query, column, [params for params, _, _ in loads])
+            rows = [[] for _ in loads]
+            for record in await self.run(context, batch_query, batch_params):
+                rows[record.get('_batch_index')].append(record)
+            self.batches += 1
+            for (_, future, _), records in zip(loads, rows):
+                if not future.done():
+                    future.set_result(records)
+        except Exception as e:
+            for _, future, _ in loads:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def run(self, context, query, params):
+        if self.neo4j_session is not None:
+            return await self.neo4j_session.run(query, params)
+        session = driver_session({'driver': self.driver, 'bookmarks': context_value(context, 'bookmarks'),
+                                  'instrumentation': context_value(context, 'instrumentation')}, READ_ACCESS)
+        async with session:
+            return await session.read_transaction(fetch_records, query, params)
+
+
+async def fetch_records(tx, query, params):
+    result = await tx.run(query, params)
+    return [record async for record in result]
+
+
+def constant_parameters(query, params):
+    # SKIP and LIMIT only accept constants, so their parameters stay global and must match across a batch
+    return {name: params.get(name) for name in re.findall(r'(?:SKIP|LIMIT) \$(\w+)', query)}
+
+
+def batch_statement(query, column, params_list):
+    """
+     * Merge several runs of one parameterized query into a single statement:
+     *   UNWIND $_batch_rows AS _batch CALL { WITH _batch <query> } RETURN _batch._batch_index AS _batch_index, <column>
+     * Per-run parameters are read from the unwound row, SKIP/LIMIT parameters stay global.
+    """
+    constants = constant_parameters(query, params_list[0])
+    rows = [{**{name: value for name, value in params.items() if name not in constants}, '_batch_index': index}
+            for index, params in enumerate(params_list)]
+    subquery = rename_parameters(query, lambda name: f'${name}' if name in constants else f'_batch.{name}')
+    return (f'UNWIND $_batch_rows AS _batch CALL {{ WITH _batch {subquery} }} '
+            f'RETURN _batch._batch_index AS _batch_index, {column}'), {**constants, '_batch_rows': rows}
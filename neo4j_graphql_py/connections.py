@@ -0,0 +1,142 @@
+import re
+import json
+
+from .utils import (type_fields, extract_selections, argument_value, default_limit, param_map, add_param,
+                    low_first_letter, EMPTY_MAPPING)
+from .filters import filter_predicate, selection_filter_arguments
+
+# suffix of the generated connection types and fields, e.g. MovieConnection and actorsConnection
+CONNECTION = 'Connection'
+EDGE = 'Edge'
+PAGE_INFO = 'PageInfo'
+
+# cursor values are compared as the type of the key they were taken from
+CURSOR_CONVERSIONS = {'Int': 'toInteger', 'Float': 'toFloat'}
+
+
+def connection_key(field):
+    # key property of the @connection field's node type, the property pages are ordered and resumed on
+    return field.directives.get('connection', EMPTY_MAPPING).get('key')
+
+
+def connection_node_type(connection_type):
+    return type_fields(type_fields(connection_type)['edges'].inner_type)['node'].inner_type
+
+
+def key_expression(variable_name, key):
+    return f'ID({variable_name})' if key == '_id' else f'{variable_name}.{key}'
+
+
+def cursor_expression(cursor, node_type, key):
+    # the after argument converted back to the type of the key it was read from
+    key_type = 'Int' if key == '_id' else type_fields(node_type)[key].inner_type.name
+    conversion = CURSOR_CONVERSIONS.get(key_type)
+    return f'{conversion}({cursor})' if conversion else cursor
+
+
+def node_selections(selections, resolve_info):
+    # selections of edges { node { ... } } within a connection selection
+    for edges in extract_selections(selections, resolve_info.fragments):
+        if getattr(edges, 'name', None) and edges.name.value == 'edges' and edges.selection_set is not None:
+            for node in extract_selections(edges.selection_set.selections, resolve_info.fragments):
+                if getattr(node, 'name', None) and node.name.value == 'node' and node.selection_set is not None:
+                    return extract_selections(node.selection_set.selections, resolve_info.fragments)
+    return None
+
+
+def connection_projection(nodes, variable_name, key, selection, first, after):
+    """
+     * Map literal of a connection over nodes, the ordered list of at most first + 1 nodes following the cursor:
+     * the first nodes are the edges, and a node beyond them means there is a next page.
+     * first and after are Cypher expressions, or None when the connection has no first or after argument.
+    """
+    page = f'{nodes}[..{first}]' if first is not None else nodes
+    key_value = key_expression(variable_name, key)
+    node = f', node: {variable_name} {{{selection}}}' if selection is not None else ''
+    return (f'{{edges: [{variable_name} IN {page} | {{cursor: toString({key_value}){node}}}], '
+            f'pageInfo: {{hasNextPage: {f"size({nodes}) > {first}" if first is not None else "false"}, '
+            f'hasPreviousPage: {"true" if after is not None else "false"}, '
+            f'startCursor: toString({key_expression(f"head({page})", key)}), '
+            f'endCursor: toString({key_expression(f"last({page})", key)})}}}}')
+
+
+def nested_connection(head_selection, variable_name, schema_type, field, resolve_info, selection, params=None,
+                      limits=None):
+    """
+     * Projection of a nested connection field: the related nodes after the cursor are read ordered by the key
+     * with apoc.cypher.runFirstColumn, as a pattern comprehension can't be ordered.
+     * selection is the projection of the selected nodes, None when no node is selected.
+    """
+    field_name = head_selection.name.value
+    nested_variable = f'{variable_name}_{field_name}'
+    node_type = connection_node_type(field.inner_type)
+    key = connection_key(field)
+    relation = field.directives.get('relation', EMPTY_MAPPING)
+    direction = relation.get('direction')
+    pattern = (f"(this){'<' if direction in ['in', 'IN'] else ''}-[:{relation.get('name')}]-"
+               f"{'>' if direction in ['out', 'OUT'] else ''}(node:{node_type.name})")
+
+    first = argument_value(head_selection, 'first', resolve_info.variable_values)
+    if first is None:
+        first = default_limit(limits, schema_type.name, field_name, node_type.name)
+    after = argument_value(head_selection, 'after', resolve_info.variable_values)
+    arguments = {}
+    if first is not None:
+        arguments['limit'] = int(first) + 1
+    if after is not None:
+        arguments['after'] = after
+    # the filter values are passed to the statement with the other arguments
+    filter_value, _ = selection_filter_arguments(head_selection, schema_type, resolve_info.variable_values)
+    predicates = [filter_predicate(filter_value, node_type, 'node', arguments, 'filter_')]
+    if params is not None:
+        statement_args = param_map(arguments, params, f'{nested_variable}_')
+        first = f'${nested_variable}_limit - 1' if first is not None else None
+    else:
+        statement_args = re.sub(r"\"([^(\")]+)\":", "\\1:", json.dumps(arguments))
+    if after is not None:
+        predicates.insert(0, f'{key_expression("node", key)} > {cursor_expression("$after", node_type, key)}')
+    predicates = [predicate for predicate in predicates if predicate]
+    statement = (f'MATCH {pattern} {"WHERE " + " AND ".join(predicates) + " " if predicates else ""}'
+                 f'RETURN node ORDER BY {key_expression("node", key)} ASC{" LIMIT $limit" if first is not None else ""}')
+    nodes = f'{nested_variable}_nodes'
+    return (f'{field_name}: head([{nodes} IN [apoc.cypher.runFirstColumn("{statement}", '
+            f'{{this: {variable_name}{", " + statement_args[1:] if statement_args != "{}" else "}"}, true)] | '
+            f'{connection_projection(nodes, nested_variable, key, selection, first, after)}])')
+
+
+def connection_query(connection_name, node_type, key, selection, first, after, _id, kwargs, params=None,
+                     filter_value=None):
+    """
+     * Root connection query: the nodes are matched, ordered by the key and resumed after the cursor with a keyset
+     * predicate on the key rather than skipped, so with an index on the key every page costs the same
+     * whatever its depth. One node beyond first is read to tell whether there is a next page.
+    """
+    variable_name = low_first_letter(node_type.name)
+    predicates = []
+    if params is not None:
+        arg_string = param_map(kwargs, params)
+        if _id is not None:
+            predicates.append(f'ID({variable_name})=${add_param(params, "_id", _id)}')
+        if after is not None:
+            after = f'${add_param(params, "after", after)}'
+            predicates.append(f'{key_expression(variable_name, key)} > {cursor_expression(after, node_type, key)}')
+        if first is not None:
+            first = f'${add_param(params, "first", first)}'
+        limit = f'LIMIT {first} + 1 ' if first is not None else ''
+    else:
+        arg_string = re.sub(r"\"([^(\")]+)\":", "\\1:", json.dumps(kwargs))
+        if _id is not None:
+            predicates.append(f'ID({variable_name})={_id}')
+        if after is not None:
+            predicates.append(f'{key_expression(variable_name, key)} > '
+                              f'{cursor_expression(json.dumps(after), node_type, key)}')
+        limit = f'LIMIT {int(first) + 1} ' if first is not None else ''
+    predicates.append(filter_predicate(filter_value, node_type, variable_name, params, 'filter_'))
+    predicates = [predicate for predicate in predicates if predicate]
+    nodes = f'{variable_name}_nodes'
+    return (f'MATCH ({variable_name}:{node_type.name} {arg_string}) '
+            f'{"WHERE " + " AND ".join(predicates) + " " if predicates else ""}'
+            f'WITH {variable_name} ORDER BY {key_expression(variable_name, key)} ASC {limit}'
+            f'WITH collect({variable_name}) AS {nodes} '
+            f'RETURN {connection_projection(nodes, variable_name, key, selection, first, after)} '
+            f'AS {connection_name}')
@@ -0,0 +1,115 @@
+from .utils import type_fields, extract_selections, argument_value, context_value, default_limit
+from .instrumentation import get_instrumentation
+from .connections import connection_node_type, node_selections
+
+# rows assumed for a list without a first argument or default
+DEFAULT_LIST_SIZE = 100
+# cost of evaluating a @cypher field once, on top of the rows it returns
+CYPHER_FIELD_COST = 1
+QUERY_COST = 'query_cost'
+
+
+class QueryCostError(Exception):
+    def __init__(self, cost, budget):
+        super().__init__(f'Query cost {cost} exceeds the maximum cost of {budget}')
+        self.cost = cost
+        self.budget = budget
+
+
+def list_size(selection, variable_values, default=None):
+    # rows of a nested list: its first argument, else its default page size, else DEFAULT_LIST_SIZE
+    first = argument_value(selection, 'first', variable_values)
+    if first is None:
+        first = default
+    return DEFAULT_LIST_SIZE if first is None or int(first) < 0 else int(first)
+
+
+def selection_cost(selections, schema_type, resolve_info, limits=None):
+    """
+     * Estimated cost of projecting selections for one row of schema_type: every row a nested field
+     * materializes costs 1, and every @cypher field evaluation CYPHER_FIELD_COST.
+     * Nested lists are estimated from the page size they are translated with: their first argument,
+     * else their default_limit (limits, the option the query is translated with), else DEFAULT_LIST_SIZE.
+    """
+    cost = 0
+    # (selections, schema type, rows of that type per root row)
+    stack = [(selections, schema_type, 1)]
+    while stack:
+        selections, schema_type, rows = stack.pop()
+        fields = type_fields(schema_type)
+        for selection in extract_selections(selections, resolve_info.fragments):
+            # inline fragments are not translated either
+            field = fields.get(selection.name.value) if getattr(selection, 'name', None) else None
+            if field is None:
+                continue
+            if 'cypher' in field.directives:
+                cost += rows * CYPHER_FIELD_COST
+            if field.is_scalar or selection.selection_set is None:
+                continue
+            if 'connection' in field.directives:
+                # a page of edges: rows of the node type, as many as the first argument of the connection
+                node_type = connection_node_type(field.inner_type)
+                default = default_limit(limits, schema_type.name, selection.name.value, node_type.name)
+                nested_rows = rows * list_size(selection, resolve_info.variable_values, default)
+                cost += nested_rows
+                nodes = node_selections(selection.selection_set.selections, resolve_info)
+                if nodes is not None:
+                    stack.append((nodes, node_type, nested_rows))
+                continue
+            if field.is_list:
+                # the page size the list is sliced with: without the default_limit option there is none,
+                # the schema default of first only applies with it
+                default = default_limit(limits, schema_type.name, selection.name.value, field.inner_type.name,
+                                        field.default_args.get('first'))
+                nested_rows = rows * list_size(selection, resolve_info.variable_values, default)
+            else:
+                nested_rows = rows
+            cost += nested_rows
+            stack.append((selection.selection_set.selections, field.inner_type, nested_rows))
+    return cost
+
+
+def estimate_query_cost(resolve_info, field_node, first=-1, limits=None):
+    """
+     * Estimated cost of a root field: (1 + cost of one row) * root rows,
+     * where a root list or connection returns first rows, or DEFAULT_LIST_SIZE when first is not given.
+     * Returns (cost, cost of one row).
+    """
+    field = type_fields(resolve_info.parent_type).get(resolve_info.field_name)
+    row_cost = 1
+    if field is not None and 'connection' in field.directives:
+        # a root connection returns first nodes, like a root list
+        nodes = node_selections(field_node.selection_set.selections, resolve_info)
+        if nodes is not None:
+            row_cost += selection_cost(nodes, connection_node_type(field.inner_type), resolve_info, limits)
+    elif field is not None and not field.is_scalar and field_node.selection_set is not None:
+        row_cost += selection_cost(field_node.selection_set.selections, field.inner_type, resolve_info, limits)
+    if field is None or not (field.is_list or 'connection' in field.directives):
+        return row_cost, row_cost
+    return row_cost * (first if first > -1 else DEFAULT_LIST_SIZE), row_cost
+
+
+def enforce_query_cost(context, resolve_info, field_node, first=-1):
+    """
+     * Check the estimated cost of a root field against context['max_query_cost'] before it is translated.
+     * The budget is per root field: the costs of the root fields of an operation are not added up.
+     * Over the budget a QueryCostError is raised, or with context['query_cost_policy'] = 'limit'
+     * the first argument of a root list is lowered until the query fits.
+     * Returns the first argument to translate the field with, and records the cost with the instrumentation.
+    """
+    budget = context_value(context, 'max_query_cost')
+    instrumentation = get_instrumentation(context)
+    if budget is None and not instrumentation.enabled:
+        return first
+
+    cost, row_cost = estimate_query_cost(resolve_info, field_node, first, context_value(context, 'default_limit'))
+    if budget is not None and cost > budget:
+        field = type_fields(resolve_info.parent_type).get(resolve_info.field_name)
+        limited_first = budget // row_cost
+        if context_value(context, 'query_cost_policy') != 'limit' or field is None \
+                or not (field.is_list or 'connection' in field.directives) or limited_first < 1:
+            instrumentation.record(QUERY_COST, cost, field=resolve_info.field_name, rejected=True)
+            raise QueryCostError(cost, budget)
+        first, cost = limited_first, limited_first * row_cost
+    instrumentation.record(QUERY_COST, cost, field=resolve_info.field_name)
+    return first
@@ -0,0 +1,149 @@
+import time
+from threading import Lock
+
+from neo4j import GraphDatabase
+from neo4j.exceptions import ClientError
+
+from .instrumentation import NOOP_INSTRUMENTATION
+
+# values recorded with the request's instrumentation for every managed transaction, next to server_time_ms
+POOL_WAIT_MS = 'pool_wait_ms'
+POOL_IN_USE = 'pool_in_use'
+POOL_ACQUISITION_TIMEOUT = 'pool_acquisition_timeout'
+
+
+class DriverManager:
+    """
+     * Builds and owns the Neo4j driver of an application with its pool settings, and keeps gauges of the pool:
+     * connections in use and waited for, the time spent waiting for them and the acquisitions that timed out.
+     * Put it in the context in place of the driver:
+     *
+     *   with DriverManager(uri, auth=(user, password), max_connection_pool_size=50) as driver:
+     *       graphql_sync(schema, query, context_value={'driver': driver, 'instrumentation': instrumentation})
+     *
+     * Every managed transaction then records pool_wait_ms and pool_in_use with the request's instrumentation,
+     * and pool_acquisition_timeout when no connection was free within connection_acquisition_timeout.
+     * The default timeout fails a request after 5s instead of the driver's 60s, so an exhausted pool shows
+     * as errors rather than as latency. gauges() returns the totals, e.g. for a health endpoint.
+     * Auto-commit statements, as streamed lists run, are not counted.
+    """
+
+    def __init__(self, uri, auth=None, max_connection_pool_size=100, connection_acquisition_timeout=5.0,
+                 max_connection_lifetime=3600, **config):
+        self.max_connection_pool_size = max_connection_pool_size
+        self.driver = GraphDatabase.driver(uri, auth=auth, max_connection_pool_size=max_connection_pool_size,
+                                           connection_acquisition_timeout=connection_acquisition_timeout,
+                                           max_connection_lifetime=max_connection_lifetime, **config)
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.waiting = 0
+        self.acquisitions = 0
+        self.acquisition_timeouts = 0
+        self.wait_ms = 0.0
+        self._lock = Lock()
+
+    def session(self, instrumentation=None, **config):
+        return ManagedSession(self, self.driver.session(**config), instrumentation or NOOP_INSTRUMENTATION)
+
+    def wait(self):
+        with self._lock:
+            self.waiting += 1
+
+    def acquired(self, wait_ms, instrumentation):
+        with self._lock:
+            self.waiting -= 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            self.acquisitions += 1
+            self.wait_ms += wait_ms
+            in_use = self.in_use
+        instrumentation.record(POOL_WAIT_MS, wait_ms)
+        instrumentation.record(POOL_IN_USE, in_use)
+
+    def timed_out(self, instrumentation):
+        with self._lock:
+            self.acquisition_timeouts += 1
+        instrumentation.record(POOL_ACQUISITION_TIMEOUT, 1)
+
+    def released(self, acquired):
+        with self._lock:
+            if acquired:
+                self.in_use -= 1
+            else:
+                self.waiting -= 1
+
+    def gauges(self):
+        with self._lock:
+            return {'in_use': self.in_use, 'peak_in_use': self.peak_in_use, 'waiting': self.waiting,
+                    'max_pool_size': self.max_connection_pool_size, 'acquisitions': self.acquisitions,
+                    'acquisition_timeouts': self.acquisition_timeouts, 'wait_ms': self.wait_ms,
+                    'mean_wait_ms': self.wait_ms / self.acquisitions if self.acquisitions else 0.0}
+
+    def report(self, instrumentation):
+        # record the gauges with an instrumentation, e.g. periodically with one reporting to a metrics backend
+        for name, value in self.gauges().items():
+            instrumentation.record(f'pool_{name}', value)
+
+    def close(self):
+        self.driver.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def is_acquisition_timeout(error):
+    return bool(error.args) and str(error.args[0]).startswith('Failed to obtain a connection from pool')
+
+
+class ManagedSession:
+    """
+     * Session of a DriverManager. A transaction waits from the call until its transaction function first runs,
+     * when the connection has been acquired and the transaction begun, and holds the connection until it returns.
+    """
+
+    def __init__(self, manager, session, instrumentation):
+        self.manager = manager
+        self.session = session
+        self.instrumentation = instrumentation
+
+    def read_transaction(self, transaction_function, *args, **kwargs):
+        return self.transaction(self.session.read_transaction, transaction_function, *args, **kwargs)
+
+    def write_transaction(self, transaction_function, *args, **kwargs):
+        return self.transaction(self.session.write_transaction, transaction_function, *args, **kwargs)
+
+    def transaction(self, run_transaction, transaction_function, *args, **kwargs):
+        acquired = False
+        start = time.perf_counter()
+
+        def work(tx, *args, **kwargs):
+            nonlocal acquired
+            # a retry runs the function again on a connection acquired anew, counted as held all along
+            if not acquired:
+                acquired = True
+                self.manager.acquired((time.perf_counter() - start) * 1000, self.instrumentation)
+            return transaction_function(tx, *args, **kwargs)
+
+        self.manager.wait()
+        try:
+            return run_transaction(work, *args, **kwargs)
+        except ClientError as e:
+            if not acquired and is_acquisition_timeout(e):
+                self.manager.timed_out(self.instrumentation)
+            raise
+        finally:
+            self.manager.released(acquired)
+
+    def __getattr__(self, name):
+        # run, last_bookmark, close, ... of the driver's session
+        return getattr(self.session, name)
+
+    def __enter__(self):
+        self.session.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self.session.__exit__(exc_type, exc_value, traceback)
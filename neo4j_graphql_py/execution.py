@@ -0,0 +1,181 @@
+from graphql import (GraphQLError, OperationType, get_operation_root_type, is_non_null_type, is_list_type, is_leaf_type,
+                     is_object_type)
+from graphql.execution.execute import ExecutionContext, get_field_def
+from graphql.execution.values import get_argument_values
+from graphql.pyutils import Path
+
+from .main import cypher_query, driver_session, READ_ACCESS
+from .utils import type_identifiers, is_array_type, rename_parameters, is_projected_field, pre_shaped, PreShaped
+
+
+def neo4j_resolver(resolve):
+    # mark a root resolver as backed by neo4j_graphql, so its field can be compiled into the operation statement
+    resolve.neo4j_graphql = True
+    return resolve
+
+
+class SingleStatementExecutionContext(ExecutionContext):
+    """
+     * Opt-in executor that compiles every neo4j root field of a query operation into one Cypher statement
+     * of CALL {} subqueries, runs it in a single round-trip and hands each root field its column:
+     *
+     *   graphql_sync(schema, query, context_value=context, execution_context_class=SingleStatementExecutionContext)
+     *
+     * Root fields are included when their resolver is marked with neo4j_resolver (augment_schema marks its own);
+     * any other root field is resolved as usual.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # response key -> result of every root field compiled into the statement
+        self.prefetched = {}
+
+    def execute_operation(self, operation, root_value):
+        if operation.operation == OperationType.QUERY:
+            self.prefetched = prefetch_root_fields(self, operation)
+        return super().execute_operation(operation, root_value)
+
+    def resolve_field_value_or_error(self, field_def, field_nodes, resolve_fn, source, info):
+        if info.path.prev is None and info.path.key in self.prefetched:
+            return self.prefetched[info.path.key]
+        return super().resolve_field_value_or_error(field_def, field_nodes, resolve_fn, source, info)
+
+
+class NotPreShaped(Exception):
+    pass
+
+
+class PreShapedExecutionContext(ExecutionContext):
+    """
+     * Opt-in executor completing the results of neo4j_graphql, already shaped by their Cypher map projection,
+     * with one typed copy instead of resolving every field of every row:
+     *
+     *   graphql_sync(schema, query, context_value=context, execution_context_class=PreShapedExecutionContext)
+     *
+     * The copy renames the projected keys to the response keys and serializes the leaf values.
+     * A result is completed as usual when its selection has a field with a resolver of its own or of an abstract type,
+     * or when the copy fails, e.g. on a null non-null field, so errors are reported in place.
+     * It can be combined with the single statement executor:
+     *
+     *   class Executor(SingleStatementExecutionContext, PreShapedExecutionContext): pass
+    """
+
+    def complete_value(self, return_type, field_nodes, info, path, result):
+        if isinstance(result, PreShaped):
+            try:
+                return self.copier(return_type, field_nodes)(result)
+            except Exception:
+                result = list(result) if isinstance(result, list) else dict(result)
+        return super().complete_value(return_type, field_nodes, info, path, result)
+
+    def copier(self, return_type, field_nodes):
+        """
+         * Function copying a projected value of return_type for the selections of field_nodes, built once per
+         * root field rather than dispatched per field of every row. Raises NotPreShaped for a selection
+         * that must be resolved.
+        """
+        if is_non_null_type(return_type):
+            return self.non_null_copier(return_type, field_nodes)
+        if is_list_type(return_type):
+            copy_item = self.copier(return_type.of_type, field_nodes)
+            return lambda value: None if value is None else [copy_item(item) for item in value]
+        if is_leaf_type(return_type):
+            complete_leaf_value = self.complete_leaf_value
+            return lambda value: None if value is None else complete_leaf_value(return_type, value)
+        return self.object_copier(return_type, field_nodes)
+
+    def non_null_copier(self, return_type, field_nodes):
+        copy = self.copier(return_type.of_type, field_nodes)
+
+        def copy_non_null(value):
+            if value is None:
+                raise TypeError('Cannot return null for non-nullable field')
+            return copy(value)
+        return copy_non_null
+
+    def object_copier(self, return_type, field_nodes):
+        if not is_object_type(return_type) or return_type.is_type_of is not None:
+            raise NotPreShaped(return_type.name)
+        fields = []
+        for response_key, sub_field_nodes in self.collect_subfields(return_type, field_nodes).items():
+            field_name = sub_field_nodes[0].name.value
+            if field_name == '__typename':
+                # a constant, with no key to read
+                fields.append((response_key, None, return_type.name))
+                continue
+            field = return_type.fields[field_name]
+            if not is_projected_field(field):
+                raise NotPreShaped(f'{return_type.name}.{field_name}')
+            fields.append((response_key, field_name, self.copier(field.type, sub_field_nodes)))
+
+        def copy_object(value):
+            if value is None:
+                return None
+            return {response_key: copy if field_name is None else copy(value[field_name])
+                    for response_key, field_name, copy in fields}
+        return copy_object
+
+
+def prefetch_root_fields(execution_context, operation):
+    schema = execution_context.schema
+    context = execution_context.context_value
+    root_type = get_operation_root_type(schema, operation)
+    fields = execution_context.collect_fields(root_type, operation.selection_set, {}, set())
+
+    roots = []
+    for response_key, field_nodes in fields.items():
+        field_def = get_field_def(schema, root_type, field_nodes[0].name.value)
+        if field_def is None or not getattr(field_def.resolve, 'neo4j_graphql', False):
+            continue
+        try:
+            resolve_info = execution_context.build_resolve_info(field_def, field_nodes, root_type,
+                                                                Path(None, response_key))
+            kwargs = get_argument_values(field_def, field_nodes[0], execution_context.variable_values)
+            query, params = cypher_query(context, resolve_info, parameterized=True, **kwargs)
+        except Exception:
+            # leave the field to its resolver, which reports the error in place
+            continue
+        roots.append((response_key, field_def.type, query, params))
+
+    if len(roots) < 2:
+        return {}
+
+    statement, params = operation_statement([(return_type, query, params) for _, return_type, query, params in roots])
+    try:
+        record = run_statement(context, statement, params)[0]
+    except Exception as e:
+        error = GraphQLError(str(e), original_error=e)
+        return {response_key: error for response_key, *_ in roots}
+
+    prefetched = {}
+    for index, (response_key, return_type, _, _) in enumerate(roots):
+        column = record.get(f'_root{index}')
+        prefetched[response_key] = pre_shaped(column if is_array_type(return_type)
+                                              else column[0] if len(column) > 0 else None)
+    return prefetched
+
+
+def operation_statement(roots):
+    """
+     * Combine the (return_type, query, params) of each root field into one statement returning a single row:
+     *   CALL { CALL { <query 0> } RETURN collect(<variable 0>) AS _root0 } ... RETURN _root0, ...
+     * Parameters are prefixed per root field so they can't collide.
+    """
+    subqueries = []
+    statement_params = {}
+    for index, (return_type, query, params) in enumerate(roots):
+        prefix = f'_root{index}_'
+        variable_name = type_identifiers(return_type).get('variable_name')
+        query = rename_parameters(query, lambda name: f'${prefix}{name}')
+        subqueries.append(f'CALL {{ CALL {{ {query} }} RETURN collect({variable_name}) AS _root{index} }}')
+        statement_params.update({f'{prefix}{name}': value for name, value in params.items()})
+    columns = ', '.join(f'_root{index}' for index in range(len(roots)))
+    return f'{" ".join(subqueries)} RETURN {columns}', statement_params
+
+
+def run_statement(context, statement, params):
+    neo4j_session = context.get('neo4j_session')
+    if neo4j_session is not None:
+        return neo4j_session.run(statement, params).data()
+    with driver_session(context, READ_ACCESS) as session:
+        return session.read_transaction(lambda tx: tx.run(statement, params).data())
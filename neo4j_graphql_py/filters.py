@@ -0,0 +1,92 @@
+import json
+
+from graphql.execution.values import get_argument_values
+
+from .utils import type_fields, add_param
+
+# filter input field suffix -> Cypher comparison, a filter field without a suffix is an equality
+FILTER_OPERATORS = {
+    '_in': 'IN',
+    '_contains': 'CONTAINS',
+    '_starts_with': 'STARTS WITH',
+    '_gt': '>',
+    '_lt': '<',
+}
+# scalar types the string and range operators are generated for
+STRING_TYPES = ('String', 'ID')
+ORDERED_TYPES = ('String', 'ID', 'Int', 'Float')
+FILTER = 'filter'
+ORDER_BY = 'orderBy'
+
+
+def filter_type_name(type_name):
+    return f'_{type_name}Filter'
+
+
+def ordering_type_name(type_name):
+    return f'_{type_name}Ordering'
+
+
+def filter_fields(schema_type):
+    # (name, type name) of the fields that can be filtered and ordered on: stored scalar properties
+    return [(name, field.inner_type.name) for name, field in type_fields(schema_type).items()
+            if field.is_scalar and not field.is_list and name != '_id' and 'cypher' not in field.directives]
+
+
+def filter_predicate(filter_value, schema_type, variable_name, params=None, param_prefix=''):
+    """
+     * WHERE predicate of a filter argument on the nodes bound to variable_name, e.g.
+     *   {title_starts_with: "The", OR: [{year: 2000}, {year_gt: 2010}]}
+     *   movie.title STARTS WITH "The" AND (movie.year = 2000 OR movie.year > 2010)
+     * Values are inlined, or passed as Cypher parameters when params is a dict.
+     * Returns an empty string for an empty filter.
+    """
+    fields = type_fields(schema_type)
+    predicates = []
+    for key, value in (filter_value or {}).items():
+        if key in ('AND', 'OR'):
+            nested = [filter_predicate(item, schema_type, variable_name, params, f'{param_prefix}{key}_{index}_')
+                      for index, item in enumerate(value or [])]
+            nested = [f'({predicate})' for predicate in nested if predicate]
+            if nested:
+                predicates.append(nested[0] if len(nested) == 1 else f'({f" {key} ".join(nested)})')
+            continue
+        if key in fields:
+            field_name, operator = key, '='
+        else:
+            suffix = next(suffix for suffix in FILTER_OPERATORS if key.endswith(suffix) and key[:-len(suffix)] in fields)
+            field_name, operator = key[:-len(suffix)], FILTER_OPERATORS[suffix]
+        if value is None and operator == '=':
+            predicates.append(f'{variable_name}.{field_name} IS NULL')
+            continue
+        if params is not None:
+            literal = f'${add_param(params, param_prefix + key, value)}'
+        else:
+            literal = json.dumps(value)
+        predicates.append(f'{variable_name}.{field_name} {operator} {literal}')
+    return ' AND '.join(predicates)
+
+
+def order_by_expressions(order_by, variable_name):
+    # ORDER BY expressions of an orderBy argument, e.g. ['title_asc', 'year_desc']
+    return [f'{variable_name}.{value.rsplit("_", 1)[0]} {value.rsplit("_", 1)[1].upper()}' for value in order_by or []]
+
+
+def sorted_nodes(nodes, order_by):
+    """
+     * Nodes of a list expression sorted by an orderBy argument with apoc.coll.sortNodes,
+     * for pattern comprehensions which can't be ordered. The sort is stable,
+     * so sorting by the last key first sorts by every key.
+    """
+    for value in reversed(order_by):
+        field_name, direction = value.rsplit('_', 1)
+        nodes = f"apoc.coll.sortNodes({nodes}, '{'^' if direction == 'asc' else ''}{field_name}')"
+    return nodes
+
+
+def selection_filter_arguments(selection, schema_type, variable_values):
+    # coerced filter and orderBy arguments of a nested field selection, None when the field has none
+    if not any(argument.name.value in (FILTER, ORDER_BY) for argument in selection.arguments):
+        return None, None
+    values = get_argument_values(schema_type.fields[selection.name.value], selection, variable_values)
+    return values.get(FILTER), values.get(ORDER_BY)
@@ -0,0 +1,135 @@
+import sys
+import time
+
+from .utils import context_value
+
+# phases timed by neo4j_graphql, in the order they run
+EXTRACT_SELECTIONS = 'extract_selections'
+GENERATE_CYPHER = 'generate_cypher'
+DRIVER_CHECKOUT = 'driver_checkout'
+EXECUTE = 'execute'
+EXTRACT_RESULT = 'extract_result'
+# value recorded from the result summary: time the server took to make the result available and stream it
+SERVER_TIME_MS = 'server_time_ms'
+
+
+class Span:
+    # no-op span, the base of the spans returned by Instrumentation.span
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+
+NOOP_SPAN = Span()
+
+
+class Instrumentation:
+    """
+     * Instrumentation interface, set per request as context['instrumentation'].
+     * neo4j_graphql opens a span per phase (see the phase names above) and records values such as the
+     * server time of each statement. This base class does nothing; subclass it or use TimingInstrumentation
+     * or OpenTelemetryInstrumentation.
+    """
+
+    enabled = False
+
+    def span(self, name, **attributes):
+        return NOOP_SPAN
+
+    def record(self, name, value, **attributes):
+        pass
+
+
+NOOP_INSTRUMENTATION = Instrumentation()
+
+
+def get_instrumentation(context):
+    return context_value(context, 'instrumentation') or NOOP_INSTRUMENTATION
+
+
+class TimedSpan(Span):
+    def __init__(self, instrumentation, name, attributes):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self):
+        self.allocated_blocks = sys.getallocatedblocks()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        duration = time.perf_counter() - self.start
+        allocated_blocks = sys.getallocatedblocks() - self.allocated_blocks
+        self.instrumentation.spans.append((self.name, duration, allocated_blocks, self.attributes))
+        return False
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+
+class TimingInstrumentation(Instrumentation):
+    """
+     * Collects the duration and the net number of allocated memory blocks (sys.getallocatedblocks) of every span,
+     * and every recorded value:
+     *
+     *   instrumentation = TimingInstrumentation()
+     *   graphql_sync(schema, query, context_value={'driver': driver, 'instrumentation': instrumentation})
+     *   instrumentation.summary()  # {'execute': {'count': 1, 'total_ms': ..., 'mean_ms': ..., 'allocated_blocks': ...}}
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.spans = []
+        self.values = []
+
+    def span(self, name, **attributes):
+        return TimedSpan(self, name, attributes)
+
+    def record(self, name, value, **attributes):
+        self.values.append((name, value, attributes))
+
+    def summary(self):
+        phases = {}
+        for name, duration, allocated_blocks, _ in self.spans:
+            phase = phases.setdefault(name, {'count': 0, 'total_ms': 0.0, 'allocated_blocks': 0})
+            phase['count'] += 1
+            phase['total_ms'] += duration * 1000
+            phase['allocated_blocks'] += allocated_blocks
+        for name, value, _ in self.values:
+            phase = phases.setdefault(name, {'count': 0, 'total': 0})
+            phase['count'] += 1
+            phase['total'] += value
+        for phase in phases.values():
+            if 'total_ms' in phase:
+                phase['mean_ms'] = phase['total_ms'] / phase['count']
+        return phases
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+     * Reports every phase as an OpenTelemetry span and recorded values as attributes of the current span.
+     * Requires the opentelemetry-api package.
+    """
+
+    enabled = True
+
+    def __init__(self, tracer=None):
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError('OpenTelemetryInstrumentation requires the opentelemetry-api package')
+        self.trace = trace
+        self.tracer = tracer or trace.get_tracer('neo4j_graphql_py')
+
+    def span(self, name, **attributes):
+        return self.tracer.start_as_current_span(name, attributes=attributes)
+
+    def record(self, name, value, **attributes):
+        self.trace.get_current_span().set_attribute(name, value)
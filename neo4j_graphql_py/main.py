@@ -1,22 +1,252 @@
 import re
 import json
 import logging
+from collections.abc import MutableMapping
+from neo4j import READ_ACCESS, WRITE_ACCESS
 from pydash import filter_
+from .cache import query_plan_cache
+from .cost import enforce_query_cost
+from .driver_manager import DriverManager
+from .instrumentation import (get_instrumentation, EXTRACT_SELECTIONS, GENERATE_CYPHER, DRIVER_CHECKOUT, EXECUTE,
+                              EXTRACT_RESULT, SERVER_TIME_MS)
 from .selections import build_cypher_selection
+from .connections import connection_query, connection_key, connection_node_type, node_selections
+from .filters import filter_predicate, order_by_expressions, FILTER, ORDER_BY
 from .utils import (is_mutation, is_add_relationship_mutation, type_identifiers, low_first_letter, cypher_directive,
-                    mutation_meta_directive, extract_query_result, extract_selections,
-                    fix_params_for_add_relationship_mutation)
+                    mutation_meta_directive, keyed_mutation_directive, extract_query_result, query_result, column_result,
+                    extract_selections, fix_params_for_add_relationship_mutation, selection_key, escape_braces,
+                    param_map, add_param, context_value, type_fields, default_limit, limits_key, inner_type, is_bulk_mutation,
+                    pre_shaped, BULK_CREATE, BULK_ROWS, BULK_INPUT)
 
+# rows per statement of a bulk mutation, see bulk_chunks
+DEFAULT_BULK_CHUNK_SIZE = 1000
+# requirements.txt pins the 4.x driver, which has no AsyncDriver
+ASYNC_DRIVER_REQUIRED = ("neo4j_graphql_async needs context['driver'] to be an AsyncDriver "
+                         "(neo4j.AsyncGraphDatabase.driver), install neo4j>=5 to use it")
+# the application configures handlers and levels, e.g. logging.basicConfig(level=logging.INFO) to see debug=True output
 logger = logging.getLogger('neo4j_graphql_py')
-logger.setLevel(logging.DEBUG)
-ch = logging.StreamHandler()
-formatter = logging.Formatter('%(levelname)s:     %(message)s')
-ch.setFormatter(formatter)
-logger.addHandler(ch)
+logger.addHandler(logging.NullHandler())
 
 
-def neo4j_graphql(obj, context, resolve_info, debug=False, **kwargs):
-    if is_mutation(resolve_info):
+def neo4j_graphql(obj, context, resolve_info, debug=False, parameterized=False, **kwargs):
+    with get_instrumentation(context).span('neo4j_graphql', field=resolve_info.field_name):
+        try:
+            query, params = translate_resolver(context, resolve_info, debug, parameterized, **kwargs)
+            result_cache = context_value(context, 'result_cache')
+            if result_cache is None:
+                return run_field_query(context, resolve_info, query, params)
+            if is_mutation(resolve_info):
+                try:
+                    return run_field_query(context, resolve_info, query, params)
+                finally:
+                    # also when a statement fails, as the chunks of a bulk mutation before it are committed
+                    invalidate_results(context, result_cache, query)
+            if context_value(context, 'neo4j_session') is not None:
+                # the shared transaction reads its own writes, which are not committed yet
+                return run_field_query(context, resolve_info, query, params)
+            return result_cache.fetch(query, params, lambda: run_field_query(context, resolve_info, query, params))
+        except Exception:
+            # the shared transaction of the operation rolls back instead of committing
+            fail_operation(context)
+            raise
+
+
+def fail_operation(context):
+    neo4j_session = context_value(context, 'neo4j_session')
+    if hasattr(neo4j_session, 'fail'):
+        neo4j_session.fail()
+
+
+def invalidate_results(context, result_cache, query):
+    # once the writes are committed: a read before would cache the results they are about to change
+    neo4j_session = context_value(context, 'neo4j_session')
+    if hasattr(neo4j_session, 'after_commit'):
+        neo4j_session.after_commit(lambda: result_cache.invalidate(query))
+    else:
+        result_cache.invalidate(query)
+
+
+def run_field_query(context, resolve_info, query, params):
+    # the result is marked as shaped by its map projection, see PreShapedExecutionContext
+    if is_bulk_mutation(resolve_info):
+        return pre_shaped([node for chunk in bulk_chunks(context, params)
+                           for node in run_query(context, query, chunk, resolve_info.return_type, WRITE_ACCESS)])
+    return pre_shaped(run_query(context, query, params, resolve_info.return_type, access_mode_of(resolve_info)))
+
+
+def bulk_chunks(context, params):
+    """
+     * Parameters of every statement of a bulk mutation: its rows split in chunks of context['bulk_chunk_size'] rows,
+     * DEFAULT_BULK_CHUNK_SIZE by default. Each chunk is one statement, committed on its own unless
+     * context['neo4j_session'] runs the whole operation in one transaction.
+    """
+    rows = params[BULK_ROWS]
+    chunk_size = context_value(context, 'bulk_chunk_size', DEFAULT_BULK_CHUNK_SIZE)
+    for start in range(0, len(rows), chunk_size):
+        yield {**params, BULK_ROWS: rows[start:start + chunk_size]}
+
+
+def run_query(context, query, params, return_type, access_mode=READ_ACCESS):
+    instrumentation = get_instrumentation(context)
+    neo4j_session = context.get('neo4j_session')
+    if neo4j_session is not None:
+        with instrumentation.span(EXECUTE):
+            result = neo4j_session.run(query, params)
+        return instrumented_result(instrumentation, result, return_type)
+
+    with instrumentation.span(DRIVER_CHECKOUT):
+        session = driver_session(context, access_mode)
+    with session:
+        data, summary = transaction_function(session, access_mode)(run_transaction, instrumentation, query, params,
+                                                                   return_type)
+        if access_mode == WRITE_ACCESS:
+            keep_bookmark(context, session.last_bookmark())
+    record_server_time(instrumentation, summary)
+    return data
+
+
+def run_transaction(tx, instrumentation, query, params, return_type):
+    # run by the driver again when the transaction fails with a transient error, e.g. a leader switch,
+    # so the summary is returned and recorded once, by the caller
+    with instrumentation.span(EXECUTE):
+        result = tx.run(query, params)
+    with instrumentation.span(EXTRACT_RESULT):
+        data = extract_query_result(result, return_type)
+    return data, result.consume() if instrumentation.enabled else None
+
+
+def driver_session(context, access_mode, **config):
+    """
+     * Session of context['driver'] for access_mode: on a cluster, READ sessions are routed to the followers and
+     * WRITE sessions to the leader. The session waits until the server has the writes of context['bookmarks'].
+    """
+    driver = context.get('driver')
+    if isinstance(driver, DriverManager):
+        # its pool gauges are recorded with the request's instrumentation
+        config['instrumentation'] = get_instrumentation(context)
+    return driver.session(default_access_mode=access_mode, bookmarks=context_value(context, 'bookmarks'), **config)
+
+
+def transaction_function(session, access_mode):
+    # managed transaction of the session for access_mode, retried on transient errors
+    return session.write_transaction if access_mode == WRITE_ACCESS else session.read_transaction
+
+
+def keep_bookmark(context, bookmark):
+    # reads of the request after a write wait for it, and the application can hand it to the client's next request
+    if isinstance(context, MutableMapping) and bookmark is not None:
+        context['bookmarks'] = [bookmark]
+
+
+def access_mode_of(resolve_info):
+    return WRITE_ACCESS if is_mutation(resolve_info) else READ_ACCESS
+
+
+def instrumented_result(instrumentation, result, return_type):
+    with instrumentation.span(EXTRACT_RESULT):
+        data = extract_query_result(result, return_type)
+    if instrumentation.enabled:
+        record_server_time(instrumentation, result.consume())
+    return data
+
+
+def record_server_time(instrumentation, summary):
+    # summary is None when the result was not consumed, as instrumentation is disabled
+    available_after = getattr(summary, 'result_available_after', None)
+    consumed_after = getattr(summary, 'result_consumed_after', None)
+    if available_after is not None and consumed_after is not None:
+        instrumentation.record(SERVER_TIME_MS, available_after + consumed_after)
+
+
+async def neo4j_graphql_async(obj, context, resolve_info, debug=False, parameterized=False, **kwargs):
+    """
+     * Coroutine version of neo4j_graphql for async GraphQL servers.
+     * context['driver'] must be an AsyncDriver (neo4j.AsyncGraphDatabase.driver, neo4j>=5),
+     * so sibling root fields are queried concurrently instead of blocking the event loop.
+    """
+    instrumentation = get_instrumentation(context)
+    with instrumentation.span('neo4j_graphql', field=resolve_info.field_name):
+        try:
+            query, params = translate_resolver(context, resolve_info, debug, parameterized, **kwargs)
+            result_cache = context_value(context, 'result_cache')
+            if result_cache is None:
+                return await run_field_query_async(context, resolve_info, query, params)
+            if is_mutation(resolve_info):
+                try:
+                    return await run_field_query_async(context, resolve_info, query, params)
+                finally:
+                    invalidate_results(context, result_cache, query)
+            if context_value(context, 'neo4j_session') is not None:
+                return await run_field_query_async(context, resolve_info, query, params)
+            return await result_cache.fetch_async(query, params,
+                                                  lambda: run_field_query_async(context, resolve_info, query, params))
+        except Exception:
+            # the shared transaction of the operation rolls back instead of committing
+            fail_operation(context)
+            raise
+
+
+async def run_field_query_async(context, resolve_info, query, params):
+    if is_bulk_mutation(resolve_info):
+        return pre_shaped([node for chunk in bulk_chunks(context, params)
+                           for node in await run_query_async(context, resolve_info, query, chunk)])
+    return pre_shaped(await run_query_async(context, resolve_info, query, params))
+
+
+async def run_query_async(context, resolve_info, query, params):
+    instrumentation = get_instrumentation(context)
+    neo4j_batcher = context.get('neo4j_batcher')
+    if neo4j_batcher is not None and not is_mutation(resolve_info):
+        column = type_identifiers(resolve_info.return_type).get('variable_name')
+        with instrumentation.span(EXECUTE, batched=True):
+            records = await neo4j_batcher.load(query, params, column, context)
+        with instrumentation.span(EXTRACT_RESULT):
+            return query_result(records, resolve_info.return_type)
+
+    neo4j_session = context.get('neo4j_session')
+    if neo4j_session is not None:
+        with instrumentation.span(EXECUTE):
+            records = await neo4j_session.run(query, params)
+        with instrumentation.span(EXTRACT_RESULT):
+            return query_result(records, resolve_info.return_type)
+
+    access_mode = access_mode_of(resolve_info)
+    with instrumentation.span(DRIVER_CHECKOUT):
+        session = driver_session(context, access_mode)
+    if not hasattr(session, '__aenter__'):
+        # a session of a sync driver, which holds a connection once it has run a query
+        session.close()
+        raise TypeError(ASYNC_DRIVER_REQUIRED)
+    async with session:
+        column = type_identifiers(resolve_info.return_type).get('variable_name')
+        with instrumentation.span(EXECUTE):
+            values, summary = await transaction_function(session, access_mode)(fetch_column, query, params, column,
+                                                                               instrumentation.enabled)
+        if access_mode == WRITE_ACCESS:
+            keep_bookmark(context, await session.last_bookmark())
+        record_server_time(instrumentation, summary)
+        with instrumentation.span(EXTRACT_RESULT):
+            return column_result(values, resolve_info.return_type)
+
+
+async def fetch_column(tx, query, params, column, summarize=False):
+    # the projected column of every record, see extract_query_result, and the summary of the result when summarize
+    result = await tx.run(query, params)
+    values = await result.value(column)
+    return values, await result.consume() if summarize else None
+
+
+def translate_resolver(context, resolve_info, debug=False, parameterized=False, **kwargs):
+    # translate the field being resolved and return the Cypher query with the parameters to run it with
+    if parameterized:
+        if is_mutation(resolve_info):
+            query, kwargs = cypher_mutation(context, resolve_info, parameterized=True, **kwargs)
+        else:
+            query, kwargs = cypher_query(context, resolve_info, parameterized=True, **kwargs)
+    elif is_bulk_mutation(resolve_info):
+        query = cypher_mutation(context, resolve_info, **kwargs)
+        kwargs = {BULK_ROWS: kwargs[BULK_INPUT]}
+    elif is_mutation(resolve_info):
         query = cypher_mutation(context, resolve_info, **kwargs)
         if is_add_relationship_mutation(resolve_info):
             # kwargs = fix_params_for_add_relationship_mutation(resolve_info, **kwargs)
@@ -28,85 +258,216 @@ def neo4j_graphql(obj, context, resolve_info, debug=False, **kwargs):
     if debug:
         logger.info(query)
         logger.info(kwargs)
-
-    with context.get('driver').session() as session:
-        data = session.run(query, **kwargs)
-        data = extract_query_result(data, resolve_info.return_type)
-        return data
+    return query, kwargs
 
 
-def cypher_query(context, resolve_info, first=-1, offset=0, _id=None, **kwargs):
+def cypher_query(context, resolve_info, first=-1, offset=0, _id=None, parameterized=False, **kwargs):
+    """
+     * Translate a root query field to Cypher.
+     * With parameterized=True every argument value is passed as a Cypher parameter
+     * and a (query, params) tuple is returned instead of the query string.
+    """
     types_ident = type_identifiers(resolve_info.return_type)
-    type_name = types_ident.get('type_name')
     variable_name = types_ident.get('variable_name')
-    schema_type = resolve_info.schema.get_type(type_name)
 
     filtered_field_nodes = filter_(resolve_info.field_nodes, lambda n: n.name.value == resolve_info.field_name)
 
+    limits = context_value(context, 'default_limit')
+    field = type_fields(resolve_info.parent_type).get(resolve_info.field_name)
+    if field is not None and 'connection' in field.directives:
+        return connection_cypher_query(context, resolve_info, field, filtered_field_nodes[0], first, _id, parameterized,
+                                       limits, kwargs)
+    if first == -1:
+        first = root_limit(limits, resolve_info)
     # FIXME: how to handle multiple field_node matches
-    selections = extract_selections(filtered_field_nodes[0].selection_set.selections, resolve_info.fragments)
+    first = enforce_query_cost(context, resolve_info, filtered_field_nodes[0], first)
+    instrumentation = get_instrumentation(context)
+    with instrumentation.span(EXTRACT_SELECTIONS):
+        plan_key = ('query', resolve_info.schema, resolve_info.parent_type.name, resolve_info.field_name, parameterized,
+                    limits_key(limits),
+                    selection_key(filtered_field_nodes[0].selection_set.selections, resolve_info.fragments,
+                                  resolve_info.variable_values))
+    with instrumentation.span(GENERATE_CYPHER) as span:
+        plan = query_plan_cache.get(plan_key)
+        span.set_attribute('cached', plan is not None)
+        if plan is None:
+            plan = compile_query_template(resolve_info, filtered_field_nodes[0], parameterized, limits)
+            query_plan_cache.put(plan_key, plan)
+        template, selection_params = plan
 
-    # if len(selections) == 0:
-    #     # FIXME: why aren't the selections found in the filteredFieldNode?
-    #     selections = extract_selections(resolve_info.operation.selection_set.selections, resolve_info.fragments)
+        params = dict(selection_params) if parameterized else None
+        filter_value, order_by = kwargs.pop(FILTER, None), kwargs.pop(ORDER_BY, None)
+        arguments = root_arguments(variable_name, first, offset, _id, kwargs, params)
+        if filter_value or order_by:
+            arguments.update(root_filter_arguments(variable_name, field.inner_type, _id, filter_value, order_by,
+                                                   params))
+        query = template.format(**arguments)
+    return (query, params) if parameterized else query
 
-    # FIXME: support IN for multiple values -> WHERE
-    arg_string = re.sub(r"\"([^(\")]+)\":", "\\1:", json.dumps(kwargs))
 
-    id_where_predicate = f'WHERE ID({variable_name})={_id} ' if _id is not None else ''
-    outer_skip_limit = f'SKIP {offset}{" LIMIT " + str(first) if first > -1 else ""}'
+def connection_cypher_query(context, resolve_info, field, field_node, first, _id, parameterized, limits, kwargs):
+    # translate a root connection field: the node projection is cached, the keyset query is built per call
+    node_type = connection_node_type(field.inner_type)
+    after = kwargs.pop('after', None)
+    filter_value = kwargs.pop(FILTER, None)
+    if first == -1:
+        limit = default_limit(limits, resolve_info.parent_type.name, resolve_info.field_name, node_type.name)
+        first = -1 if limit is None else int(limit)
+    first = enforce_query_cost(context, resolve_info, field_node, first)
+    first = None if first == -1 else first
+    instrumentation = get_instrumentation(context)
+    with instrumentation.span(EXTRACT_SELECTIONS):
+        plan_key = ('connection', resolve_info.schema, resolve_info.parent_type.name, resolve_info.field_name,
+                    parameterized, limits_key(limits),
+                    selection_key(field_node.selection_set.selections, resolve_info.fragments,
+                                  resolve_info.variable_values))
+    with instrumentation.span(GENERATE_CYPHER) as span:
+        plan = query_plan_cache.get(plan_key)
+        span.set_attribute('cached', plan is not None)
+        if plan is None:
+            params = {} if parameterized else None
+            selections = node_selections(field_node.selection_set.selections, resolve_info)
+            selection = None if selections is None else build_cypher_selection(
+                '', selections, low_first_letter(node_type.name), node_type, resolve_info, params, limits)
+            plan = selection, params or {}
+            query_plan_cache.put(plan_key, plan)
+        selection, selection_params = plan
 
-    cyp_dir = cypher_directive(resolve_info.schema.query_type, resolve_info.field_name)
-    if cyp_dir:
-        custom_cypher = cyp_dir.get('statement')
-        query = (f'WITH apoc.cypher.runFirstColumn("{custom_cypher}", {arg_string}, true) AS x '
-                 f'UNWIND x AS {variable_name} RETURN {variable_name} '
-                 f'{{{build_cypher_selection("", selections, variable_name, schema_type, resolve_info)}}} '
-                 f'AS {variable_name} {outer_skip_limit}')
-    else:
-        # No @cypher directive on QueryType
-        query = f'MATCH ({variable_name}:{type_name} {arg_string}) {id_where_predicate}'
-        query += (f'RETURN {variable_name} '
-                  f'{{{build_cypher_selection("", selections, variable_name, schema_type, resolve_info)}}}'
-                  f' AS {variable_name} {outer_skip_limit}')
+        params = dict(selection_params) if parameterized else None
+        query = connection_query(type_identifiers(resolve_info.return_type).get('variable_name'), node_type,
+                                 connection_key(field), selection, first, after, _id, kwargs, params, filter_value)
+    return (query, params) if parameterized else query
 
-    return query
 
+def root_limit(limits, resolve_info):
+    # first of a root list field without a first argument, -1 when it is not limited
+    field = type_fields(resolve_info.parent_type).get(resolve_info.field_name)
+    if field is None or not field.is_list:
+        return -1
+    limit = default_limit(limits, resolve_info.parent_type.name, resolve_info.field_name, field.inner_type.name)
+    return -1 if limit is None else int(limit)
 
-def cypher_mutation(context, resolve_info, first=-1, offset=0, _id=None, **kwargs):
-    # FIXME: lots of duplication here with cypherQuery, extract into util module
+
+def root_arguments(variable_name, first, offset, _id, kwargs, params=None):
+    # bind the root field arguments, either inlined or as Cypher parameters when params is a dict
+    if params is not None:
+        arg_string = param_map(kwargs, params)
+        id_param = add_param(params, '_id', _id) if _id is not None else None
+        offset_param = add_param(params, 'offset', offset)
+        first_param = add_param(params, 'first', first) if first > -1 else None
+        return {'arg_string': arg_string,
+                'id_where_predicate': f'WHERE ID({variable_name})=${id_param} ' if _id is not None else '',
+                'order_by': '',
+                'outer_skip_limit': f'SKIP ${offset_param}{f" LIMIT ${first_param}" if first > -1 else ""}'}
+
+    # FIXME: support IN for multiple values -> WHERE
+    return {'arg_string': re.sub(r"\"([^(\")]+)\":", "\\1:", json.dumps(kwargs)),
+            'id_where_predicate': f'WHERE ID({variable_name})={_id} ' if _id is not None else '',
+            'order_by': '',
+            'outer_skip_limit': f'SKIP {offset}{" LIMIT " + str(first) if first > -1 else ""}'}
+
+
+def root_filter_arguments(variable_name, schema_type, _id, filter_value, order_by, params=None):
+    # bind the filter and orderBy arguments of a root list, compiled to a WHERE predicate and an ORDER BY
+    predicates = [filter_predicate(filter_value, schema_type, variable_name, params, 'filter_')]
+    if _id is not None:
+        predicates.insert(0, f'ID({variable_name})={"$_id" if params is not None else _id}')
+    predicates = [predicate for predicate in predicates if predicate]
+    return {'id_where_predicate': f'WHERE {" AND ".join(predicates)} ' if predicates else '',
+            'order_by': f'WITH {variable_name} ORDER BY {", ".join(order_by_expressions(order_by, variable_name))} '
+            if order_by else ''}
+
+
+def compile_query_template(resolve_info, field_node, parameterized=False, limits=None):
+    """
+     * Translate the selections of a root query field into a Cypher template.
+     * The root arguments are left as {arg_string}, {id_where_predicate}, {order_by} and {outer_skip_limit}
+     * placeholders so the template can be cached and bound with str.format on every call.
+     * Nested lists without a first argument are sliced to their default_limit.
+     * Returns the template and the parameters collected from nested selections.
+    """
     types_ident = type_identifiers(resolve_info.return_type)
     type_name = types_ident.get('type_name')
     variable_name = types_ident.get('variable_name')
     schema_type = resolve_info.schema.get_type(type_name)
+    params = {} if parameterized else None
+
+    selections = extract_selections(field_node.selection_set.selections, resolve_info.fragments)
 
+    # if len(selections) == 0:
+    #     # FIXME: why aren't the selections found in the filteredFieldNode?
+    #     selections = extract_selections(resolve_info.operation.selection_set.selections, resolve_info.fragments)
+
+    selection = escape_braces(build_cypher_selection("", selections, variable_name, schema_type, resolve_info, params,
+                                                     limits))
+
+    cyp_dir = cypher_directive(resolve_info.schema.query_type, resolve_info.field_name)
+    if cyp_dir:
+        custom_cypher = escape_braces(cyp_dir.get('statement'))
+        return (f'WITH apoc.cypher.runFirstColumn("{custom_cypher}", {{arg_string}}, true) AS x '
+                f'UNWIND x AS {variable_name} RETURN {variable_name} '
+                f'{{{{{selection}}}}} '
+                f'AS {variable_name} {{outer_skip_limit}}'), params or {}
+    # No @cypher directive on QueryType
+    return (f'MATCH ({variable_name}:{type_name} {{arg_string}}) {{id_where_predicate}}{{order_by}}'
+            f'RETURN {variable_name} '
+            f'{{{{{selection}}}}}'
+            f' AS {variable_name} {{outer_skip_limit}}'), params or {}
+
+
+def cypher_mutation(context, resolve_info, first=-1, offset=0, _id=None, parameterized=False, **kwargs):
     filtered_field_nodes = filter_(resolve_info.field_nodes, lambda n: n.name.value == resolve_info.field_name)
 
     # FIXME: how to handle multiple field_node matches
-    selections = extract_selections(filtered_field_nodes[0].selection_set.selections, resolve_info.fragments)
+    enforce_query_cost(context, resolve_info, filtered_field_nodes[0])
+    instrumentation = get_instrumentation(context)
+    with instrumentation.span(EXTRACT_SELECTIONS):
+        selections = extract_selections(filtered_field_nodes[0].selection_set.selections, resolve_info.fragments)
+    with instrumentation.span(GENERATE_CYPHER):
+        query, params = mutation_statement(resolve_info, selections, first, offset, _id, parameterized, kwargs,
+                                           context_value(context, 'default_limit'))
+    return (query, params) if parameterized else query
 
-    # FIXME: support IN for multiple values -> WHERE
-    arg_string = re.sub(r"\"([^(\")]+)\":", "\\1:", json.dumps(kwargs))
 
-    id_where_predicate = f'WHERE ID({variable_name})={_id} ' if _id is not None else ''
-    outer_skip_limit = f'SKIP {offset}{" LIMIT " + str(first) if first > -1 else ""}'
+def mutation_statement(resolve_info, selections, first, offset, _id, parameterized, kwargs, limits=None):
+    # FIXME: lots of duplication here with cypherQuery, extract into util module
+    types_ident = type_identifiers(resolve_info.return_type)
+    type_name = types_ident.get('type_name')
+    variable_name = types_ident.get('variable_name')
+    schema_type = resolve_info.schema.get_type(type_name)
+    params = {} if parameterized else None
 
     cyp_dir = cypher_directive(resolve_info.schema.mutation_type, resolve_info.field_name)
     if cyp_dir:
         custom_cypher = cyp_dir.get('statement')
-        query = (f'CALL apoc.cypher.doIt("{custom_cypher}", {arg_string}) YIELD value '
+        root_args = root_arguments(variable_name, first, offset, _id, kwargs, params)
+        query = (f'CALL apoc.cypher.doIt("{custom_cypher}", {root_args.get("arg_string")}) YIELD value '
                  f'WITH apoc.map.values(value, [keys(value)[0]])[0] AS {variable_name} '
-                 f'RETURN {variable_name} {{{build_cypher_selection("", selections, variable_name, schema_type, resolve_info)}}} '
-                 f'AS {variable_name} {outer_skip_limit}')
+                 f'RETURN {variable_name} '
+                 f'{{{build_cypher_selection("", selections, variable_name, schema_type, resolve_info, params, limits)}}} '
+                 f'AS {variable_name} {root_args.get("outer_skip_limit")}')
     # No @cypher directive on MutationType
+    elif is_bulk_mutation(resolve_info):
+        query = bulk_mutation_statement(resolve_info, selections, variable_name, type_name, schema_type, params, limits)
+        if parameterized:
+            params[BULK_ROWS] = kwargs[BULK_INPUT]
+    elif keyed_mutation_directive(resolve_info.schema.mutation_type, resolve_info.field_name):
+        query = keyed_mutation_statement(resolve_info, selections, variable_name, type_name, schema_type, params, limits)
+        if parameterized:
+            # _id, first and offset are taken by cypher_mutation's own keywords, but are properties here
+            consumed = {'_id': _id, 'first': first, 'offset': offset}
+            supplied = {argument.name.value for field_node in resolve_info.field_nodes
+                        if field_node.name.value == resolve_info.field_name for argument in field_node.arguments}
+            params['params'] = {**{name: value for name, value in consumed.items() if name in supplied}, **kwargs}
     elif resolve_info.field_name.startswith('create') or resolve_info.field_name.startswith('Create'):
         # Create node
         # TODO: handle for create relationship
-        # TODO: update / delete
         # TODO: augment schema
         query = (f'CREATE ({variable_name}:{type_name}) SET {variable_name} = $params RETURN {variable_name} '
-                 f'{{{build_cypher_selection("", selections, variable_name, schema_type, resolve_info)}}} '
+                 f'{{{build_cypher_selection("", selections, variable_name, schema_type, resolve_info, params, limits)}}} '
                  f'AS {variable_name}')
+        if parameterized:
+            params['params'] = kwargs
     elif resolve_info.field_name.startswith('add') or resolve_info.field_name.startswith('Add'):
         mutation_meta = mutation_meta_directive(resolve_info.schema.mutation_type, resolve_info.field_name)
         relation_name = mutation_meta.get('relationship')
@@ -124,14 +485,70 @@ def cypher_mutation(context, resolve_info, first=-1, offset=0, _id=None, **kwarg
                  f'${resolve_info.schema.mutation_type.fields[resolve_info.field_name].ast_node.arguments[1].name.value}}}) '
                  f'CREATE ({from_var})-[:{relation_name}]->({to_var}) '
                  f'RETURN {from_var} '
-                 f'{{{build_cypher_selection("", selections, variable_name, schema_type, resolve_info)}}} '
+                 f'{{{build_cypher_selection("", selections, variable_name, schema_type, resolve_info, params, limits)}}} '
                  f'AS {from_var}')
+        if parameterized:
+            params.update(kwargs)
     else:
         raise Exception('Mutation does not follow naming conventions')
-    return query
+    return query, params
+
+
+def keyed_mutation_statement(resolve_info, selections, variable_name, type_name, schema_type, params, limits):
+    """
+     * Single statement of a generated Merge, Update or Delete mutation (see its KeyedMutation directive)
+     * on the node with the primary key of its key argument:
+     *   MERGE (state:State {name: $params.name}) SET state += $params RETURN state {...} AS state
+     * Update matches the node rather than merging it, and Delete projects the node before it is detach deleted.
+     * Nothing is returned when no node has the key.
+    """
+    keyed_mutation = keyed_mutation_directive(resolve_info.schema.mutation_type, resolve_info.field_name)
+    operation, key = keyed_mutation.get('operation'), keyed_mutation.get('key')
+    selection = build_cypher_selection("", selections, variable_name, schema_type, resolve_info, params, limits)
+    if operation == 'Merge':
+        return (f'MERGE ({variable_name}:{type_name} {{{key}: $params.{key}}}) SET {variable_name} += $params '
+                f'RETURN {variable_name} {{{selection}}} AS {variable_name}')
+
+    if key == '_id':
+        # the internal id is not a property
+        match = f'MATCH ({variable_name}:{type_name}) WHERE ID({variable_name}) = toInteger($params._id)'
+        properties = "apoc.map.removeKey($params, '_id')"
+    else:
+        match = f'MATCH ({variable_name}:{type_name} {{{key}: $params.{key}}})'
+        properties = '$params'
+    if operation == 'Update':
+        return f'{match} SET {variable_name} += {properties} RETURN {variable_name} {{{selection}}} AS {variable_name}'
+    return (f'{match} WITH {variable_name}, {variable_name} {{{selection}}} AS {variable_name}_projection '
+            f'DETACH DELETE {variable_name} RETURN {variable_name}_projection AS {variable_name}')
+
+
+def bulk_mutation_statement(resolve_info, selections, variable_name, type_name, schema_type, params, limits):
+    """
+     * One statement for all the rows of a CreateMany or AddMany mutation, unwound from $rows:
+     *   UNWIND $rows AS row CREATE (movie:Movie) SET movie = row RETURN movie {...} AS movie
+     * AddMany merges the relationships, so a chunk can be sent again after a failure without duplicating them.
+    """
+    selection = build_cypher_selection("", selections, variable_name, schema_type, resolve_info, params, limits)
+    if resolve_info.field_name.startswith(BULK_CREATE):
+        return (f'UNWIND ${BULK_ROWS} AS row CREATE ({variable_name}:{type_name}) SET {variable_name} = row '
+                f'RETURN {variable_name} {{{selection}}} AS {variable_name}')
+
+    mutation_meta = mutation_meta_directive(resolve_info.schema.mutation_type, resolve_info.field_name)
+    from_type = mutation_meta.get('from')
+    from_var = low_first_letter(from_type)
+    to_type = mutation_meta.get('to')
+    to_var = low_first_letter(to_type)
+    # the input fields are the arguments of the Add mutation, the key property prefixed with the variable name
+    from_arg, to_arg = inner_type(resolve_info.schema.mutation_type.fields[resolve_info.field_name].args[BULK_INPUT]
+                                  .type).fields
+    return (f'UNWIND ${BULK_ROWS} AS row '
+            f'MATCH ({from_var}:{from_type} {{{from_arg[len(from_var):]}: row.{from_arg}}}) '
+            f'MATCH ({to_var}:{to_type} {{{to_arg[len(to_var):]}: row.{to_arg}}}) '
+            f'MERGE ({from_var})-[:{mutation_meta.get("relationship")}]->({to_var}) '
+            f'RETURN {from_var} {{{selection}}} AS {from_var}')
 
 
-def augment_schema(schema):
+def augment_schema(schema, use_async=False, parameterized=False):
     from .augment_schema import add_mutations_to_schema
-    mutation_schema = add_mutations_to_schema(schema)
+    mutation_schema = add_mutations_to_schema(schema, use_async, parameterized)
     return mutation_schema
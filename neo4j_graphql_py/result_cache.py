@@ -0,0 +1,195 @@
+import os
+import re
+import json
+import time
+import uuid
+import pickle
+import hashlib
+from functools import lru_cache
+from threading import Lock
+
+from .cache import LRUCache
+
+# labels of node patterns, e.g. (movie:Movie) and (:Genre), and types of relationship patterns, e.g. [:IN_GENRE]
+LABEL_PATTERN = re.compile(r'\(\w*((?::\w+)+)')
+RELATIONSHIP_PATTERN = re.compile(r'\[\w*:(\w+(?:\|:?\w+)*)')
+# returned by ResultCache.get for a query without a valid entry, as None is a valid result
+MISSING = object()
+
+
+@lru_cache(maxsize=1024)
+def cypher_tags(query):
+    """
+     * Labels and relationship types a Cypher statement touches, found in its node and relationship patterns,
+     * including those of the @cypher statements it embeds.
+    """
+    tags = set()
+    for labels in LABEL_PATTERN.findall(query):
+        tags.update(labels.split(':')[1:])
+    for types in RELATIONSHIP_PATTERN.findall(query):
+        tags.update(relationship_type.lstrip(':') for relationship_type in types.split('|'))
+    return frozenset(tags)
+
+
+class MemoryBackend:
+    """
+     * In-process backend: a bounded LRU of entries, each dropped when its TTL has passed.
+    """
+
+    def __init__(self, max_size=1024):
+        self.entries = LRUCache(max_size)
+        # tag versions are not bounded, an evicted version would make invalidated entries valid again
+        self.tag_versions = {}
+        self._lock = Lock()
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, key, value, ttl):
+        self.entries.put(key, (time.monotonic() + ttl, value))
+
+    def versions(self, tags):
+        return {tag: self.tag_versions.get(tag, 0) for tag in tags}
+
+    def bump(self, tags):
+        with self._lock:
+            for tag in tags:
+                self.tag_versions[tag] = self.tag_versions.get(tag, 0) + 1
+
+    def clear(self):
+        self.entries.clear()
+
+
+class FileBackend:
+    """
+     * Backend keeping every entry in a file of directory, shared by the processes of a host.
+     * A directory on a memory filesystem such as /dev/shm keeps the entries in shared memory.
+     * Entries are pickled, so the directory must only be writable by the application.
+     * Beyond max_size entries the least recently read are removed.
+    """
+
+    def __init__(self, directory, max_size=1024):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(os.path.join(directory, 'versions'), exist_ok=True)
+
+    def get(self, key):
+        path = os.path.join(self.directory, f'{key}.entry')
+        try:
+            with open(path, 'rb') as f:
+                expires_at, value = pickle.load(f)
+            if expires_at <= time.time():
+                os.remove(path)
+                return None
+            # the modification time orders the entries for eviction
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        return value
+
+    def set(self, key, value, ttl):
+        write_file(os.path.join(self.directory, f'{key}.entry'), pickle.dumps((time.time() + ttl, value)))
+        entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith('.entry')]
+        if len(entries) > self.max_size:
+            entries.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in entries[:len(entries) - self.max_size]:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def versions(self, tags):
+        versions = {}
+        for tag in tags:
+            try:
+                with open(os.path.join(self.directory, 'versions', tag), 'rb') as f:
+                    versions[tag] = f.read()
+            except OSError:
+                versions[tag] = None
+        return versions
+
+    def bump(self, tags):
+        # a random version rather than a counter, which processes would have to lock to increment
+        for tag in tags:
+            write_file(os.path.join(self.directory, 'versions', tag), uuid.uuid4().bytes)
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.entry'):
+                os.remove(entry.path)
+
+
+def write_file(path, data):
+    # write to a temporary file first, so another process never reads a partially written file
+    temporary_path = f'{path}.{os.getpid()}.tmp'
+    with open(temporary_path, 'wb') as f:
+        f.write(data)
+    os.replace(temporary_path, path)
+
+
+class ResultCache:
+    """
+     * Cache of query results, set as context['result_cache'] and shared across requests.
+     * Results are keyed by the Cypher statement and its parameters, and expire after ttl seconds.
+     * Every entry records the versions of the labels and relationship types of its statement (see cypher_tags),
+     * and a mutation bumps the versions of those its statement touches, which invalidates the entries
+     * of every statement that reads them.
+     * backend is a MemoryBackend of max_size entries by default, or e.g. a FileBackend.
+    """
+
+    def __init__(self, backend=None, ttl=60, max_size=1024):
+        self.backend = MemoryBackend(max_size) if backend is None else backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(query, params):
+        return hashlib.sha256(f'{query}\0{json.dumps(params, sort_keys=True, default=str)}'.encode()).hexdigest()
+
+    def get(self, query, params):
+        """
+         * Cached result of query with params and the tag versions to put its result with,
+         * read before the query runs so a mutation committed meanwhile invalidates the result.
+         * The result is MISSING when there is no valid entry.
+        """
+        versions = self.backend.versions(cypher_tags(query))
+        entry = self.backend.get(self.key(query, params))
+        if entry is not None and entry[0] == versions:
+            self.hits += 1
+            return entry[1], versions
+        self.misses += 1
+        return MISSING, versions
+
+    def put(self, query, params, result, versions):
+        self.backend.set(self.key(query, params), (versions, result), self.ttl)
+
+    def fetch(self, query, params, run):
+        # result of query with params, run by run() unless it is cached
+        result, versions = self.get(query, params)
+        if result is MISSING:
+            result = run()
+            self.put(query, params, result, versions)
+        return result
+
+    async def fetch_async(self, query, params, run):
+        result, versions = self.get(query, params)
+        if result is MISSING:
+            result = await run()
+            self.put(query, params, result, versions)
+        return result
+
+    def invalidate(self, query):
+        # invalidate the results of every statement reading the labels or relationship types query touches
+        self.backend.bump(cypher_tags(query))
+
+    def clear(self):
+        self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
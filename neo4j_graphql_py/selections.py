@@ -1,79 +1,108 @@
-from .utils import (cypher_directive_args, is_graphql_scalar_type, is_array_type, inner_type, cypher_directive,
-                    relation_directive, inner_filter_params, compute_skip_limit)
+from .utils import (cypher_directive_args, type_fields, inner_filter_params, compute_skip_limit, default_limit,
+                    EMPTY_MAPPING)
+from .connections import nested_connection, node_selections, connection_node_type
+from .filters import filter_predicate, sorted_nodes, selection_filter_arguments
 
 
-def build_cypher_selection(initial, selections, variable_name, schema_type, resolve_info):
-    if len(selections) == 0:
-        return initial
-    head_selection, *tail_selections = selections
+def build_cypher_selection(initial, selections, variable_name, schema_type, resolve_info, params=None, limits=None):
+    parts = [initial]
+    append_cypher_selection(parts, 0, selections, variable_name, schema_type, resolve_info, params, limits)
+    return ''.join(parts)
 
-    tail_params = {
-        'selections': tail_selections,
-        'variable_name': variable_name,
-        'schema_type': schema_type,
-        'resolve_info': resolve_info
-    }
 
-    field_name = head_selection.name.value
-    comma_if_tail = ',' if len(tail_selections) > 0 else ''
-    # Schema meta fields(__schema, __typename, etc)
-    if not schema_type.fields.get(field_name):
-        return build_cypher_selection(initial[1:initial.rfind(',')] if len(tail_selections) == 0 else initial,
-                                      **tail_params)
+def append_cypher_selection(parts, start, selections, variable_name, schema_type, resolve_info, params=None,
+                            limits=None):
+    """
+     * Append the map projection of selections to parts, which is joined once by build_cypher_selection.
+     * parts[start:] holds the projection of the current selection set; nested selection sets
+     * are appended in place between the prefix and suffix of their field.
+     * limits is the default_limit option, applied to every list without a first argument.
+    """
+    fields = type_fields(schema_type)
+    last = len(selections) - 1
+    for index, head_selection in enumerate(selections):
+        field_name = head_selection.name.value
+        comma_if_tail = ',' if index < last else ''
+        field = fields.get(field_name)
+        # Schema meta fields(__schema, __typename, etc)
+        if field is None:
+            if index == last:
+                initial = ''.join(parts[start:])
+                parts[start:] = [initial[1:initial.rfind(',')]]
+            continue
 
-    field_type = schema_type.fields[field_name].type
+        field_type = field.field_type
 
-    inner_schema_type = inner_type(field_type)  # for target "field_type" aka label
+        inner_schema_type = field.inner_type  # for target "field_type" aka label
 
-    custom_cypher = cypher_directive(schema_type, field_name).get('statement')
+        custom_cypher = field.directives.get('cypher', EMPTY_MAPPING).get('statement')
 
-    # Database meta fields(_id)
-    if field_name == '_id':
-        return build_cypher_selection(f'{initial}{field_name}: ID({variable_name}){comma_if_tail}', **tail_params)
-    # Main control flow
-    if is_graphql_scalar_type(inner_schema_type):
-        if custom_cypher:
-            return build_cypher_selection((f'{initial}{field_name}: apoc.cypher.runFirstColumn("{custom_cypher}", '
-                                           f'{cypher_directive_args(variable_name, head_selection, schema_type, resolve_info)}, false)'
-                                           f'{comma_if_tail}'), **tail_params)
+        # Database meta fields(_id)
+        if field_name == '_id':
+            parts.append(f'{field_name}: ID({variable_name}){comma_if_tail}')
+            continue
+        # Main control flow
+        if field.is_scalar:
+            if custom_cypher:
+                parts.append(f'{field_name}: apoc.cypher.runFirstColumn("{custom_cypher}", '
+                             f'{cypher_directive_args(variable_name, head_selection, schema_type, resolve_info, params)}'
+                             f', false){comma_if_tail}')
+                continue
 
-        # graphql scalar type, no custom cypher statement
-        return build_cypher_selection(f'{initial} .{field_name} {comma_if_tail}', **tail_params)
+            # graphql scalar type, no custom cypher statement
+            parts.append(f' .{field_name} {comma_if_tail}')
+            continue
 
-    # We have a graphql object type
-    nested_variable = variable_name + '_' + field_name
-    skip_limit = compute_skip_limit(head_selection, resolve_info.variable_values)
-    nested_params = {
-        'initial': '',
-        'selections': head_selection.selection_set.selections,
-        'variable_name': nested_variable,
-        'schema_type': inner_schema_type,
-        'resolve_info': resolve_info
-    }
-    if custom_cypher:
-        # similar: [ x IN apoc.cypher.runFirstColumn("WITH {this} AS this MATCH (this)--(:Genre)--(o:Movie)
-        # RETURN o", {this: movie}, true) |x {.title}][1..2])
+        # We have a graphql object type
+        nested_variable = variable_name + '_' + field_name
+        if 'connection' in field.directives:
+            selections_of_nodes = node_selections(head_selection.selection_set.selections, resolve_info)
+            node_selection = None if selections_of_nodes is None else build_cypher_selection(
+                '', selections_of_nodes, nested_variable, connection_node_type(inner_schema_type), resolve_info, params,
+                limits)
+            parts.append(nested_connection(head_selection, variable_name, schema_type, field, resolve_info,
+                                           node_selection, params, limits))
+            parts.append(f' {comma_if_tail}')
+            continue
+        limit = default_limit(limits, schema_type.name, field_name, inner_schema_type.name,
+                              field.default_args.get('first')) if field.is_list else None
+        # a prefix of its own, the arguments of a @cypher field are passed as {nested_variable}_<argument>
+        skip_limit = compute_skip_limit(head_selection, resolve_info.variable_values, params,
+                                        f'{nested_variable}_slice_', limit)
+        if custom_cypher:
+            # similar: [ x IN apoc.cypher.runFirstColumn("WITH {this} AS this MATCH (this)--(:Genre)--(o:Movie)
+            # RETURN o", {this: movie}, true) |x {.title}][1..2])
 
-        field_is_list = not not getattr(field_type, 'of_type', None)
+            field_is_list = not not getattr(field_type, 'of_type', None)
 
-        return build_cypher_selection(
-            (f'{initial}{field_name}: {"" if field_is_list else "head("}'
-             f'[ {nested_variable} IN apoc.cypher.runFirstColumn("{custom_cypher}", '
-             f'{cypher_directive_args(variable_name, head_selection, schema_type, resolve_info)}, true) | {nested_variable} '
-             f'{{{build_cypher_selection(**nested_params)}}}]'
-             f'{"" if field_is_list else ")"}{skip_limit} {comma_if_tail}'), **tail_params)
+            parts.append(f'{field_name}: {"" if field_is_list else "head("}'
+                         f'[ {nested_variable} IN apoc.cypher.runFirstColumn("{custom_cypher}", '
+                         f'{cypher_directive_args(variable_name, head_selection, schema_type, resolve_info, params)}, '
+                         f'true) | {nested_variable} {{')
+            append_cypher_selection(parts, len(parts), head_selection.selection_set.selections, nested_variable,
+                                    inner_schema_type, resolve_info, params, limits)
+            parts.append(f'}}]{"" if field_is_list else ")"}{skip_limit} {comma_if_tail}')
+            continue
 
-    # graphql object type, no custom cypher
+        # graphql object type, no custom cypher
 
-    rel = relation_directive(schema_type, field_name)
-    rel_type = rel.get('name')
-    rel_direction = rel.get('direction')
-    subquery_args = inner_filter_params(head_selection)
+        rel = field.directives.get('relation', EMPTY_MAPPING)
+        rel_type = rel.get('name')
+        rel_direction = rel.get('direction')
+        subquery_args = inner_filter_params(head_selection, params, f'{nested_variable}_')
+        filter_value, order_by = selection_filter_arguments(head_selection, schema_type, resolve_info.variable_values)
+        predicate = filter_predicate(filter_value, inner_schema_type, nested_variable, params,
+                                     f'{nested_variable}_filter_')
+        pattern = (f"({variable_name}){'<' if rel_direction in ['in', 'IN'] else ''}"
+                   f"-[:{rel_type}]-{'>' if rel_direction in ['out', 'OUT'] else ''}"
+                   f"({nested_variable}:{inner_schema_type.name} {subquery_args}){' WHERE ' + predicate if predicate else ''}")
 
-    return build_cypher_selection(
-        (f"{initial}{field_name}: {'head(' if not is_array_type(field_type) else ''}"
-         f"[({variable_name}){'<' if rel_direction in ['in', 'IN'] else ''}"
-         f"-[:{rel_type}]-{'>' if rel_direction in ['out', 'OUT'] else ''}"
-         f"({nested_variable}:{inner_schema_type.name} {subquery_args}) | {nested_variable} "
-         f"{{{build_cypher_selection(**nested_params)}}}]"
-         f"{')' if not is_array_type(field_type) else ''}{skip_limit} {comma_if_tail}"), **tail_params)
+        if order_by:
+            # a pattern comprehension can't be ordered, the matched nodes are sorted before they are projected
+            parts.append(f"{field_name}: [{nested_variable} IN "
+                         f"{sorted_nodes(f'[{pattern} | {nested_variable}]', order_by)} | {nested_variable} {{")
+        else:
+            parts.append(f"{field_name}: {'head(' if not field.is_list else ''}[{pattern} | {nested_variable} {{")
+        append_cypher_selection(parts, len(parts), head_selection.selection_set.selections, nested_variable,
+                                inner_schema_type, resolve_info, params, limits)
+        parts.append(f"}}]{')' if not field.is_list else ''}{skip_limit} {comma_if_tail}")
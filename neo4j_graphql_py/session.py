@@ -0,0 +1,145 @@
+import asyncio
+
+
+class OperationSession:
+    """
+     * One Neo4j session and explicit transaction shared by every resolver of a GraphQL operation.
+     * Put it in the context as context['neo4j_session'] and close it once execution has finished:
+     *
+     *   with OperationSession(driver) as neo4j_session:
+     *       graphql_sync(schema, query, context_value={'driver': driver, 'neo4j_session': neo4j_session})
+     *
+     * The session and transaction are opened by the first query, committed when the block exits
+     * cleanly and rolled back when it raises or a neo4j_graphql resolver of the operation failed,
+     * which graphql reports as an error of the result instead of raising it.
+     * Other resolvers call fail(), or the application calls rollback(), to discard the writes of the operation.
+    """
+
+    def __init__(self, driver, **session_config):
+        self.driver = driver
+        self.session_config = session_config
+        self.session = None
+        self.transaction = None
+        self.failed = False
+        self.commit_callbacks = []
+
+    def after_commit(self, callback):
+        # called once the transaction has committed, and never if it rolls back
+        self.commit_callbacks.append(callback)
+
+    def fail(self):
+        # the block rolls back instead of committing
+        self.failed = True
+
+    def run(self, query, params=None):
+        if self.transaction is None:
+            self.session = self.driver.session(**self.session_config)
+            self.transaction = self.session.begin_transaction()
+        try:
+            return self.transaction.run(query, params)
+        except Exception:
+            self.fail()
+            raise
+
+    def commit(self):
+        if self.transaction is not None:
+            self.transaction.commit()
+            self.transaction = None
+            run_callbacks(self)
+
+    def rollback(self):
+        self.commit_callbacks = []
+        if self.transaction is not None:
+            self.transaction.rollback()
+            self.transaction = None
+
+    def close(self):
+        try:
+            self.rollback()
+        finally:
+            if self.session is not None:
+                self.session.close()
+                self.session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None and not self.failed:
+                self.commit()
+        finally:
+            self.close()
+
+
+class AsyncOperationSession:
+    """
+     * OperationSession for an AsyncDriver. A transaction runs one query at a time,
+     * so concurrent resolvers take turns and each gets its records fully fetched.
+    """
+
+    def __init__(self, driver, **session_config):
+        self.driver = driver
+        self.session_config = session_config
+        self.session = None
+        self.transaction = None
+        self.failed = False
+        self.commit_callbacks = []
+        # created by the first query, on the event loop running the operation
+        self._lock = None
+
+    async def run(self, query, params=None):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.transaction is None:
+                self.session = self.driver.session(**self.session_config)
+                self.transaction = await self.session.begin_transaction()
+            try:
+                result = await self.transaction.run(query, params)
+                return [record async for record in result]
+            except Exception:
+                self.fail()
+                raise
+
+    def after_commit(self, callback):
+        self.commit_callbacks.append(callback)
+
+    def fail(self):
+        self.failed = True
+
+    async def commit(self):
+        if self.transaction is not None:
+            await self.transaction.commit()
+            self.transaction = None
+            run_callbacks(self)
+
+    async def rollback(self):
+        self.commit_callbacks = []
+        if self.transaction is not None:
+            await self.transaction.rollback()
+            self.transaction = None
+
+    async def close(self):
+        try:
+            await self.rollback()
+        finally:
+            if self.session is not None:
+                await self.session.close()
+                self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None and not self.failed:
+                await self.commit()
+        finally:
+            await self.close()
+
+
+def run_callbacks(session):
+    callbacks, session.commit_callbacks = session.commit_callbacks, []
+    for callback in callbacks:
+        callback()
@@ -0,0 +1,74 @@
+import json
+
+from graphql import GraphQLError, parse, validate, get_operation_root_type
+from graphql.execution.execute import ExecutionContext, get_field_def
+from graphql.execution.values import get_argument_values
+from graphql.pyutils import Path
+
+from .main import translate_resolver, run_query, driver_session, access_mode_of, READ_ACCESS
+from .utils import type_identifiers, is_array_type
+
+DEFAULT_FETCH_SIZE = 1000
+
+
+def neo4j_graphql_stream(obj, context, resolve_info, debug=False, parameterized=False, fetch_size=DEFAULT_FETCH_SIZE,
+                         **kwargs):
+    """
+     * Like neo4j_graphql, but list fields return a generator that yields records from the result cursor
+     * as graphql-core completes them, instead of materializing them with records.data() first.
+     * Records are pulled from the server fetch_size at a time.
+    """
+    query, params = translate_resolver(context, resolve_info, debug, parameterized, **kwargs)
+    if not is_array_type(resolve_info.return_type):
+        return run_query(context, query, params, resolve_info.return_type, access_mode_of(resolve_info))
+    return stream_query_result(context, query, params, resolve_info.return_type, fetch_size,
+                               access_mode_of(resolve_info))
+
+
+def stream_query_result(context, query, params, return_type, fetch_size=DEFAULT_FETCH_SIZE, access_mode=READ_ACCESS):
+    variable_name = type_identifiers(return_type).get('variable_name')
+    neo4j_session = context.get('neo4j_session')
+    if neo4j_session is not None:
+        # a shared OperationSession streams with the fetch_size it was opened with
+        for record in neo4j_session.run(query, params):
+            yield record.get(variable_name)
+        return
+
+    # records are yielded as they are pulled, so the statement runs in an auto-commit transaction,
+    # which the driver can't retry like a transaction function
+    with driver_session(context, access_mode, fetch_size=fetch_size) as session:
+        for record in session.run(query, params):
+            yield record.get(variable_name)
+
+
+def export_ndjson(schema, source, context, variable_values=None, operation_name=None, fetch_size=DEFAULT_FETCH_SIZE):
+    """
+     * Translate the single root field of a query and yield one JSON document per result row, newline-delimited.
+     * Rows are written as they arrive from the cursor, so memory stays flat however large the export is.
+     * Rows are the Cypher map projections: keys are field names (aliases are not applied).
+     *
+     *   StreamingHttpResponse(export_ndjson(schema, query, {'driver': driver}), content_type='application/x-ndjson')
+    """
+    document = parse(source)
+    errors = validate(schema, document)
+    if errors:
+        raise errors[0]
+
+    execution_context = ExecutionContext.build(schema, document, None, context, variable_values, operation_name)
+    if isinstance(execution_context, list):
+        raise execution_context[0]
+
+    operation = execution_context.operation
+    root_type = get_operation_root_type(schema, operation)
+    fields = execution_context.collect_fields(root_type, operation.selection_set, {}, set())
+    if len(fields) != 1:
+        raise GraphQLError('An export must select exactly one root field.', operation)
+    (response_name, field_nodes), = fields.items()
+
+    field_def = get_field_def(schema, root_type, field_nodes[0].name.value)
+    resolve_info = execution_context.build_resolve_info(field_def, field_nodes, root_type, Path(None, response_name))
+    kwargs = get_argument_values(field_def, field_nodes[0], execution_context.variable_values)
+    query, params = translate_resolver(context, resolve_info, parameterized=True, **kwargs)
+
+    for row in stream_query_result(context, query, params, field_def.type, fetch_size):
+        yield json.dumps(row, default=str) + '\n'
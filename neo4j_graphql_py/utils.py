@@ -1,9 +1,12 @@
 import re
 import json
 import logging
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping, NamedTuple
+from weakref import WeakKeyDictionary
 from pydash import find, reduce_
-from graphql import GraphQLResolveInfo, GraphQLScalarType, parse, build_ast_schema
+from graphql import (GraphQLResolveInfo, GraphQLScalarType, GraphQLObjectType, GraphQLInterfaceType, parse,
+                     build_ast_schema, value_from_ast_untyped)
 
 logger = logging.getLogger('neo4j_graphql_py')
 
@@ -11,7 +14,13 @@ logger = logging.getLogger('neo4j_graphql_py')
 def make_executable_schema(schema_definition, resolvers):
     ast = parse(schema_definition)
     schema = build_ast_schema(ast, assume_valid=True)
+    attach_resolvers(schema, resolvers)
+    attach_key_resolvers(schema)
+    index_schema(schema)
+    return schema
+
 
+def attach_resolvers(schema, resolvers):
     for type_name in resolvers:
         field_type = schema.get_type(type_name)
 
@@ -30,8 +39,6 @@ def make_executable_schema(schema_definition, resolvers):
             if field_type.fields[remaining].resolve is None:
                 field_type.fields[remaining].resolve = default_resolver
 
-    return schema
-
 
 def default_resolver(source: Any, info: GraphQLResolveInfo, **args: Any) -> Any:
     field_name = info.field_name
@@ -45,6 +52,60 @@ def default_resolver(source: Any, info: GraphQLResolveInfo, **args: Any) -> Any:
     return value
 
 
+def key_resolver(field_name):
+    """
+     * Resolver of a field without one, precomputed for its name: the maps Cypher projects are read with a key
+     * lookup, without the field name lookup and callable check of default_resolver, which other sources fall back to.
+    """
+    def resolve(source, info, **args):
+        # also the PreShapedDict roots of neo4j_graphql
+        if isinstance(source, dict):
+            return source.get(field_name)
+        return default_resolver(source, info, **args)
+
+    resolve.projected = True
+    return resolve
+
+
+def is_projected_field(field):
+    # a field read from its key in the map projection of its parent, rather than computed by a resolver of its own
+    return field.resolve is None or field.resolve is default_resolver or getattr(field.resolve, 'projected', False)
+
+
+class PreShaped:
+    # marks a result already shaped by its Cypher map projection, see pre_shaped
+    __slots__ = ()
+
+
+class PreShapedList(PreShaped, list):
+    __slots__ = ()
+
+
+class PreShapedDict(PreShaped, dict):
+    __slots__ = ()
+
+
+def pre_shaped(result):
+    # result of a translated field, marked for PreShapedExecutionContext; the default executor ignores the mark
+    if type(result) is list:
+        return PreShapedList(result)
+    if type(result) is dict:
+        return PreShapedDict(result)
+    return result
+
+
+def attach_key_resolvers(schema):
+    # key_resolver for the fields of the object types without a resolver, except those of the root types
+    root_types = (schema.query_type, schema.mutation_type, schema.subscription_type)
+    for schema_type in schema.type_map.values():
+        if not isinstance(schema_type, GraphQLObjectType) or schema_type in root_types \
+                or schema_type.name.startswith('__'):
+            continue
+        for field_name, field in schema_type.fields.items():
+            if field.resolve is None or field.resolve is default_resolver:
+                field.resolve = key_resolver(field_name)
+
+
 def parse_args(args, variable_values):
     if args is None or len(args) == 0:
         return {}
@@ -59,23 +120,65 @@ def parse_args(args, variable_values):
 
 def get_default_arguments(field_name, schema_type):
     # get default arguments for this field from schema
-    args = schema_type.fields[field_name].args
-    return {arg_name: arg.default_value for arg_name, arg in args.items()}
+    return dict(type_fields(schema_type)[field_name].default_args)
+
+
+def add_param(params, name, value):
+    """
+     * Register value as a Cypher parameter and return the name it is registered as: name, or name_<n> when it is taken.
+     * Names are built from variable names, field names and prefixes joined by underscores, which GraphQL names
+     * contain as well, so the parameters of two fields can get the same name, e.g. the slice of a list field x
+     * (movie_x_slice_first) and the first argument of a @cypher field x_slice (movie_x_slice_first).
+     * Names are given in the order the query is translated, so a query plan always gets the same ones.
+    """
+    unique_name, index = name, 1
+    while unique_name in params:
+        index += 1
+        unique_name = f'{name}_{index}'
+    params[unique_name] = value
+    return unique_name
 
 
-def cypher_directive_args(variable, head_selection, schema_type, resolve_info):
+def param_map(values, params, prefix=''):
+    # register the values as Cypher parameters and reference them from a map literal
+    return f'{{{", ".join(f"{key}: ${add_param(params, prefix + key, value)}" for key, value in values.items())}}}'
+
+
+def cypher_directive_args(variable, head_selection, schema_type, resolve_info, params=None):
     default_args = get_default_arguments(head_selection.name.value, schema_type)
     schema_args = {}
     query_args = parse_args(head_selection.arguments, resolve_info.variable_values)
     default_args.update(query_args)
-    args = re.sub(r"\"([^(\")]+)\":", "\\1:", json.dumps(default_args))
+    if params is not None:
+        args = param_map(default_args, params, f'{variable}_{head_selection.name.value}_')
+    else:
+        args = re.sub(r"\"([^(\")]+)\":", "\\1:", json.dumps(default_args))
     return f'{{this: {variable}{args[1:]}' if args == "{}" else f'{{this: {variable}, {args[1:]}'
 
 
+def context_value(context, key, default=None):
+    # per-request option from the context, which may not be a dict (e.g. a test double)
+    return context.get(key, default) if isinstance(context, Mapping) else default
+
+
 def is_mutation(resolve_info):
     return resolve_info.operation.operation == 'mutation' or resolve_info.operation.operation.value == 'mutation'
 
 
+# prefixes and argument of the generated bulk mutations, e.g. CreateManyMovie(input: [_MovieInput!]!): [Movie]
+BULK_CREATE = 'CreateMany'
+BULK_ADD = 'AddMany'
+BULK_INPUT = 'input'
+# Cypher parameter the rows of a bulk mutation are unwound from
+BULK_ROWS = 'rows'
+
+
+def is_bulk_mutation(resolve_info):
+    # a CreateMany<Type> or AddMany<From><To> mutation, rather than Create or Add of a type named Many...
+    return (is_mutation(resolve_info) and resolve_info.field_name.startswith((BULK_CREATE, BULK_ADD))
+            and is_array_type(resolve_info.return_type))
+
+
 def is_add_relationship_mutation(resolve_info):
     return (is_mutation(resolve_info)
             and
@@ -108,19 +211,84 @@ def inner_type(field_type):
     return inner_type(field_type.of_type) if getattr(field_type, 'of_type', None) else field_type
 
 
-def directive_with_args(directive_name, *args):
-    def fun(schema_type, field_name):
-        def field_directive(schema_type, field_name, directive_name):
-            return find(schema_type.fields[field_name].ast_node.directives, lambda d: d.name.value == directive_name)
+class FieldIndex(NamedTuple):
+    field_type: Any
+    inner_type: Any
+    is_scalar: bool
+    is_list: bool
+    default_args: Mapping[str, Any]
+    directives: Mapping[str, Mapping[str, Any]]
+
+
+EMPTY_MAPPING = MappingProxyType({})
 
-        def directive_argument(directive, name):
-            return find(directive.arguments, lambda a: a.name.value == name).value.value
+# frozen field indexes of every object and interface type, built once per schema
+type_indexes = WeakKeyDictionary()
+schema_indexes = WeakKeyDictionary()
 
-        directive = field_directive(schema_type, field_name, directive_name)
-        ret = {}
-        if directive:
-            ret.update({key: directive_argument(directive, key) for key in args})
-        return ret
+
+def field_directives(field):
+    # directive name -> argument values of a field definition
+    return {} if field.ast_node is None else {
+        directive.name.value: {arg.name.value: getattr(arg.value, 'value', None) for arg in directive.arguments}
+        for directive in field.ast_node.directives}
+
+
+def index_type(schema_type, type_directives=None):
+    fields = {}
+    for field_name, field in schema_type.fields.items():
+        field_inner_type = inner_type(field.type)
+        directives = (field_directives(field) if type_directives is None
+                      else type_directives.get(field_name, EMPTY_MAPPING))
+        directives = {name: MappingProxyType(args) for name, args in directives.items()}
+        fields[field_name] = FieldIndex(
+            field_type=field.type,
+            inner_type=field_inner_type,
+            is_scalar=is_graphql_scalar_type(field_inner_type),
+            is_list=is_array_type(field.type),
+            default_args=MappingProxyType({arg_name: arg.default_value for arg_name, arg in field.args.items()}),
+            directives=MappingProxyType(directives))
+    type_indexes[schema_type] = MappingProxyType(fields)
+    return type_indexes[schema_type]
+
+
+def index_schema(schema, directives=None):
+    """
+     * Parse the directives and field classification of every object and interface type once.
+     * Returns a frozen mapping of (type name, field name) to FieldIndex.
+     * directives (type name -> field name -> directive -> arguments, see schema_directives) skips the directive parsing.
+    """
+    index = {}
+    for type_name, schema_type in schema.type_map.items():
+        if isinstance(schema_type, (GraphQLObjectType, GraphQLInterfaceType)):
+            type_directives = None if directives is None else directives.get(type_name, EMPTY_MAPPING)
+            for field_name, field in index_type(schema_type, type_directives).items():
+                index[(type_name, field_name)] = field
+    schema_indexes[schema] = MappingProxyType(index)
+    return schema_indexes[schema]
+
+
+def schema_directives(schema):
+    # plain type name -> field name -> directive -> arguments mapping of every object and interface type
+    return {type_name: {field_name: field_directives(field) for field_name, field in schema_type.fields.items()}
+            for type_name, schema_type in schema.type_map.items()
+            if isinstance(schema_type, (GraphQLObjectType, GraphQLInterfaceType))}
+
+
+def directive_index(schema):
+    index = schema_indexes.get(schema)
+    return index if index is not None else index_schema(schema)
+
+
+def type_fields(schema_type):
+    fields = type_indexes.get(schema_type)
+    return fields if fields is not None else index_type(schema_type)
+
+
+def directive_with_args(directive_name, *args):
+    def fun(schema_type, field_name):
+        directive = type_fields(schema_type)[field_name].directives.get(directive_name)
+        return {key: directive.get(key) for key in args} if directive is not None else {}
 
     return fun
 
@@ -128,13 +296,17 @@ def directive_with_args(directive_name, *args):
 cypher_directive = directive_with_args('cypher', 'statement')
 relation_directive = directive_with_args('relation', 'name', 'direction')
 mutation_meta_directive = directive_with_args('MutationMeta', 'relationship', 'from', 'to')
+# marks the generated Merge, Update and Delete mutations, with the primary key they match the node on
+keyed_mutation_directive = directive_with_args('KeyedMutation', 'operation', 'key')
 
 
-def inner_filter_params(selections):
+def inner_filter_params(selections, params=None, param_prefix=''):
     query_params = {}
     if len(selections.arguments) > 0:
         query_params = {arg.name.value: arg.value.value for arg in selections.arguments if
-                        arg.name.value not in ['first', 'offset']}
+                        arg.name.value not in ['first', 'offset', 'after', 'filter', 'orderBy']}
+    if params is not None:
+        return param_map(query_params, params, param_prefix)
     # FIXME: support IN for multiple values -> WHERE
     query_params = re.sub(r"\"([^(\")]+)\":", "\\1:", json.dumps(query_params))
 
@@ -151,18 +323,31 @@ def argument_value(selection, name, variable_values):
     )
 
 
-def extract_query_result(records, return_type):
+def extract_query_result(result, return_type):
+    # the projected column read straight from the records, rather than converting every record to a dict first
+    return column_result(result.value(type_identifiers(return_type).get('variable_name')), return_type)
+
+
+def query_result(data, return_type):
     type_ident = type_identifiers(return_type)
     variable_name = type_ident.get('variable_name')
-    result = [record.get(variable_name) for record in records.data()]
-    return result if is_array_type(return_type) else result[0] if len(result) > 0 else None
+    return column_result([record.get(variable_name) for record in data], return_type)
 
 
-def compute_skip_limit(selection, variable_values):
+def column_result(values, return_type):
+    return values if is_array_type(return_type) else values[0] if len(values) > 0 else None
+
+
+def compute_skip_limit(selection, variable_values, params=None, param_prefix='', limit=None):
+    # limit is the default page size of the field (see default_limit), applied when there is no first argument
     first = argument_value(selection, "first", variable_values)
+    if first is None:
+        first = limit
     offset = argument_value(selection, "offset", variable_values)
     if first is None and offset is None:
         return ""
+    if params is not None:
+        return parameterized_skip_limit(first, offset, params, param_prefix)
     if offset is None:
         return f'[..{first}]'
     if first is None:
@@ -170,6 +355,42 @@ def compute_skip_limit(selection, variable_values):
     return f'[{offset}..{int(offset) + int(first)}]'
 
 
+def parameterized_skip_limit(first, offset, params, param_prefix):
+    if first is not None:
+        first = add_param(params, f'{param_prefix}first', int(first))
+    if offset is not None:
+        offset = add_param(params, f'{param_prefix}offset', int(offset))
+    if offset is None:
+        return f'[..${first}]'
+    if first is None:
+        return f'[${offset}..]'
+    return f'[${offset}..${offset} + ${first}]'
+
+
+def default_limit(limits, parent_type_name, field_name, type_name, schema_first=None):
+    """
+     * Default page size of a list field, from the default_limit context option, which is either a global page size
+     * or a mapping of 'Type.field', 'Type' (the listed type) and '*' to page sizes, looked up in that order.
+     * A default of first declared on the field in the schema takes precedence over the type and global page sizes.
+     * None opts out: the list is not limited.
+    """
+    if limits is None:
+        return None
+    if isinstance(limits, Mapping):
+        field_key = f'{parent_type_name}.{field_name}'
+        if field_key in limits:
+            return limits[field_key]
+        if schema_first is not None:
+            return schema_first
+        return limits[type_name] if type_name in limits else limits.get('*')
+    return schema_first if schema_first is not None else limits
+
+
+def limits_key(limits):
+    # hashable form of the default_limit option, part of the query plan cache key
+    return frozenset(limits.items()) if isinstance(limits, Mapping) else limits
+
+
 def extract_selections(selections, fragments):
     # extract any fragment selection sets into a single array of selections
     return reduce_(selections,
@@ -179,6 +400,49 @@ def extract_selections(selections, fragments):
                    [])
 
 
+def selection_key(selections, fragments, variable_values):
+    """
+     * Hashable shape of a root field's selection set, used as the query plan cache key.
+     * Root fragment spreads are expanded like extract_selections does and aliases are dropped.
+     * Nested arguments bound to variables contribute their values, since those are inlined in the Cypher.
+    """
+    return tuple(nested_selection_key(selection, variable_values)
+                 for selection in extract_selections(selections, fragments))
+
+
+def nested_selection_key(selection, variable_values):
+    name = getattr(selection, 'name', None)
+    arguments = getattr(selection, 'arguments', None) or []
+    selection_set = getattr(selection, 'selection_set', None)
+    return (selection.kind,
+            name.value if name else None,
+            tuple((arg.name.value, argument_key(arg, variable_values)) for arg in arguments),
+            tuple(nested_selection_key(s, variable_values) for s in selection_set.selections)
+            if selection_set else None)
+
+
+def argument_key(arg, variable_values):
+    value = arg.value
+    if value.kind == 'variable':
+        # variables are looked up both by variable name and by argument name (see argument_value, parse_args)
+        return ('variable', value.name.value, repr(variable_values.get(value.name.value)),
+                repr(variable_values.get(arg.name.value)))
+    if value.kind in ('list_value', 'object_value'):
+        # filter arguments nest variables in object values
+        return value.kind, repr(value_from_ast_untyped(value, variable_values))
+    return value.kind, getattr(value, 'value', None)
+
+
+def escape_braces(text):
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+def rename_parameters(query, rename):
+    # rewrite every $parameter of a Cypher query with rename(name), leaving string literals untouched
+    return re.sub(r'"(?:[^"\\]|\\.)*"|\$(\w+)',
+                  lambda match: match.group(0) if match.group(1) is None else rename(match.group(1)), query)
+
+
 def fix_params_for_add_relationship_mutation(resolve_info, **kwargs):
     # FIXME: find a better way to map param name in schema to datamodel
     #   let mutationMeta, fromTypeArg, toTypeArg;
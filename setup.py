@@ -116,7 +116,7 @@ setup(
     author_email=EMAIL,
     python_requires=REQUIRES_PYTHON,
     url=URL,
-    packages=find_packages(exclude=["tests", "*.tests", "*.tests.*", "tests.*", 'examples']),
+    packages=find_packages(exclude=["tests", "*.tests", "*.tests.*", "tests.*", 'examples', 'benchmarks', 'benchmarks.*']),
     # If your package is a single module, use this instead of 'packages':
     # py_modules=['neo4j_graphql_py'],
 
@@ -6,7 +6,7 @@ from .schema import test_schema
 from neo4j_graphql_py import make_executable_schema, augment_schema, cypher_query, cypher_mutation
 
 
-def run_test(self, graphql_query, expected_cypher_query, params=None):
+def run_test(self, graphql_query, expected_cypher_query, params=None, expected_cypher_params=None):
     test_movie_schema = test_schema + '''
     type Mutation {
         CreateGenre(name: String): Genre @cypher(statement: "CREATE (g:Genre) SET g.name = $name RETURN g")
@@ -16,11 +16,19 @@ def run_test(self, graphql_query, expected_cypher_query, params=None):
     '''
 
     def resolve_query(_, info, **kwargs):
-        query = cypher_query(info.context, info, **kwargs)
+        if expected_cypher_params is not None:
+            query, cypher_params = cypher_query(info.context, info, parameterized=True, **kwargs)
+            self.assertEqual(first=expected_cypher_params, second=cypher_params)
+        else:
+            query = cypher_query(info.context, info, **kwargs)
         self.assertEqual(first=expected_cypher_query, second=query)
 
     def resolve_mutation(_, info, **kwargs):
-        query = cypher_mutation(info.context, info, **kwargs)
+        if expected_cypher_params is not None:
+            query, cypher_params = cypher_mutation(info.context, info, parameterized=True, **kwargs)
+            self.assertEqual(first=expected_cypher_params, second=cypher_params)
+        else:
+            query = cypher_mutation(info.context, info, **kwargs)
         self.assertEqual(first=expected_cypher_query, second=query)
 
     resolvers = {
@@ -72,3 +80,28 @@ def augmented_schema():
     schema = make_executable_schema(test_schema, resolvers=[])
     aug_schema = augment_schema(schema)
     return aug_schema
+
+
+def translate_mutation(graphql_query, params=None, parameterized=False):
+    # Cypher of a mutation of the augmented test schema, with its parameters when parameterized
+    queries = []
+
+    def resolve_mutation(_, info, **kwargs):
+        queries.append(cypher_mutation(info.context, info, parameterized=parameterized, **kwargs))
+
+    aug_schema = augmented_schema()
+    for field in aug_schema.mutation_type.fields.values():
+        field.resolve = resolve_mutation
+    result = graphql_sync(aug_schema, graphql_query, variable_values=params, context_value={})
+    if result.errors:
+        raise result.errors[0]
+    return queries[0]
+
+
+def mock_driver():
+    # MagicMock driver whose sessions run transaction functions on themselves, see driver.session.return_value.run
+    driver = mock.MagicMock()
+    session = driver.session.return_value
+    session.read_transaction.side_effect = lambda transaction_function, *args: transaction_function(session, *args)
+    session.write_transaction.side_effect = session.read_transaction.side_effect
+    return driver
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+from graphql import print_schema
+
+from tests.helpers.schema import test_schema
+from neo4j_graphql_py import (make_executable_schema, augment_schema, build_schema_artifact, load_schema_artifact,
+                              cached_schema)
+from neo4j_graphql_py.utils import cypher_directive, directive_index, index_schema
+
+
+class TestSchemaArtifact(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'schema.pickle')
+
+    def test_loaded_schema_matches_augmented_schema(self):
+        def resolve_genre_name(genre, info):
+            return genre['name'].upper()
+
+        build_schema_artifact(test_schema, self.path)
+        schema = load_schema_artifact(self.path, {'Genre': {'name': resolve_genre_name}}, type_defs=test_schema)
+        expected = augment_schema(make_executable_schema(test_schema, {}))
+
+        self.assertEqual(print_schema(expected), print_schema(schema))
+        self.assertIs(resolve_genre_name, schema.get_type('Genre').fields['name'].resolve)
+        self.assertTrue(getattr(schema.query_type.fields['Movie'].resolve, 'neo4j_graphql', False))
+        self.assertTrue(getattr(schema.mutation_type.fields['AddMovieGenre'].resolve, 'neo4j_graphql', False))
+        self.assertEqual('MATCH (g:Genre) WHERE toLower(g.name) CONTAINS toLower($substring) RETURN g',
+                         cypher_directive(schema.query_type, 'GenresBySubstring')['statement'])
+        self.assertEqual(dict(directive_index(schema)), dict(index_schema(schema)))
+
+    def test_metadata(self):
+        artifact = build_schema_artifact(test_schema)
+
+        self.assertEqual('_id', artifact.primary_keys['Movie'])
+        self.assertEqual('id', artifact.primary_keys['Actor'])
+        self.assertEqual(['AddMovieGenre', 'AddActorMovie', 'AddMovieState'],
+                         [mutation.name for mutation in artifact.relationships['Movie']])
+        self.assertEqual({'name': 'IN_GENRE', 'direction': 'OUT'}, artifact.directives['Movie']['genres']['relation'])
+
+    def test_artifact_of_other_type_defs_is_rejected(self):
+        build_schema_artifact(test_schema, self.path)
+
+        with self.assertRaises(ValueError):
+            load_schema_artifact(self.path, type_defs=test_schema + 'type Extra { name: String }')
+
+    def test_cached_schema_rebuilds_stale_artifact(self):
+        build_schema_artifact(test_schema, self.path)
+        type_defs = test_schema + 'type Extra { name: String }'
+        schema = cached_schema(type_defs, self.path)
+
+        self.assertIn('CreateExtra', schema.mutation_type.fields)
+        self.assertIn('CreateExtra', load_schema_artifact(self.path, type_defs=type_defs).mutation_type.fields)
+
+
+if __name__ == '__main__':
+    unittest.main()
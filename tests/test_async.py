@@ -0,0 +1,104 @@
+import asyncio
+import unittest
+
+from graphql import graphql
+
+from tests.helpers.schema import test_schema
+from neo4j_graphql_py import make_executable_schema, augment_schema
+
+
+class FakeAsyncResult:
+    def __init__(self, records):
+        self.records = records
+
+    async def value(self, key=0):
+        return [record.get(key) for record in self.records]
+
+
+class FakeAsyncSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def run(self, query, parameters=None):
+        self.driver.in_flight += 1
+        self.driver.max_in_flight = max(self.driver.max_in_flight, self.driver.in_flight)
+        self.driver.queries.append(query)
+        await asyncio.sleep(0.01)
+        self.driver.in_flight -= 1
+        variable_name = query.split(' AS ')[-1].split(' ')[0]
+        return FakeAsyncResult([{variable_name: {'title': 'Top Gun', 'name': 'Action'}}])
+
+    async def read_transaction(self, transaction_function, *args):
+        return await transaction_function(self, *args)
+
+
+class FakeAsyncDriver:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.queries = []
+        self.access_modes = []
+
+    def session(self, **config):
+        self.access_modes.append(config.get('default_access_mode'))
+        return FakeAsyncSession(self)
+
+
+class TestAsyncResolvers(unittest.TestCase):
+
+    def test_root_fields_run_concurrently(self):
+        schema = augment_schema(make_executable_schema(test_schema, resolvers=[]), use_async=True)
+        driver = FakeAsyncDriver()
+        graphql_query = '''
+        {
+            Movie(title: "Top Gun") {
+                title
+            }
+            MovieById(movieId: "18") {
+                title
+            }
+            GenresBySubstring(substring: "Action") {
+                name
+            }
+        }
+        '''
+        result = asyncio.run(graphql(schema, graphql_query, context_value={'driver': driver}))
+
+        self.assertIsNone(result.errors)
+        self.assertEqual({'Movie': [{'title': 'Top Gun'}], 'MovieById': {'title': 'Top Gun'},
+                          'GenresBySubstring': [{'name': 'Action'}]}, result.data)
+        self.assertEqual(3, len(driver.queries))
+        self.assertEqual(3, driver.max_in_flight)
+        self.assertEqual(['READ'] * 3, driver.access_modes)
+
+    def test_sync_driver_is_rejected(self):
+        class SyncSession:
+            closed = False
+
+            def close(self):
+                self.closed = True
+
+        class SyncDriver:
+            def __init__(self):
+                self.sessions = []
+
+            def session(self, **config):
+                self.sessions.append(SyncSession())
+                return self.sessions[-1]
+
+        driver = SyncDriver()
+        schema = augment_schema(make_executable_schema(test_schema, resolvers=[]), use_async=True)
+        result = asyncio.run(graphql(schema, '{ Movie(title: "Top Gun") { title } }', context_value={'driver': driver}))
+
+        self.assertIn('install neo4j>=5', result.errors[0].message)
+        self.assertTrue(driver.sessions[0].closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,23 @@
+import importlib
 import unittest
+from unittest import mock
 
 from tests.helpers.cypher_test_helpers import augmented_schema
+from tests.helpers.schema import test_schema
 from graphql import print_schema
 
+from neo4j_graphql_py import make_executable_schema, augment_schema
+from neo4j_graphql_py.utils import cypher_directive, relation_directive
+
+
+def chain_schema(type_count):
+    # type_count types, each related to the previous one (a forward chain would exceed the recursion limit of
+    # graphql-core's type map construction)
+    types = '\n'.join(f'type T{i} {{ id: ID! name: String previous: [T{max(i - 1, 0)}] '
+                      f'@relation(name: "PREVIOUS", direction: "OUT") }}' for i in range(type_count))
+    roots = ' '.join(f'T{i}: [T{i}]' for i in range(type_count))
+    return f'directive @relation(name:String!, direction:String!) on FIELD_DEFINITION\n{types}\ntype Query {{ {roots} }}'
+
 
 class TestAugmentedSchema(unittest.TestCase):
 
@@ -17,13 +32,34 @@ directive @MutationMeta(relationship: String, from: String, to: String) on FIELD
 type Actor implements Person {
   id: ID!
   name: String
-  movies: [Movie]
+  movies(filter: _MovieFilter, orderBy: [_MovieOrdering!]): [Movie]
+  moviesConnection(first: Int, after: String, filter: _MovieFilter): MovieConnection
+}
+
+type ActorConnection {
+  edges: [ActorEdge]
+  pageInfo: PageInfo!
+}
+
+type ActorEdge {
+  cursor: String!
+  node: Actor
 }
 
 type Book {
   genre: BookGenre
 }
 
+type BookConnection {
+  edges: [BookEdge]
+  pageInfo: PageInfo!
+}
+
+type BookEdge {
+  cursor: String!
+  node: Book
+}
+
 enum BookGenre {
   Mystery
   Science
@@ -33,8 +69,19 @@ enum BookGenre {
 type Genre {
   _id: ID!
   name: String
-  movies(first: Int = 3, offset: Int = 0): [Movie]
+  movies(first: Int = 3, offset: Int = 0, filter: _MovieFilter, orderBy: [_MovieOrdering!]): [Movie]
   highestRatedMovie: Movie
+  moviesConnection(first: Int, after: String, filter: _MovieFilter): MovieConnection
+}
+
+type GenreConnection {
+  edges: [GenreEdge]
+  pageInfo: PageInfo!
+}
+
+type GenreEdge {
+  cursor: String!
+  node: Genre
 }
 
 type Movie {
@@ -45,28 +92,72 @@ type Movie {
   plot: String
   poster: String
   imdbRating: Float
-  genres: [Genre]
+  genres(filter: _GenreFilter, orderBy: [_GenreOrdering!]): [Genre]
   similar(first: Int = 3, offset: Int = 0): [Movie]
   mostSimilar: Movie
   degree: Int
-  actors(first: Int = 3, offset: Int = 0, name: String): [Actor]
+  actors(first: Int = 3, offset: Int = 0, name: String, filter: _ActorFilter, orderBy: [_ActorOrdering!]): [Actor]
   avgStars: Float
   filmedIn: State
   scaleRating(scale: Int = 3): Float
   scaleRatingFloat(scale: Float = 1.5): Float
   actorMovies: [Movie]
+  genresConnection(first: Int, after: String, filter: _GenreFilter): GenreConnection
+  actorsConnection(first: Int, after: String, filter: _ActorFilter): ActorConnection
+}
+
+type MovieConnection {
+  edges: [MovieEdge]
+  pageInfo: PageInfo!
+}
+
+type MovieEdge {
+  cursor: String!
+  node: Movie
 }
 
 type Mutation {
   CreateMovie(movieId: ID, title: String, year: Int, plot: String, poster: String, imdbRating: Float, degree: Int, avgStars: Float, scaleRating: Float, scaleRatingFloat: Float): Movie
+  CreateManyMovie(input: [_MovieInput!]!): [Movie]
+  UpdateMovie(_id: ID!, movieId: ID, title: String, year: Int, plot: String, poster: String, imdbRating: Float, degree: Int, avgStars: Float, scaleRating: Float, scaleRatingFloat: Float): Movie
+  DeleteMovie(_id: ID!): Movie
   AddMovieGenre(movie_id: ID!, genre_id: ID!): Movie
+  AddManyMovieGenre(input: [_MovieGenreInput!]!): [Movie]
   AddActorMovie(actorid: ID!, movie_id: ID!): Actor
+  AddManyActorMovie(input: [_ActorMovieInput!]!): [Actor]
   AddMovieState(movie_id: ID!, statename: String!): Movie
+  AddManyMovieState(input: [_MovieStateInput!]!): [Movie]
   CreateGenre(name: String): Genre
+  CreateManyGenre(input: [_GenreInput!]!): [Genre]
+  UpdateGenre(_id: ID!, name: String): Genre
+  DeleteGenre(_id: ID!): Genre
   CreateActor(id: ID, name: String): Actor
+  CreateManyActor(input: [_ActorInput!]!): [Actor]
+  MergeActor(id: ID!, name: String): Actor
+  UpdateActor(id: ID!, name: String): Actor
+  DeleteActor(id: ID!): Actor
   CreateState(name: String): State
+  CreateManyState(input: [_StateInput!]!): [State]
+  MergeState(name: String!): State
+  UpdateState(name: String!): State
+  DeleteState(name: String!): State
   CreateBook(genre: BookGenre): Book
+  CreateManyBook(input: [_BookInput!]!): [Book]
+  MergeBook(genre: BookGenre!): Book
+  UpdateBook(genre: BookGenre!): Book
+  DeleteBook(genre: BookGenre!): Book
   CreateUser(id: ID, name: String): User
+  CreateManyUser(input: [_UserInput!]!): [User]
+  MergeUser(id: ID!, name: String): User
+  UpdateUser(id: ID!, name: String): User
+  DeleteUser(id: ID!): User
+}
+
+type PageInfo {
+  hasNextPage: Boolean!
+  hasPreviousPage: Boolean!
+  startCursor: String
+  endCursor: String
 }
 
 interface Person {
@@ -75,12 +166,15 @@ interface Person {
 }
 
 type Query {
-  Movie(_id: Int, id: ID, title: String, year: Int, plot: String, poster: String, imdbRating: Float, first: Int, offset: Int): [Movie]
-  MoviesByYear(year: Int): [Movie]
+  Movie(_id: Int, id: ID, title: String, year: Int, plot: String, poster: String, imdbRating: Float, first: Int, offset: Int, filter: _MovieFilter, orderBy: [_MovieOrdering!]): [Movie]
+  MoviesByYear(year: Int, filter: _MovieFilter, orderBy: [_MovieOrdering!]): [Movie]
   MovieById(movieId: ID!): Movie
   MovieBy_Id(_id: Int!): Movie
   GenresBySubstring(substring: String): [Genre]
-  Books: [Book]
+  Books(filter: _BookFilter, orderBy: [_BookOrdering!]): [Book]
+  MovieConnection(_id: Int, id: ID, title: String, year: Int, plot: String, poster: String, imdbRating: Float, first: Int, after: String, filter: _MovieFilter): MovieConnection
+  MoviesByYearConnection(year: Int, first: Int, after: String, filter: _MovieFilter): MovieConnection
+  BooksConnection(first: Int, after: String, filter: _BookFilter): BookConnection
 }
 
 type State {
@@ -91,5 +185,248 @@ type User implements Person {
   id: ID!
   name: String
 }
+
+input _ActorFilter {
+  AND: [_ActorFilter!]
+  OR: [_ActorFilter!]
+  id: ID
+  id_in: [ID!]
+  id_contains: ID
+  id_starts_with: ID
+  id_gt: ID
+  id_lt: ID
+  name: String
+  name_in: [String!]
+  name_contains: String
+  name_starts_with: String
+  name_gt: String
+  name_lt: String
+}
+
+input _ActorInput {
+  id: ID
+  name: String
+}
+
+input _ActorMovieInput {
+  actorid: ID!
+  movie_id: ID!
+}
+
+enum _ActorOrdering {
+  id_asc
+  id_desc
+  name_asc
+  name_desc
+}
+
+input _BookFilter {
+  AND: [_BookFilter!]
+  OR: [_BookFilter!]
+  genre: BookGenre
+  genre_in: [BookGenre!]
+}
+
+input _BookInput {
+  genre: BookGenre
+}
+
+enum _BookOrdering {
+  genre_asc
+  genre_desc
+}
+
+input _GenreFilter {
+  AND: [_GenreFilter!]
+  OR: [_GenreFilter!]
+  name: String
+  name_in: [String!]
+  name_contains: String
+  name_starts_with: String
+  name_gt: String
+  name_lt: String
+}
+
+input _GenreInput {
+  name: String
+}
+
+enum _GenreOrdering {
+  name_asc
+  name_desc
+}
+
+input _MovieFilter {
+  AND: [_MovieFilter!]
+  OR: [_MovieFilter!]
+  movieId: ID
+  movieId_in: [ID!]
+  movieId_contains: ID
+  movieId_starts_with: ID
+  movieId_gt: ID
+  movieId_lt: ID
+  title: String
+  title_in: [String!]
+  title_contains: String
+  title_starts_with: String
+  title_gt: String
+  title_lt: String
+  year: Int
+  year_in: [Int!]
+  year_gt: Int
+  year_lt: Int
+  plot: String
+  plot_in: [String!]
+  plot_contains: String
+  plot_starts_with: String
+  plot_gt: String
+  plot_lt: String
+  poster: String
+  poster_in: [String!]
+  poster_contains: String
+  poster_starts_with: String
+  poster_gt: String
+  poster_lt: String
+  imdbRating: Float
+  imdbRating_in: [Float!]
+  imdbRating_gt: Float
+  imdbRating_lt: Float
+  avgStars: Float
+  avgStars_in: [Float!]
+  avgStars_gt: Float
+  avgStars_lt: Float
+}
+
+input _MovieGenreInput {
+  movie_id: ID!
+  genre_id: ID!
+}
+
+input _MovieInput {
+  movieId: ID
+  title: String
+  year: Int
+  plot: String
+  poster: String
+  imdbRating: Float
+  degree: Int
+  avgStars: Float
+  scaleRating: Float
+  scaleRatingFloat: Float
+}
+
+enum _MovieOrdering {
+  movieId_asc
+  movieId_desc
+  title_asc
+  title_desc
+  year_asc
+  year_desc
+  plot_asc
+  plot_desc
+  poster_asc
+  poster_desc
+  imdbRating_asc
+  imdbRating_desc
+  avgStars_asc
+  avgStars_desc
+}
+
+input _MovieStateInput {
+  movie_id: ID!
+  statename: String!
+}
+
+input _StateFilter {
+  AND: [_StateFilter!]
+  OR: [_StateFilter!]
+  name: String
+  name_in: [String!]
+  name_contains: String
+  name_starts_with: String
+  name_gt: String
+  name_lt: String
+}
+
+input _StateInput {
+  name: String
+}
+
+enum _StateOrdering {
+  name_asc
+  name_desc
+}
+
+input _UserFilter {
+  AND: [_UserFilter!]
+  OR: [_UserFilter!]
+  id: ID
+  id_in: [ID!]
+  id_contains: ID
+  id_starts_with: ID
+  id_gt: ID
+  id_lt: ID
+  name: String
+  name_in: [String!]
+  name_contains: String
+  name_starts_with: String
+  name_gt: String
+  name_lt: String
+}
+
+input _UserInput {
+  id: ID
+  name: String
+}
+
+enum _UserOrdering {
+  id_asc
+  id_desc
+  name_asc
+  name_desc
+}
 '''
         self.assertEqual(expected_schema, print_schema(schema))
+
+    def test_augmented_schema_keeps_directives(self):
+        schema = augmented_schema()
+
+        self.assertEqual('MATCH (g:Genre) WHERE toLower(g.name) CONTAINS toLower($substring) RETURN g',
+                         cypher_directive(schema.query_type, 'GenresBySubstring')['statement'])
+        self.assertEqual({'name': 'IN_GENRE', 'direction': 'OUT'},
+                         relation_directive(schema.get_type('Movie'), 'genres'))
+
+    def test_existing_mutation_type_is_extended(self):
+        def create_genre(_, info, **kwargs):
+            return {'name': kwargs['name']}
+
+        schema = make_executable_schema(test_schema + '''
+        type Mutation {
+            CreateGenre(name: String): Genre @cypher(statement: "CREATE (g:Genre) SET g.name = $name RETURN g")
+        }
+        ''', {'Mutation': {'CreateGenre': create_genre}})
+        aug_schema = augment_schema(schema)
+        mutations = aug_schema.mutation_type.fields
+
+        self.assertIs(create_genre, mutations['CreateGenre'].resolve)
+        self.assertIn('CreateMovie', mutations)
+        self.assertIn('AddMovieGenre', mutations)
+        self.assertTrue(getattr(mutations['CreateMovie'].resolve, 'neo4j_graphql', False))
+        self.assertEqual('CREATE (g:Genre) SET g.name = $name RETURN g',
+                         cypher_directive(aug_schema.mutation_type, 'CreateGenre')['statement'])
+
+    def test_mutation_generation_is_linear_in_the_number_of_types(self):
+        # the package exports the augment_schema function under the module's name
+        augment_schema_module = importlib.import_module('neo4j_graphql_py.augment_schema')
+        for type_count in [10, 100, 2000]:
+            schema = make_executable_schema(chain_schema(type_count), {})
+            with mock.patch.object(augment_schema_module, 'relationship_mutations',
+                                   wraps=augment_schema_module.relationship_mutations) as relationship_mutations, \
+                    mock.patch.object(augment_schema_module, 'primary_key',
+                                      wraps=augment_schema_module.primary_key) as primary_key:
+                aug_schema = augment_schema(schema)
+
+            self.assertEqual(type_count, relationship_mutations.call_count)
+            self.assertEqual(type_count, primary_key.call_count)
+            # Create, CreateMany, Merge, Update, Delete, Add and AddMany per type
+            self.assertEqual(7 * type_count, len(aug_schema.mutation_type.fields))
@@ -0,0 +1,95 @@
+import asyncio
+import unittest
+
+from graphql import graphql
+
+from tests.helpers.schema import test_schema
+from neo4j_graphql_py import make_executable_schema, augment_schema, QueryBatcher
+from neo4j_graphql_py.batching import batch_statement
+
+
+class FakeAsyncResult:
+    def __init__(self, records):
+        self.records = records
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.records:
+            raise StopAsyncIteration
+        return self.records.pop(0)
+
+
+class FakeAsyncSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def run(self, query, parameters=None):
+        self.driver.queries.append((query, parameters))
+        if '_batch_rows' in parameters:
+            return FakeAsyncResult([{'_batch_index': row['_batch_index'], 'movie': {'title': row['movieId']}}
+                                    for row in reversed(parameters['_batch_rows'])])
+        return FakeAsyncResult([{'genre': {'name': parameters['substring']}}])
+
+    async def read_transaction(self, transaction_function, *args):
+        return await transaction_function(self, *args)
+
+
+class FakeAsyncDriver:
+    def __init__(self):
+        self.queries = []
+        self.session_configs = []
+
+    def session(self, **config):
+        self.session_configs.append(config)
+        return FakeAsyncSession(self)
+
+
+class TestQueryBatcher(unittest.TestCase):
+
+    def test_sibling_root_fields_share_one_statement(self):
+        schema = augment_schema(make_executable_schema(test_schema, resolvers=[]), use_async=True, parameterized=True)
+        driver = FakeAsyncDriver()
+        graphql_query = '''
+        {
+            a: MovieById(movieId: "1") { title }
+            b: MovieById(movieId: "2") { title }
+            c: MovieById(movieId: "3") { title }
+            d: GenresBySubstring(substring: "Action") { name }
+        }
+        '''
+        batcher = QueryBatcher(driver)
+        result = asyncio.run(graphql(schema, graphql_query, context_value={
+            'driver': driver, 'neo4j_batcher': batcher, 'bookmarks': ['bookmark:1']}))
+
+        self.assertIsNone(result.errors)
+        self.assertEqual({'a': {'title': '1'}, 'b': {'title': '2'}, 'c': {'title': '3'},
+                          'd': [{'name': 'Action'}]}, result.data)
+        self.assertEqual(2, len(driver.queries))
+        self.assertEqual(1, batcher.batches)
+        # routed to the followers, once they have the writes of the request's bookmarks
+        self.assertEqual([{'default_access_mode': 'READ', 'bookmarks': ['bookmark:1']}] * 2, driver.session_configs)
+
+    def test_batch_statement(self):
+        query = ('WITH apoc.cypher.runFirstColumn("MATCH (g:Genre) WHERE g.name = $substring RETURN g", '
+                 '{substring: $substring}, true) AS x UNWIND x AS genre RETURN genre { .name } AS genre SKIP $offset')
+        batch_query, batch_params = batch_statement(query, 'genre', [{'substring': 'Action', 'offset': 0},
+                                                                     {'substring': 'Drama', 'offset': 0}])
+
+        self.assertEqual('UNWIND $_batch_rows AS _batch CALL { WITH _batch WITH apoc.cypher.runFirstColumn('
+                         '"MATCH (g:Genre) WHERE g.name = $substring RETURN g", {substring: _batch.substring}, true) '
+                         'AS x UNWIND x AS genre RETURN genre { .name } AS genre SKIP $offset } '
+                         'RETURN _batch._batch_index AS _batch_index, genre', batch_query)
+        self.assertEqual({'offset': 0, '_batch_rows': [{'substring': 'Action', '_batch_index': 0},
+                                                       {'substring': 'Drama', '_batch_index': 1}]}, batch_params)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from graphql import graphql_sync
+
+from tests.helpers.cypher_test_helpers import translate_mutation, mock_driver
+from tests.helpers.schema import test_schema
+from neo4j_graphql_py import make_executable_schema, augment_schema
+
+
+class TestBulkMutations(unittest.TestCase):
+    rows = [{'movieId': '1', 'title': 'Top Gun'}, {'movieId': '2', 'title': 'Heat'}, {'movieId': '3', 'title': 'Ran'}]
+
+    def test_create_many(self):
+        query, params = translate_mutation(
+            'mutation($rows: [_MovieInput!]!) { CreateManyMovie(input: $rows) { _id title } }', {'rows': self.rows},
+            parameterized=True)
+        self.assertEqual('UNWIND $rows AS row CREATE (movie:Movie) SET movie = row '
+                         'RETURN movie {_id: ID(movie), .title } AS movie', query)
+        self.assertEqual({'rows': self.rows}, params)
+
+    def test_add_many(self):
+        self.assertEqual(
+            'UNWIND $rows AS row MATCH (movie:Movie {_id: row.movie_id}) MATCH (genre:Genre {_id: row.genre_id}) '
+            'MERGE (movie)-[:IN_GENRE]->(genre) RETURN movie { .title } AS movie',
+            translate_mutation('mutation { AddManyMovieGenre(input: [{movie_id: "1", genre_id: "2"}]) { title } }'))
+
+    def test_rows_are_sent_in_chunks(self):
+        driver = mock_driver()
+        run = driver.session.return_value.run
+        run.return_value.value.side_effect = [[{'title': 'Top Gun'}, {'title': 'Heat'}], [{'title': 'Ran'}]]
+        schema = augment_schema(make_executable_schema(test_schema, {}))
+
+        result = graphql_sync(schema, 'mutation($rows: [_MovieInput!]!) { CreateManyMovie(input: $rows) { title } }',
+                              variable_values={'rows': self.rows},
+                              context_value={'driver': driver, 'bulk_chunk_size': 2})
+
+        self.assertIsNone(result.errors)
+        self.assertEqual([{'title': 'Top Gun'}, {'title': 'Heat'}, {'title': 'Ran'}], result.data['CreateManyMovie'])
+        self.assertEqual([{'rows': self.rows[:2]}, {'rows': self.rows[2:]}],
+                         [call.args[1] for call in run.call_args_list])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+
+from graphql import graphql_sync
+
+from tests.helpers.cypher_test_helpers import mock_driver
+from tests.helpers.schema import test_schema
+from neo4j_graphql_py import make_executable_schema, augment_schema, cypher_query, estimate_query_cost
+
+
+def translate(graphql_query, context=None, parameterized=False):
+    queries = []
+
+    def resolve(_, info, **kwargs):
+        queries.append(cypher_query(info.context, info, parameterized=parameterized, **kwargs))
+
+    schema = augment_schema(make_executable_schema(test_schema, {}))
+    for field in schema.query_type.fields.values():
+        field.resolve = resolve
+    result = graphql_sync(schema, graphql_query, context_value=context or {})
+    if result.errors:
+        raise result.errors[0]
+    return queries[0]
+
+
+class TestConnections(unittest.TestCase):
+
+    def test_root_connection(self):
+        self.assertEqual(
+            'MATCH (movie:Movie {year: 2000}) WHERE ID(movie) > toInteger("41") '
+            'WITH movie ORDER BY ID(movie) ASC LIMIT 3 WITH collect(movie) AS movie_nodes '
+            'RETURN {edges: [movie IN movie_nodes[..2] | {cursor: toString(ID(movie)), node: movie { .title }}], '
+            'pageInfo: {hasNextPage: size(movie_nodes) > 2, hasPreviousPage: true, '
+            'startCursor: toString(ID(head(movie_nodes[..2]))), endCursor: toString(ID(last(movie_nodes[..2])))}} '
+            'AS movieConnection',
+            translate('{ MovieConnection(year: 2000, first: 2, after: "41") '
+                      '{ edges { cursor node { title } } pageInfo { hasNextPage endCursor } } }'))
+
+    def test_root_connection_parameterized(self):
+        query, params = translate('{ MoviesByYearConnection(year: 2000, first: 2, after: "41") '
+                                  '{ edges { node { title } } } }', parameterized=True)
+        self.assertEqual(
+            'MATCH (movie:Movie {year: $year}) WHERE ID(movie) > toInteger($after) '
+            'WITH movie ORDER BY ID(movie) ASC LIMIT $first + 1 WITH collect(movie) AS movie_nodes '
+            'RETURN {edges: [movie IN movie_nodes[..$first] | {cursor: toString(ID(movie)), node: movie { .title }}], '
+            'pageInfo: {hasNextPage: size(movie_nodes) > $first, hasPreviousPage: true, '
+            'startCursor: toString(ID(head(movie_nodes[..$first]))), '
+            'endCursor: toString(ID(last(movie_nodes[..$first])))}} AS movieConnection', query)
+        self.assertEqual({'year': 2000, 'after': '41', 'first': 2}, params)
+
+    def test_unbounded_connection(self):
+        self.assertEqual(
+            'MATCH (book:Book {}) WITH book ORDER BY book.genre ASC WITH collect(book) AS book_nodes '
+            'RETURN {edges: [book IN book_nodes | {cursor: toString(book.genre)}], '
+            'pageInfo: {hasNextPage: false, hasPreviousPage: false, '
+            'startCursor: toString(head(book_nodes).genre), endCursor: toString(last(book_nodes).genre)}} '
+            'AS bookConnection',
+            translate('{ BooksConnection { edges { cursor } pageInfo { hasNextPage } } }'))
+
+    def test_default_limit_pages_connection(self):
+        query = translate('{ BooksConnection { edges { cursor } } }', {'default_limit': 10})
+        self.assertIn('LIMIT 11 ', query)
+        self.assertIn('hasNextPage: size(book_nodes) > 10', query)
+
+    def test_nested_connection(self):
+        self.assertEqual(
+            'MATCH (movie:Movie {title: "River Runs Through It, A"}) RETURN movie { .title ,'
+            'actorsConnection: head([movie_actorsConnection_nodes IN [apoc.cypher.runFirstColumn('
+            '"MATCH (this)<-[:ACTED_IN]-(node:Actor) WHERE node.id > $after RETURN node ORDER BY node.id ASC '
+            'LIMIT $limit", {this: movie, limit: 4, after: "a1"}, true)] | '
+            '{edges: [movie_actorsConnection IN movie_actorsConnection_nodes[..3] | '
+            '{cursor: toString(movie_actorsConnection.id), node: movie_actorsConnection { .name }}], '
+            'pageInfo: {hasNextPage: size(movie_actorsConnection_nodes) > 3, hasPreviousPage: true, '
+            'startCursor: toString(head(movie_actorsConnection_nodes[..3]).id), '
+            'endCursor: toString(last(movie_actorsConnection_nodes[..3]).id)}}]) } AS movie SKIP 0',
+            translate('{ Movie(title: "River Runs Through It, A") { title '
+                      'actorsConnection(first: 3, after: "a1") { edges { node { name } } pageInfo { hasNextPage } } } }'))
+
+    def test_connection_cost(self):
+        costs = []
+
+        def resolve(_, info, **kwargs):
+            costs.append(estimate_query_cost(info, info.field_nodes[0], kwargs.get('first', -1)))
+
+        schema = augment_schema(make_executable_schema(test_schema, {}))
+        schema.query_type.fields['MovieConnection'].resolve = resolve
+        graphql_sync(schema, '{ MovieConnection(first: 10) { edges { node { title '
+                             'genresConnection(first: 2) { edges { node { name } } } } } } }')
+
+        # per movie: 2 genres
+        self.assertEqual((30, 3), costs[0])
+
+    def test_connection_result(self):
+        page = {'edges': [{'cursor': '1', 'node': {'title': 'Top Gun'}}],
+                'pageInfo': {'hasNextPage': True, 'hasPreviousPage': False, 'startCursor': '1', 'endCursor': '1'}}
+        driver = mock_driver()
+        driver.session.return_value.run.return_value.value.return_value = [page]
+        schema = augment_schema(make_executable_schema(test_schema, {}))
+
+        result = graphql_sync(schema, '{ MovieConnection(first: 1) { edges { cursor node { title } } '
+                                      'pageInfo { hasNextPage endCursor } } }', context_value={'driver': driver})
+
+        self.assertIsNone(result.errors)
+        self.assertEqual({'MovieConnection': {'edges': [{'cursor': '1', 'node': {'title': 'Top Gun'}}],
+                                              'pageInfo': {'hasNextPage': True, 'endCursor': '1'}}}, result.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from graphql import graphql_sync
+
+from tests.helpers.schema import test_schema
+from neo4j_graphql_py import make_executable_schema, cypher_query, estimate_query_cost, TimingInstrumentation
+
+
+def translate(graphql_query, context):
+    queries = []
+
+    def resolve(_, info, **kwargs):
+        queries.append(cypher_query(info.context, info, **kwargs))
+
+    schema = make_executable_schema(test_schema, {'Query': {'Movie': resolve, 'MovieById': resolve}})
+    result = graphql_sync(schema, graphql_query, context_value=context)
+    return queries, result.errors
+
+
+class TestQueryCost(unittest.TestCase):
+    nested_query = '{ Movie(first: 10) { title actors { name movies { title } } } }'
+
+    def test_estimate(self):
+        costs = []
+
+        def resolve(_, info, **kwargs):
+            costs.append(estimate_query_cost(info, info.field_nodes[0], kwargs.get('first', -1)))
+
+        schema = make_executable_schema(test_schema, {'Query': {'Movie': resolve, 'MovieById': resolve}})
+        graphql_sync(schema, self.nested_query)
+        graphql_sync(schema, '{ MovieById(movieId: "1") { similar(first: 2) { title degree } } }')
+
+        # per movie: 100 actors and 100 movies per actor, as neither list is sliced without first or default_limit
+        self.assertEqual((101010, 10101), costs[0])
+        # one @cypher call for similar, 2 similar movies and a @cypher call for each of their degrees
+        self.assertEqual((6, 6), costs[1])
+
+    def test_query_over_budget_is_rejected(self):
+        queries, errors = translate(self.nested_query, {'max_query_cost': 1000})
+
+        self.assertEqual([], queries)
+        self.assertEqual('Query cost 101010 exceeds the maximum cost of 1000', errors[0].message)
+
+    def test_query_over_budget_is_limited(self):
+        queries, errors = translate(self.nested_query, {'max_query_cost': 50000, 'query_cost_policy': 'limit'})
+
+        self.assertIsNone(errors)
+        self.assertTrue(queries[0].endswith('SKIP 0 LIMIT 4'))
+
+    def test_cost_is_recorded(self):
+        instrumentation = TimingInstrumentation()
+        translate(self.nested_query, {'instrumentation': instrumentation})
+
+        self.assertEqual([('query_cost', 101010, {'field': 'Movie'})], instrumentation.values)
+
+
+if __name__ == '__main__':
+    unittest.main()
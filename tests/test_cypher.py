@@ -1,4 +1,8 @@
 import unittest
+
+from graphql import graphql_sync
+
+from neo4j_graphql_py import make_executable_schema, cypher_query
 from tests.helpers.cypher_test_helpers import run_test, augmented_schema_cypher_test_runner
 
 
@@ -9,6 +13,11 @@ class TestSchema(unittest.TestCase):
         if results.errors is not None:
             raise results.errors[0]
 
+    def parameterized_cypher_test(self, graphql_query, expected_cypher_query, expected_cypher_params, params=None):
+        results = run_test(self, graphql_query, expected_cypher_query, params, expected_cypher_params)
+        if results.errors is not None:
+            raise results.errors[0]
+
     def augmented_schema_test(self, graphql_query, expected_cypher_query, params=None):
         results = augmented_schema_cypher_test_runner(self, graphql_query, expected_cypher_query, params)
         if results.errors is not None:
@@ -596,6 +605,110 @@ class TestSchema(unittest.TestCase):
         self.cypher_test(graphql_query, expected_cypher_query)
         self.augmented_schema_test(graphql_query, expected_cypher_query)
 
+    def test_parameterized_query(self):
+        graphql_query = '''
+        {
+            Movie(title: "River Runs Through It, A", _id: 0, first: 1) {
+                title
+                actors(name: "Tom Hanks", first: 3) {
+                    name
+                }
+                similar(first: 3) {
+                    title
+                    scaleRating
+                }
+            }
+        }
+        '''
+        expected_cypher_query = ('MATCH (movie:Movie {title: $title}) WHERE ID(movie)=$_id RETURN movie { .title ,'
+                                 'actors: [(movie)<-[:ACTED_IN]-(movie_actors:Actor {name: $movie_actors_name}) | '
+                                 'movie_actors { .name }][..$movie_actors_slice_first] ,similar: [ movie_similar IN '
+                                 'apoc.cypher.runFirstColumn("WITH {this} AS this MATCH (this)--(:Genre)--(o:Movie) '
+                                 'RETURN o", {this: movie, first: $movie_similar_first, offset: $movie_similar_offset}, '
+                                 'true) | movie_similar { .title ,scaleRating: apoc.cypher.runFirstColumn("WITH $this '
+                                 'AS this RETURN $scale * this.imdbRating", {this: movie_similar, '
+                                 'scale: $movie_similar_scaleRating_scale}, false)}][..$movie_similar_slice_first] } '
+                                 'AS movie SKIP $offset LIMIT $first')
+        expected_cypher_params = {'title': 'River Runs Through It, A', '_id': 0, 'offset': 0, 'first': 1,
+                                  'movie_actors_name': 'Tom Hanks', 'movie_actors_slice_first': 3,
+                                  'movie_similar_first': 3, 'movie_similar_offset': 0, 'movie_similar_slice_first': 3,
+                                  'movie_similar_scaleRating_scale': 3}
+        self.parameterized_cypher_test(graphql_query, expected_cypher_query, expected_cypher_params)
+
+    def test_parameterized_cypher_directive_on_query_type(self):
+        graphql_query = '''
+        {
+            GenresBySubstring(substring:"Action") {
+                name
+            }
+        }
+        '''
+        expected_cypher_query = ('WITH apoc.cypher.runFirstColumn("MATCH (g:Genre) WHERE toLower(g.name) '
+                                 'CONTAINS toLower($substring) RETURN g", {substring: $substring}, true) AS x '
+                                 'UNWIND x AS genre RETURN genre { .name } AS genre SKIP $offset')
+        self.parameterized_cypher_test(graphql_query, expected_cypher_query, {'substring': 'Action', 'offset': 0})
+
+    def test_parameterized_create_node_mutation(self):
+        graphql_query = '''
+        mutation someMutation {
+            CreateMovie(movieId: "12dd334d5", title:"My Super Awesome Movie") {
+                _id
+                title
+            }
+        }
+        '''
+        expected_cypher_query = 'CREATE (movie:Movie) SET movie = $params RETURN movie {_id: ID(movie), .title } AS movie'
+        self.parameterized_cypher_test(graphql_query, expected_cypher_query,
+                                       {'params': {'movieId': '12dd334d5', 'title': 'My Super Awesome Movie'}})
+
+    def test_parameterized_add_relation_mutation(self):
+        graphql_query = '''
+        mutation someMutation {
+            AddMovieGenre(moviemovieId:"123", genrename: "Action") {
+                title
+            }
+        }
+        '''
+        expected_cypher_query = ('MATCH (movie:Movie {movieId: $moviemovieId}) '
+                                 'MATCH (genre:Genre {name: $genrename}) '
+                                 'CREATE (movie)-[:IN_GENRE]->(genre) '
+                                 'RETURN movie { .title } AS movie')
+        self.parameterized_cypher_test(graphql_query, expected_cypher_query,
+                                       {'moviemovieId': '123', 'genrename': 'Action'})
+
+    def test_parameterized_colliding_param_names(self):
+        # the slice of actors and the argument of actors_slice are both named movie_actors_slice_first
+        type_defs = '''
+        type Movie {
+            title: String
+            actors(first: Int): [Actor] @relation(name: "ACTED_IN", direction: "IN")
+            actors_slice(first: Int): [Actor] @cypher(statement: "MATCH (this)<-[:ACTED_IN]-(a:Actor) RETURN a LIMIT $first")
+        }
+        type Actor {
+            name: String
+        }
+        type Query {
+            Movie(title: String): [Movie]
+        }
+        '''
+        queries = []
+
+        def resolve(_, info, **kwargs):
+            queries.append(cypher_query(info.context, info, parameterized=True, **kwargs))
+
+        schema = make_executable_schema(type_defs, {'Query': {'Movie': resolve}})
+        result = graphql_sync(schema, '{ Movie { actors(first: 1) { name } actors_slice(first: 5) { name } } }',
+                              context_value={})
+        self.assertIsNone(result.errors)
+        query, params = queries[0]
+        self.assertEqual('MATCH (movie:Movie {}) RETURN movie {actors: [(movie)<-[:ACTED_IN]-(movie_actors:Actor {}) | '
+                         'movie_actors { .name }][..$movie_actors_slice_first] ,actors_slice: [ movie_actors_slice IN '
+                         'apoc.cypher.runFirstColumn("MATCH (this)<-[:ACTED_IN]-(a:Actor) RETURN a LIMIT $first", '
+                         '{this: movie, first: $movie_actors_slice_first_2}, true) | movie_actors_slice { .name }]'
+                         '[..$movie_actors_slice_slice_first] } AS movie SKIP $offset', query)
+        self.assertEqual({'movie_actors_slice_first': 1, 'movie_actors_slice_first_2': 5,
+                          'movie_actors_slice_slice_first': 5, 'offset': 0}, params)
+
 
 if __name__ == '__main__':
     unittest.main()
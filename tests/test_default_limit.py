@@ -0,0 +1,92 @@
+import unittest
+
+from graphql import graphql_sync
+
+from tests.helpers.schema import test_schema
+from neo4j_graphql_py import make_executable_schema, cypher_query, estimate_query_cost
+
+
+def translate(graphql_query, context, parameterized=False):
+    queries = []
+
+    def resolve(_, info, **kwargs):
+        queries.append(cypher_query(info.context, info, parameterized=parameterized, **kwargs))
+
+    schema = make_executable_schema(test_schema, {'Query': {'Movie': resolve, 'MovieById': resolve}})
+    result = graphql_sync(schema, graphql_query, context_value=context)
+    if result.errors:
+        raise result.errors[0]
+    return queries[0]
+
+
+class TestDefaultLimit(unittest.TestCase):
+    query = '{ Movie(title: "River Runs Through It, A") { title actors { name movies { title } } genres { name } } }'
+
+    def test_no_default_limit(self):
+        self.assertEqual(
+            'MATCH (movie:Movie {title: "River Runs Through It, A"}) RETURN movie { .title ,'
+            'actors: [(movie)<-[:ACTED_IN]-(movie_actors:Actor {}) | movie_actors { .name ,'
+            'movies: [(movie_actors)-[:ACTED_IN]->(movie_actors_movies:Movie {}) | movie_actors_movies { .title }] }] ,'
+            'genres: [(movie)-[:IN_GENRE]->(movie_genres:Genre {}) | movie_genres { .name }] } AS movie SKIP 0',
+            translate(self.query, {}))
+
+    def test_global_default_limit(self):
+        # the schema default of first on actors (3) takes precedence over the global page size
+        self.assertEqual(
+            'MATCH (movie:Movie {title: "River Runs Through It, A"}) RETURN movie { .title ,'
+            'actors: [(movie)<-[:ACTED_IN]-(movie_actors:Actor {}) | movie_actors { .name ,'
+            'movies: [(movie_actors)-[:ACTED_IN]->(movie_actors_movies:Movie {}) | movie_actors_movies { .title }][..20] }]'
+            '[..3] ,genres: [(movie)-[:IN_GENRE]->(movie_genres:Genre {}) | movie_genres { .name }][..20] } AS movie '
+            'SKIP 0 LIMIT 20',
+            translate(self.query, {'default_limit': 20}))
+
+    def test_per_type_and_field_default_limit(self):
+        limits = {'*': 50, 'Genre': 5, 'Actor.movies': None, 'Query.Movie': 10}
+        self.assertEqual(
+            'MATCH (movie:Movie {title: "River Runs Through It, A"}) RETURN movie { .title ,'
+            'actors: [(movie)<-[:ACTED_IN]-(movie_actors:Actor {}) | movie_actors { .name ,'
+            'movies: [(movie_actors)-[:ACTED_IN]->(movie_actors_movies:Movie {}) | movie_actors_movies { .title }] }]'
+            '[..3] ,genres: [(movie)-[:IN_GENRE]->(movie_genres:Genre {}) | movie_genres { .name }][..5] } AS movie '
+            'SKIP 0 LIMIT 10',
+            translate(self.query, {'default_limit': limits}))
+
+    def test_explicit_first_overrides_default_limit(self):
+        query, params = translate('{ Movie(first: 2) { title actors(first: 1) { name } } }', {'default_limit': 20},
+                                  parameterized=True)
+        self.assertEqual(
+            'MATCH (movie:Movie {}) RETURN movie { .title ,actors: [(movie)<-[:ACTED_IN]-(movie_actors:Actor {}) | '
+            'movie_actors { .name }][..$movie_actors_slice_first] } AS movie SKIP $offset LIMIT $first', query)
+        self.assertEqual({'movie_actors_slice_first': 1, 'offset': 0, 'first': 2}, params)
+
+    def test_parameterized_default_limit_of_cypher_field(self):
+        # the page size of similar is passed apart from its first argument, which keeps the schema default of 3
+        query, params = translate('{ Movie { similar { title } } }', {'default_limit': {'Movie.similar': 10}},
+                                  parameterized=True)
+        self.assertEqual(
+            'MATCH (movie:Movie {}) RETURN movie {similar: [ movie_similar IN apoc.cypher.runFirstColumn('
+            '"WITH {this} AS this MATCH (this)--(:Genre)--(o:Movie) RETURN o", {this: movie, '
+            'first: $movie_similar_first, offset: $movie_similar_offset}, true) | movie_similar { .title }]'
+            '[..$movie_similar_slice_first] } AS movie SKIP $offset', query)
+        self.assertEqual({'movie_similar_first': 3, 'movie_similar_offset': 0, 'movie_similar_slice_first': 10,
+                          'offset': 0}, params)
+
+    def test_default_limit_is_part_of_the_plan_key(self):
+        self.assertTrue(translate(self.query, {'default_limit': 20}).endswith('LIMIT 20'))
+        self.assertTrue(translate(self.query, {'default_limit': 30}).endswith('LIMIT 30'))
+        self.assertTrue(translate(self.query, {}).endswith('SKIP 0'))
+
+    def test_estimate_uses_default_limit(self):
+        costs = []
+
+        def resolve(_, info, **kwargs):
+            costs.append(estimate_query_cost(info, info.field_nodes[0], 10, {'*': 5}))
+
+        schema = make_executable_schema(test_schema, {'Query': {'Movie': resolve, 'MovieById': resolve}})
+        graphql_sync(schema, '{ Movie { title actors { name movies { title } } } }')
+
+        # per movie: 3 actors (the default of first) and 5 movies per actor
+        self.assertEqual((190, 19), costs[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
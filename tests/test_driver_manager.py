@@ -0,0 +1,60 @@
+import unittest
+from unittest import mock
+
+from graphql import graphql_sync
+from neo4j.exceptions import ClientError
+
+from tests.helpers.cypher_test_helpers import mock_driver
+from tests.helpers.schema import test_schema
+from neo4j_graphql_py import make_executable_schema, augment_schema, DriverManager, TimingInstrumentation
+
+
+class TestDriverManager(unittest.TestCase):
+
+    def setUp(self):
+        self.schema = augment_schema(make_executable_schema(test_schema, {}))
+        self.driver = mock_driver()
+        self.session = self.driver.session.return_value
+        self.session.run.return_value.value.return_value = [{'title': 'Top Gun'}]
+        patcher = mock.patch('neo4j_graphql_py.driver_manager.GraphDatabase.driver', return_value=self.driver)
+        self.graph_database_driver = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_driver_is_built_with_pool_settings(self):
+        with DriverManager('neo4j://localhost:7687', auth=('neo4j', 'secret'), max_connection_pool_size=10):
+            pass
+
+        self.graph_database_driver.assert_called_once_with(
+            'neo4j://localhost:7687', auth=('neo4j', 'secret'), max_connection_pool_size=10,
+            connection_acquisition_timeout=5.0, max_connection_lifetime=3600)
+        self.driver.close.assert_called_once_with()
+
+    def test_pool_gauges_are_recorded(self):
+        manager = DriverManager('neo4j://localhost:7687')
+        instrumentation = TimingInstrumentation()
+        result = graphql_sync(self.schema, '{ Movie { title } }',
+                              context_value={'driver': manager, 'instrumentation': instrumentation})
+
+        self.assertEqual({'Movie': [{'title': 'Top Gun'}]}, result.data)
+        summary = instrumentation.summary()
+        self.assertEqual(1, summary['pool_wait_ms']['count'])
+        self.assertEqual({'count': 1, 'total': 1}, summary['pool_in_use'])
+        gauges = manager.gauges()
+        self.assertEqual((0, 1, 0, 1, 0), (gauges['in_use'], gauges['peak_in_use'], gauges['waiting'],
+                                           gauges['acquisitions'], gauges['acquisition_timeouts']))
+
+    def test_acquisition_timeouts_are_counted(self):
+        self.session.read_transaction.side_effect = ClientError('Failed to obtain a connection from pool within 5.0s')
+        manager = DriverManager('neo4j://localhost:7687')
+        instrumentation = TimingInstrumentation()
+        result = graphql_sync(self.schema, '{ Movie { title } }',
+                              context_value={'driver': manager, 'instrumentation': instrumentation})
+
+        self.assertIsNotNone(result.errors)
+        self.assertEqual({'count': 1, 'total': 1}, instrumentation.summary()['pool_acquisition_timeout'])
+        self.assertEqual((1, 0, 0), tuple(manager.gauges()[name] for name in
+                                          ('acquisition_timeouts', 'waiting', 'in_use')))
+
+
+if __name__ == '__main__':
+    unittest.main()
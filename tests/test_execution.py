@@ -0,0 +1,134 @@
+import unittest
+from unittest import mock
+
+from graphql import graphql_sync
+
+from tests.helpers.cypher_test_helpers import mock_driver
+from tests.helpers.schema import test_schema
+from neo4j_graphql_py import (make_executable_schema, augment_schema, neo4j_graphql, neo4j_resolver,
+                              SingleStatementExecutionContext, PreShapedExecutionContext)
+
+
+class FakeResult:
+    def __init__(self, records):
+        self.records = records
+
+    def data(self):
+        return self.records
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def run(self, query, parameters=None):
+        self.driver.queries.append((query, parameters))
+        return FakeResult(self.driver.records)
+
+    def read_transaction(self, transaction_function, *args):
+        return transaction_function(self, *args)
+
+
+class FakeDriver:
+    def __init__(self, records):
+        self.records = records
+        self.queries = []
+
+    def session(self, **config):
+        return FakeSession(self)
+
+
+class TestSingleStatementExecution(unittest.TestCase):
+
+    def test_root_fields_are_compiled_into_one_statement(self):
+        @neo4j_resolver
+        def resolve(obj, info, **kwargs):
+            return neo4j_graphql(obj, info.context, info, **kwargs)
+
+        schema = make_executable_schema(test_schema, {'Query': {'Movie': resolve, 'MovieById': resolve,
+                                                                'GenresBySubstring': resolve}})
+        driver = FakeDriver([{'_root0': [{'title': 'Top Gun'}], '_root1': [], '_root2': [{'name': 'Action'}]}])
+        graphql_query = '''
+        {
+            Movie(title: "Top Gun") {
+                title
+            }
+            missing: MovieById(movieId: "18") {
+                title
+            }
+            GenresBySubstring(substring: "Action") {
+                name
+            }
+        }
+        '''
+        result = graphql_sync(schema, graphql_query, context_value={'driver': driver},
+                              execution_context_class=SingleStatementExecutionContext)
+
+        self.assertIsNone(result.errors)
+        self.assertEqual({'Movie': [{'title': 'Top Gun'}], 'missing': None, 'GenresBySubstring': [{'name': 'Action'}]},
+                         result.data)
+        self.assertEqual(1, len(driver.queries))
+        statement, params = driver.queries[0]
+        self.assertEqual('CALL { CALL { MATCH (movie:Movie {title: $_root0_title}) RETURN movie { .title } AS movie '
+                         'SKIP $_root0_offset } RETURN collect(movie) AS _root0 } '
+                         'CALL { CALL { MATCH (movie:Movie {movieId: $_root1_movieId}) RETURN movie { .title } '
+                         'AS movie SKIP $_root1_offset } RETURN collect(movie) AS _root1 } '
+                         'CALL { CALL { WITH apoc.cypher.runFirstColumn("MATCH (g:Genre) WHERE toLower(g.name) '
+                         'CONTAINS toLower($substring) RETURN g", {substring: $_root2_substring}, true) AS x '
+                         'UNWIND x AS genre RETURN genre { .name } AS genre SKIP $_root2_offset } '
+                         'RETURN collect(genre) AS _root2 } RETURN _root0, _root1, _root2', statement)
+        self.assertEqual({'_root0_title': 'Top Gun', '_root0_offset': 0, '_root1_movieId': '18', '_root1_offset': 0,
+                          '_root2_substring': 'Action', '_root2_offset': 0}, params)
+
+
+class TestPreShapedExecution(unittest.TestCase):
+
+    def execute(self, schema, graphql_query, rows, execution_context_class=None):
+        driver = mock_driver()
+        driver.session.return_value.run.return_value.value.return_value = rows
+        return graphql_sync(schema, graphql_query, context_value={'driver': driver},
+                            execution_context_class=execution_context_class)
+
+    def test_projected_result_is_copied(self):
+        schema = augment_schema(make_executable_schema(test_schema, {}))
+        graphql_query = '{ Movie { title name: title __typename genres { name } } }'
+        rows = [{'title': 'Top Gun', 'genres': [{'name': 'Action'}, {'name': 'Drama'}]}]
+
+        # no object is completed field by field
+        with mock.patch.object(PreShapedExecutionContext, 'complete_object_value', side_effect=AssertionError):
+            result = self.execute(schema, graphql_query, rows, PreShapedExecutionContext)
+
+        self.assertIsNone(result.errors)
+        self.assertEqual({'Movie': [{'title': 'Top Gun', 'name': 'Top Gun', '__typename': 'Movie',
+                                     'genres': [{'name': 'Action'}, {'name': 'Drama'}]}]}, result.data)
+        self.assertEqual(self.execute(schema, graphql_query, rows).data, result.data)
+
+    def test_fields_with_resolvers_are_resolved(self):
+        schema = augment_schema(make_executable_schema(
+            test_schema, {'Movie': {'title': lambda movie, info: movie['title'].upper()}}))
+
+        result = self.execute(schema, '{ Movie { title } }', [{'title': 'Top Gun'}], PreShapedExecutionContext)
+
+        self.assertEqual({'Movie': [{'title': 'TOP GUN'}]}, result.data)
+
+    def test_errors_are_reported_in_place(self):
+        schema = augment_schema(make_executable_schema(test_schema, {}))
+        graphql_query = '{ GenresBySubstring(substring: "Action") { _id name } }'
+        rows = [{'_id': '1', 'name': 'Action'}, {'_id': None, 'name': 'Drama'}]
+
+        result = self.execute(schema, graphql_query, rows, PreShapedExecutionContext)
+        expected = self.execute(schema, graphql_query, rows)
+
+        self.assertEqual({'GenresBySubstring': [{'_id': '1', 'name': 'Action'}, None]}, result.data)
+        self.assertEqual(expected.data, result.data)
+        self.assertEqual([error.path for error in expected.errors], [error.path for error in result.errors])
+
+
+if __name__ == '__main__':
+    unittest.main()
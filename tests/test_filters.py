@@ -0,0 +1,96 @@
+import unittest
+
+from graphql import graphql_sync
+
+from tests.helpers.schema import test_schema
+from neo4j_graphql_py import make_executable_schema, augment_schema, cypher_query
+
+
+def translate(graphql_query, variables=None, parameterized=False):
+    queries = []
+
+    def resolve(_, info, **kwargs):
+        queries.append(cypher_query(info.context, info, parameterized=parameterized, **kwargs))
+
+    schema = augment_schema(make_executable_schema(test_schema, {}))
+    for field in schema.query_type.fields.values():
+        field.resolve = resolve
+    result = graphql_sync(schema, graphql_query, variable_values=variables, context_value={})
+    if result.errors:
+        raise result.errors[0]
+    return queries[0]
+
+
+class TestFilters(unittest.TestCase):
+
+    def test_root_filter_and_order(self):
+        self.assertEqual(
+            'MATCH (movie:Movie {}) WHERE movie.title CONTAINS "River" AND movie.year > 2000 '
+            'WITH movie ORDER BY movie.year DESC, movie.title ASC RETURN movie { .title } AS movie SKIP 0 LIMIT 2',
+            translate('{ Movie(first: 2, filter: {year_gt: 2000, title_contains: "River"}, '
+                      'orderBy: [year_desc, title_asc]) { title } }'))
+
+    def test_root_filter_parameterized(self):
+        query, params = translate('query($filter: _MovieFilter) { MoviesByYear(year: 2010, filter: $filter) { title } }',
+                                  {'filter': {'OR': [{'title_starts_with': 'The'}, {'imdbRating_lt': 5}]}},
+                                  parameterized=True)
+        self.assertEqual(
+            'MATCH (movie:Movie {year: $year}) WHERE ((movie.title STARTS WITH $filter_OR_0_title_starts_with) OR '
+            '(movie.imdbRating < $filter_OR_1_imdbRating_lt)) RETURN movie { .title } AS movie SKIP $offset', query)
+        self.assertEqual({'year': 2010, 'offset': 0, 'filter_OR_0_title_starts_with': 'The',
+                          'filter_OR_1_imdbRating_lt': 5.0}, params)
+
+    def test_enum_filter(self):
+        self.assertEqual(
+            'MATCH (book:Book {}) WHERE book.genre IN ["Math", "Science"] RETURN book { .genre } AS book SKIP 0',
+            translate('{ Books(filter: {genre_in: [Math, Science]}) { genre } }'))
+
+    def test_enum_values_of_extended_schema_are_left_unchanged(self):
+        schema = make_executable_schema(test_schema, {})
+        augmented = augment_schema(schema)
+
+        book_genre = augmented.get_type('BookGenre')
+        self.assertIsNone(schema.get_type('BookGenre').values['Math'].value)
+        self.assertEqual('Math', book_genre.values['Math'].value)
+        self.assertIs(book_genre, augmented.get_type('_BookFilter').fields['genre'].type)
+        self.assertIs(book_genre, augmented.get_type('Book').fields['genre'].type)
+        self.assertEqual('title_asc', augmented.get_type('_MovieOrdering').values['title_asc'].value)
+
+    def test_null_filter(self):
+        self.assertEqual(
+            'MATCH (book:Book {}) WHERE book.genre IS NULL RETURN book { .genre } AS book SKIP 0',
+            translate('{ Books(filter: {genre: null}) { genre } }'))
+
+    def test_nested_filter(self):
+        self.assertEqual(
+            'MATCH (movie:Movie {}) RETURN movie { .title ,actors: [(movie)<-[:ACTED_IN]-(movie_actors:Actor {}) '
+            'WHERE movie_actors.name IN ["Tom Hanks", "Meg Ryan"] | movie_actors { .name }] } AS movie SKIP 0',
+            translate('{ Movie { title actors(filter: {name_in: ["Tom Hanks", "Meg Ryan"]}) { name } } }'))
+
+    def test_nested_filter_and_order(self):
+        query, params = translate(
+            'query($name: String) { Movie { title genres(filter: {AND: [{name_gt: "A"}, {name_lt: $name}]}, '
+            'orderBy: [name_desc]) { name } } }', {'name': 'M'}, parameterized=True)
+        self.assertEqual(
+            'MATCH (movie:Movie {}) RETURN movie { .title ,genres: [movie_genres IN apoc.coll.sortNodes('
+            '[(movie)-[:IN_GENRE]->(movie_genres:Genre {}) WHERE ((movie_genres.name > $movie_genres_filter_AND_0_name_gt) '
+            'AND (movie_genres.name < $movie_genres_filter_AND_1_name_lt)) | movie_genres], \'name\') | '
+            'movie_genres { .name }] } AS movie SKIP $offset', query)
+        self.assertEqual({'movie_genres_filter_AND_0_name_gt': 'A', 'movie_genres_filter_AND_1_name_lt': 'M',
+                          'offset': 0}, params)
+
+    def test_nested_filter_variables_are_part_of_the_plan_key(self):
+        query = 'query($name: String) { Movie { actors(filter: {name: $name}) { name } } }'
+        self.assertIn('movie_actors.name = "A"', translate(query, {'name': 'A'}))
+        self.assertIn('movie_actors.name = "B"', translate(query, {'name': 'B'}))
+
+    def test_connection_filter(self):
+        query = translate('{ MovieConnection(first: 1, filter: {year: 2000}) { edges { node { title '
+                          'actorsConnection(filter: {name: "Tom Hanks"}) { edges { cursor } } } } } }')
+        self.assertTrue(query.startswith('MATCH (movie:Movie {}) WHERE movie.year = 2000 WITH movie'))
+        self.assertIn('"MATCH (this)<-[:ACTED_IN]-(node:Actor) WHERE node.name = $filter_name '
+                      'RETURN node ORDER BY node.id ASC", {this: movie, filter_name: "Tom Hanks"}, true)', query)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import unittest
+
+from graphql import graphql, graphql_sync
+
+from tests.helpers.schema import test_schema
+from neo4j_graphql_py import make_executable_schema, neo4j_graphql, neo4j_graphql_async, TimingInstrumentation
+
+
+class FakeSummary:
+    result_available_after = 3
+    result_consumed_after = 2
+
+
+class FakeResult:
+    def __init__(self, records):
+        self.records = records
+        self.consumed = False
+
+    def value(self, key=0):
+        return [record.get(key) for record in self.records]
+
+    def consume(self):
+        self.consumed = True
+        return FakeSummary()
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def run(self, query, parameters=None):
+        result = FakeResult([{'movie': {'title': 'Top Gun'}}])
+        self.driver.results.append(result)
+        return result
+
+    def read_transaction(self, transaction_function, *args):
+        return transaction_function(self, *args)
+
+
+class RetryingSession(FakeSession):
+    def read_transaction(self, transaction_function, *args):
+        # the first attempt fails with a transient error once its result has been read
+        transaction_function(self, *args)
+        return transaction_function(self, *args)
+
+
+class FakeDriver:
+    def __init__(self, session_class=FakeSession):
+        self.results = []
+        self.session_class = session_class
+
+    def session(self, **config):
+        return self.session_class(self)
+
+
+class FakeAsyncResult(FakeResult):
+    async def value(self, key=0):
+        return FakeResult.value(self, key)
+
+    async def consume(self):
+        return FakeResult.consume(self)
+
+
+class FakeAsyncSession(FakeSession):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def run(self, query, parameters=None):
+        result = FakeAsyncResult([{'movie': {'title': 'Top Gun'}}])
+        self.driver.results.append(result)
+        return result
+
+    async def read_transaction(self, transaction_function, *args):
+        return await transaction_function(self, *args)
+
+
+def resolve(obj, info, **kwargs):
+    return neo4j_graphql(obj, info.context, info, **kwargs)
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.schema = make_executable_schema(test_schema, {'Query': {'Movie': resolve}})
+
+    def test_phases_are_timed(self):
+        instrumentation = TimingInstrumentation()
+        driver = FakeDriver()
+        result = graphql_sync(self.schema, '{ Movie(title: "Top Gun") { title } }',
+                              context_value={'driver': driver, 'instrumentation': instrumentation})
+
+        self.assertIsNone(result.errors)
+        self.assertEqual(['extract_selections', 'generate_cypher', 'driver_checkout', 'execute', 'extract_result',
+                          'neo4j_graphql'], [name for name, *_ in instrumentation.spans])
+        summary = instrumentation.summary()
+        self.assertEqual({'count': 1, 'total': 5}, summary['server_time_ms'])
+        self.assertEqual(1, summary['execute']['count'])
+        self.assertIsInstance(summary['execute']['allocated_blocks'], int)
+        self.assertEqual({'field': 'Movie'}, instrumentation.spans[-1][3])
+
+    def test_server_time_is_recorded_once_per_transaction(self):
+        instrumentation = TimingInstrumentation()
+        driver = FakeDriver(RetryingSession)
+        result = graphql_sync(self.schema, '{ Movie(title: "Top Gun") { title } }',
+                              context_value={'driver': driver, 'instrumentation': instrumentation})
+
+        self.assertIsNone(result.errors)
+        self.assertEqual(2, len(driver.results))
+        self.assertEqual({'count': 1, 'total': 5}, instrumentation.summary()['server_time_ms'])
+
+    def test_server_time_is_recorded_by_async_resolvers(self):
+        async def resolve_async(obj, info, **kwargs):
+            return await neo4j_graphql_async(obj, info.context, info, **kwargs)
+
+        instrumentation = TimingInstrumentation()
+        schema = make_executable_schema(test_schema, {'Query': {'Movie': resolve_async}})
+        result = asyncio.run(graphql(schema, '{ Movie(title: "Top Gun") { title } }', context_value={
+            'driver': FakeDriver(FakeAsyncSession), 'instrumentation': instrumentation}))
+
+        self.assertIsNone(result.errors)
+        self.assertEqual({'count': 1, 'total': 5}, instrumentation.summary()['server_time_ms'])
+
+    def test_no_instrumentation_by_default(self):
+        driver = FakeDriver()
+        result = graphql_sync(self.schema, '{ Movie(title: "Top Gun") { title } }', context_value={'driver': driver})
+
+        self.assertIsNone(result.errors)
+        self.assertFalse(driver.results[0].consumed)
+
+    def test_logger_is_left_to_the_application(self):
+        logger = logging.getLogger('neo4j_graphql_py')
+
+        self.assertEqual(logging.NOTSET, logger.level)
+        self.assertEqual([logging.NullHandler], [type(handler) for handler in logger.handlers])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from graphql import graphql_sync
+
+from tests.helpers.cypher_test_helpers import translate_mutation, augmented_schema
+from neo4j_graphql_py import make_executable_schema, augment_schema, cypher_mutation
+
+
+class TestKeyedMutations(unittest.TestCase):
+
+    def test_merge(self):
+        query, params = translate_mutation('mutation { MergeActor(id: "a1", name: "Tom Hanks") { id name } }',
+                                           parameterized=True)
+        self.assertEqual('MERGE (actor:Actor {id: $params.id}) SET actor += $params '
+                         'RETURN actor { .id , .name } AS actor', query)
+        self.assertEqual({'params': {'id': 'a1', 'name': 'Tom Hanks'}}, params)
+
+    def test_merge_is_not_generated_for_internal_ids(self):
+        mutations = augmented_schema().mutation_type.fields
+        self.assertNotIn('MergeMovie', mutations)
+        self.assertIn('UpdateMovie', mutations)
+
+    def test_update(self):
+        self.assertEqual(
+            'MATCH (state:State {name: $params.name}) SET state += $params RETURN state { .name } AS state',
+            translate_mutation('mutation { UpdateState(name: "Ohio") { name } }'))
+
+    def test_update_by_internal_id(self):
+        self.assertEqual(
+            "MATCH (movie:Movie) WHERE ID(movie) = toInteger($params._id) SET movie += apoc.map.removeKey($params, '_id') "
+            "RETURN movie { .title } AS movie",
+            translate_mutation('mutation { UpdateMovie(_id: "42", title: "Heat") { title } }'))
+
+    def test_parameterized_update_and_delete_by_internal_id(self):
+        _, params = translate_mutation('mutation { UpdateMovie(_id: "42", title: "Heat") { title } }',
+                                       parameterized=True)
+        self.assertEqual({'params': {'_id': '42', 'title': 'Heat'}}, params)
+
+        query, params = translate_mutation('mutation($id: ID!) { DeleteMovie(_id: $id) { title } }', {'id': '42'},
+                                           parameterized=True)
+        self.assertEqual('MATCH (movie:Movie) WHERE ID(movie) = toInteger($params._id) '
+                         'WITH movie, movie { .title } AS movie_projection '
+                         'DETACH DELETE movie RETURN movie_projection AS movie', query)
+        self.assertEqual({'params': {'_id': '42'}}, params)
+
+    def test_delete(self):
+        self.assertEqual(
+            'MATCH (actor:Actor {id: $params.id}) WITH actor, actor { .name } AS actor_projection '
+            'DETACH DELETE actor RETURN actor_projection AS actor',
+            translate_mutation('mutation { DeleteActor(id: "a1") { name } }'))
+
+    def test_user_defined_mutation_is_not_keyed(self):
+        # named like a generated mutation, but not generated
+        type_defs = '''
+        type Actor { id: ID! name: String }
+        type Query { Actor: [Actor] }
+        type Mutation { UpdateActorName(id: ID!, name: String): Actor }
+        '''
+
+        def resolve(_, info, **kwargs):
+            return cypher_mutation(info.context, info, **kwargs)
+
+        schema = augment_schema(make_executable_schema(type_defs, {'Mutation': {'UpdateActorName': resolve}}))
+        result = graphql_sync(schema, 'mutation { UpdateActorName(id: "a1", name: "Tom") { name } }', context_value={})
+
+        self.assertEqual('Mutation does not follow naming conventions', result.errors[0].message)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+from graphql import graphql_sync
+
+from tests.helpers.schema import test_schema
+from neo4j_graphql_py import make_executable_schema, cypher_query
+from neo4j_graphql_py.cache import LRUCache, query_plan_cache
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_counters_and_eviction(self):
+        cache = LRUCache(max_size=2)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(1, cache.get('a'))
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual({'size': 2, 'max_size': 2, 'hits': 1, 'misses': 2, 'evictions': 1}, cache.stats())
+
+    def test_disabled_cache(self):
+        cache = LRUCache(max_size=0)
+        cache.put('a', 1)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(0, len(cache))
+
+
+class TestQueryPlanCache(unittest.TestCase):
+
+    def setUp(self):
+        self.queries = []
+
+        def resolve_query(_, info, **kwargs):
+            self.queries.append(cypher_query(info.context, info, **kwargs))
+
+        self.schema = make_executable_schema(test_schema, {'Query': {'Movie': resolve_query}})
+        query_plan_cache.clear()
+
+    def run_query(self, graphql_query, params=None):
+        result = graphql_sync(self.schema, graphql_query, variable_values=params)
+        if result.errors is not None:
+            raise result.errors[0]
+        return self.queries[-1]
+
+    def test_root_arguments_are_bound_on_hit(self):
+        graphql_query = '''
+        query ($title: String, $first: Int) {
+            Movie(title: $title, first: $first) {
+                title
+                actors {
+                    name
+                }
+            }
+        }
+        '''
+        self.run_query(graphql_query, {'title': 'Top Gun', 'first': 1})
+        query = self.run_query(graphql_query, {'title': 'River Runs Through It, A'})
+        self.assertEqual('MATCH (movie:Movie {title: "River Runs Through It, A"}) RETURN movie { .title ,'
+                         'actors: [(movie)<-[:ACTED_IN]-(movie_actors:Actor {}) | movie_actors { .name }] } '
+                         'AS movie SKIP 0', query)
+        self.assertEqual(1, query_plan_cache.hits)
+        self.assertEqual(1, query_plan_cache.misses)
+
+    def test_aliases_and_fragments_share_a_plan(self):
+        self.run_query('{ Movie(year: 2010) { title year } }')
+        query = self.run_query('''
+        fragment myTitle on Movie {
+            title
+        }
+        {
+            Movie(year: 2011) {
+                ...myTitle
+                released: year
+            }
+        }
+        ''')
+        self.assertEqual('MATCH (movie:Movie {year: 2011}) RETURN movie { .title , .year } AS movie SKIP 0', query)
+        self.assertEqual(1, query_plan_cache.hits)
+
+    def test_nested_arguments_are_part_of_the_key(self):
+        graphql_query = '''
+        query ($first: Int) {
+            Movie(year: 2010) {
+                similar(first: $first) {
+                    title
+                }
+            }
+        }
+        '''
+        self.run_query(graphql_query, {'first': 1})
+        query = self.run_query(graphql_query, {'first': 2})
+        self.assertIn('[..2]', query)
+        self.assertEqual(0, query_plan_cache.hits)
+        self.assertEqual(2, query_plan_cache.misses)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import shutil
+import tempfile
+import unittest
+
+from graphql import graphql_sync
+
+from tests.helpers.cypher_test_helpers import mock_driver
+from tests.helpers.schema import test_schema
+from neo4j_graphql_py import (make_executable_schema, augment_schema, ResultCache, MemoryBackend, FileBackend,
+                              OperationSession)
+from neo4j_graphql_py.result_cache import cypher_tags
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.schema = augment_schema(make_executable_schema(test_schema, {}))
+        self.driver = mock_driver()
+        self.run = self.driver.session.return_value.run
+        self.run.return_value.value.return_value = [{'title': 'Top Gun'}]
+
+    def execute(self, query, result_cache):
+        result = graphql_sync(self.schema, query, context_value={'driver': self.driver, 'result_cache': result_cache})
+        self.assertIsNone(result.errors)
+        return result.data
+
+    def test_cypher_tags(self):
+        self.assertEqual({'Movie', 'Genre', 'IN_GENRE', 'Actor', 'ACTED_IN', 'DIRECTED'}, cypher_tags(
+            'MATCH (movie:Movie) RETURN movie {genres: [(movie)-[:IN_GENRE]->(movie_genres:Genre) | movie_genres {.name}], '
+            'actors: [(movie)<-[:ACTED_IN|:DIRECTED]-(:Actor) | 1]} AS movie'))
+
+    def test_repeated_query_is_read_from_the_cache(self):
+        result_cache = ResultCache()
+        for _ in range(3):
+            self.assertEqual({'Movie': [{'title': 'Top Gun'}]}, self.execute('{ Movie { title } }', result_cache))
+
+        self.assertEqual(1, self.run.call_count)
+        self.assertEqual({'hits': 2, 'misses': 1}, result_cache.stats())
+
+    def test_mutation_invalidates_the_labels_it_touches(self):
+        result_cache = ResultCache()
+        self.execute('{ Movie { title } }', result_cache)
+        self.execute('mutation { CreateState(name: "Ohio") { name } }', result_cache)
+        self.execute('{ Movie { title } }', result_cache)
+        self.assertEqual(2, self.run.call_count)
+
+        self.execute('mutation { CreateMovie(title: "Heat") { title } }', result_cache)
+        self.execute('{ Movie { title } }', result_cache)
+        self.assertEqual(4, self.run.call_count)
+
+    def test_operation_session_bypasses_the_cache(self):
+        result_cache = ResultCache()
+        with OperationSession(self.driver) as neo4j_session:
+            for _ in range(2):
+                result = graphql_sync(self.schema, '{ Movie { title } }', context_value={
+                    'driver': self.driver, 'result_cache': result_cache, 'neo4j_session': neo4j_session})
+                self.assertIsNone(result.errors)
+
+        self.assertEqual(2, self.driver.session.return_value.begin_transaction.return_value.run.call_count)
+        self.assertEqual({'hits': 0, 'misses': 0}, result_cache.stats())
+
+    def test_mutation_on_operation_session_invalidates_on_commit(self):
+        result_cache = ResultCache()
+        self.execute('{ Movie { title } }', result_cache)
+        with OperationSession(self.driver) as neo4j_session:
+            result = graphql_sync(self.schema, 'mutation { CreateMovie(title: "Heat") { title } }', context_value={
+                'driver': self.driver, 'result_cache': result_cache, 'neo4j_session': neo4j_session})
+            self.assertIsNone(result.errors)
+            # not committed yet, the cached result is still the committed one
+            self.execute('{ Movie { title } }', result_cache)
+            self.assertEqual({'hits': 1, 'misses': 1}, result_cache.stats())
+
+        self.execute('{ Movie { title } }', result_cache)
+        self.assertEqual({'hits': 1, 'misses': 2}, result_cache.stats())
+
+    def test_rolled_back_mutation_does_not_invalidate(self):
+        result_cache = ResultCache()
+        self.execute('{ Movie { title } }', result_cache)
+        with OperationSession(self.driver) as neo4j_session:
+            graphql_sync(self.schema, 'mutation { CreateMovie(title: "Heat") { title } }', context_value={
+                'driver': self.driver, 'result_cache': result_cache, 'neo4j_session': neo4j_session})
+            neo4j_session.rollback()
+
+        self.execute('{ Movie { title } }', result_cache)
+        self.assertEqual({'hits': 1, 'misses': 1}, result_cache.stats())
+
+    def test_entries_expire(self):
+        result_cache = ResultCache(ttl=0)
+        self.execute('{ Movie { title } }', result_cache)
+        self.execute('{ Movie { title } }', result_cache)
+
+        self.assertEqual(2, self.run.call_count)
+
+    def test_size_is_bounded(self):
+        result_cache = ResultCache(MemoryBackend(max_size=1))
+        result_cache.fetch('MATCH (a:A) RETURN a', {}, lambda: 'a')
+        result_cache.fetch('MATCH (b:B) RETURN b', {}, lambda: 'b')
+
+        self.assertEqual('a2', result_cache.fetch('MATCH (a:A) RETURN a', {}, lambda: 'a2'))
+
+    def test_file_backend_is_shared(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        writer, reader = ResultCache(FileBackend(directory)), ResultCache(FileBackend(directory))
+        writer.fetch('MATCH (a:A) RETURN a', {'x': 1}, lambda: ['a'])
+
+        self.assertEqual(['a'], reader.fetch('MATCH (a:A) RETURN a', {'x': 1}, lambda: ['other']))
+        self.assertEqual(['other'], reader.fetch('MATCH (a:A) RETURN a', {'x': 2}, lambda: ['other']))
+        writer.invalidate('CREATE (a:A)')
+        self.assertEqual(['new'], reader.fetch('MATCH (a:A) RETURN a', {'x': 1}, lambda: ['new']))
+
+
+if __name__ == '__main__':
+    unittest.main()
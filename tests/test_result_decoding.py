@@ -0,0 +1,41 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from graphql import GraphQLList
+
+from tests.helpers.cypher_test_helpers import augmented_schema
+from tests.helpers.schema import test_schema
+from neo4j_graphql_py import make_executable_schema
+from neo4j_graphql_py.utils import extract_query_result
+
+
+class TestResultDecoding(unittest.TestCase):
+
+    def test_projected_column_is_read_without_record_dicts(self):
+        schema = make_executable_schema(test_schema, {})
+        result = mock.MagicMock()
+        result.value.return_value = [{'title': 'Top Gun'}]
+
+        self.assertEqual([{'title': 'Top Gun'}], extract_query_result(result, GraphQLList(schema.get_type('Movie'))))
+        self.assertEqual({'title': 'Top Gun'}, extract_query_result(result, schema.get_type('Movie')))
+        result.value.assert_called_with('movie')
+        result.data.assert_not_called()
+
+    def test_fields_resolve_with_key_lookups(self):
+        schema = make_executable_schema(test_schema, {})
+        resolve = schema.get_type('Movie').fields['title'].resolve
+        info = SimpleNamespace(field_name='title')
+
+        self.assertEqual('Top Gun', resolve({'title': 'Top Gun'}, info))
+        self.assertEqual('Heat', resolve(SimpleNamespace(title='Heat'), info))
+        self.assertIsNone(schema.query_type.fields['Movie'].resolve)
+
+    def test_generated_types_resolve_with_key_lookups(self):
+        resolve = augmented_schema().get_type('MovieConnection').fields['edges'].resolve
+
+        self.assertEqual([], resolve({'edges': []}, SimpleNamespace(field_name='edges')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+from graphql import graphql_sync
+
+from tests.helpers.schema import test_schema
+from neo4j_graphql_py import make_executable_schema, augment_schema
+
+
+class FakeResult:
+    def __init__(self, records):
+        self.records = records
+
+    def value(self, key=0):
+        return [record.get(key) for record in self.records]
+
+
+class FakeSession:
+    def __init__(self, driver, config):
+        self.driver = driver
+        self.config = config
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def read_transaction(self, transaction_function, *args):
+        self.driver.transactions.append(('read', self.config))
+        return transaction_function(self, *args)
+
+    def write_transaction(self, transaction_function, *args):
+        self.driver.transactions.append(('write', self.config))
+        return transaction_function(self, *args)
+
+    def run(self, query, parameters=None):
+        variable_name = query.split(' AS ')[-1].split(' ')[0]
+        return FakeResult([{variable_name: {'title': 'Top Gun', 'name': 'Ohio'}}])
+
+    def last_bookmark(self):
+        return 'bookmark:2'
+
+
+class FakeDriver:
+    def __init__(self):
+        self.transactions = []
+
+    def session(self, **config):
+        return FakeSession(self, config)
+
+
+class TestRouting(unittest.TestCase):
+
+    def setUp(self):
+        self.schema = augment_schema(make_executable_schema(test_schema, {}))
+        self.driver = FakeDriver()
+
+    def test_queries_read_and_mutations_write(self):
+        context = {'driver': self.driver}
+        graphql_sync(self.schema, '{ Movie { title } }', context_value=context)
+        graphql_sync(self.schema, 'mutation { CreateState(name: "Ohio") { name } }', context_value=context)
+
+        self.assertEqual([('read', {'default_access_mode': 'READ', 'bookmarks': None}),
+                          ('write', {'default_access_mode': 'WRITE', 'bookmarks': None})], self.driver.transactions)
+
+    def test_bookmarks_are_carried_in_the_context(self):
+        context = {'driver': self.driver, 'bookmarks': ['bookmark:1']}
+        graphql_sync(self.schema, 'mutation { CreateState(name: "Ohio") { name } }', context_value=context)
+        self.assertEqual(['bookmark:2'], context['bookmarks'])
+
+        graphql_sync(self.schema, '{ Movie { title } }', context_value=context)
+        self.assertEqual(['bookmark:1'], self.driver.transactions[0][1]['bookmarks'])
+        self.assertEqual(['bookmark:2'], self.driver.transactions[1][1]['bookmarks'])
+
+
+if __name__ == '__main__':
+    unittest.main()
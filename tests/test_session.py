@@ -0,0 +1,205 @@
+import asyncio
+import unittest
+
+from graphql import graphql_sync
+
+from tests.helpers.schema import test_schema
+from neo4j_graphql_py import make_executable_schema, augment_schema, OperationSession, AsyncOperationSession
+
+
+class FakeResult:
+    def __init__(self, records, error=None):
+        self.records = records
+        self.error = error
+
+    def value(self, key=0):
+        if self.error is not None:
+            raise self.error
+        return [record.get(key) for record in self.records]
+
+
+class FakeTransaction:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def run(self, query, parameters=None):
+        self.driver.queries.append(query)
+        if query.startswith('MATCH (movie:Movie {title: "Fail"})'):
+            raise RuntimeError('Neo.ClientError.Statement.SyntaxError')
+        if query.startswith('MATCH (movie:Movie {title: "Unreadable"})'):
+            # records are streamed, the error surfaces while they are read
+            return FakeResult([], RuntimeError('Neo.TransientError.General.DatabaseUnavailable'))
+        return FakeResult([{'movie': {'title': 'Top Gun'}}])
+
+    def commit(self):
+        self.driver.commits += 1
+
+    def rollback(self):
+        self.driver.rollbacks += 1
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def begin_transaction(self):
+        self.driver.transactions += 1
+        return FakeTransaction(self.driver)
+
+    def close(self):
+        self.driver.closed += 1
+
+
+class FakeDriver:
+    def __init__(self):
+        self.sessions = 0
+        self.transactions = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = 0
+        self.queries = []
+
+    def session(self, **config):
+        self.sessions += 1
+        return FakeSession(self)
+
+
+class TestOperationSession(unittest.TestCase):
+
+    def setUp(self):
+        self.schema = augment_schema(make_executable_schema(test_schema, resolvers=[]))
+        self.driver = FakeDriver()
+
+    def test_root_fields_share_one_transaction(self):
+        graphql_query = '''
+        {
+            a: MovieById(movieId: "1") { title }
+            b: MovieById(movieId: "2") { title }
+            c: Movie(year: 2010) { title }
+        }
+        '''
+        with OperationSession(self.driver) as neo4j_session:
+            result = graphql_sync(self.schema, graphql_query,
+                                  context_value={'driver': self.driver, 'neo4j_session': neo4j_session})
+
+        self.assertIsNone(result.errors)
+        self.assertEqual({'title': 'Top Gun'}, result.data['b'])
+        self.assertEqual(3, len(self.driver.queries))
+        self.assertEqual((1, 1, 1, 0, 1), (self.driver.sessions, self.driver.transactions, self.driver.commits,
+                                           self.driver.rollbacks, self.driver.closed))
+
+    def test_rollback_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with OperationSession(self.driver) as neo4j_session:
+                neo4j_session.run('CREATE (n)')
+                raise RuntimeError()
+
+        self.assertEqual((0, 1, 1), (self.driver.commits, self.driver.rollbacks, self.driver.closed))
+
+    def test_rollback_on_failed_query(self):
+        # the failed query is an error of the result, the block exits cleanly
+        with OperationSession(self.driver) as neo4j_session:
+            result = graphql_sync(self.schema, '{ a: MovieById(movieId: "1") { title } b: Movie(title: "Fail") { title } }',
+                                  context_value={'driver': self.driver, 'neo4j_session': neo4j_session})
+
+        self.assertEqual(1, len(result.errors))
+        self.assertEqual((0, 1, 1), (self.driver.commits, self.driver.rollbacks, self.driver.closed))
+
+    def test_rollback_on_failed_records(self):
+        with OperationSession(self.driver) as neo4j_session:
+            result = graphql_sync(self.schema, '{ Movie(title: "Unreadable") { title } }',
+                                  context_value={'driver': self.driver, 'neo4j_session': neo4j_session})
+
+        self.assertEqual(1, len(result.errors))
+        self.assertEqual((0, 1, 1), (self.driver.commits, self.driver.rollbacks, self.driver.closed))
+
+    def test_unused_session_is_never_opened(self):
+        with OperationSession(self.driver):
+            pass
+
+        self.assertEqual(0, self.driver.sessions)
+
+
+class FakeAsyncTransaction(FakeTransaction):
+    async def run(self, query, parameters=None):
+        return AsyncRecords(FakeTransaction.run(self, query, parameters).records)
+
+    async def commit(self):
+        FakeTransaction.commit(self)
+
+    async def rollback(self):
+        FakeTransaction.rollback(self)
+
+
+class AsyncRecords:
+    def __init__(self, records):
+        self.records = iter(records)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.records)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeAsyncSession(FakeSession):
+    async def begin_transaction(self):
+        self.driver.transactions += 1
+        return FakeAsyncTransaction(self.driver)
+
+    async def close(self):
+        FakeSession.close(self)
+
+
+class FakeAsyncDriver(FakeDriver):
+    def session(self, **config):
+        self.sessions += 1
+        return FakeAsyncSession(self)
+
+
+class TestAsyncOperationSession(unittest.TestCase):
+
+    def setUp(self):
+        self.driver = FakeAsyncDriver()
+
+    def test_commit(self):
+        # created outside of the event loop the operation runs on
+        neo4j_session = AsyncOperationSession(self.driver)
+
+        async def operation():
+            async with neo4j_session:
+                return await neo4j_session.run('MATCH (movie:Movie) RETURN movie')
+
+        self.assertEqual([{'movie': {'title': 'Top Gun'}}], asyncio.run(operation()))
+        self.assertEqual((1, 0, 1), (self.driver.commits, self.driver.rollbacks, self.driver.closed))
+
+    def test_run_outside_of_the_block(self):
+        neo4j_session = AsyncOperationSession(self.driver)
+
+        async def operation():
+            records = await neo4j_session.run('MATCH (movie:Movie) RETURN movie')
+            await neo4j_session.commit()
+            await neo4j_session.close()
+            return records
+
+        self.assertEqual([{'movie': {'title': 'Top Gun'}}], asyncio.run(operation()))
+        self.assertEqual((1, 0, 1), (self.driver.commits, self.driver.rollbacks, self.driver.closed))
+
+    def test_rollback_on_failed_query(self):
+        async def operation():
+            async with AsyncOperationSession(self.driver) as neo4j_session:
+                await neo4j_session.run('CREATE (n)')
+                try:
+                    await neo4j_session.run('MATCH (movie:Movie {title: "Fail"}) RETURN movie')
+                except RuntimeError:
+                    pass
+
+        asyncio.run(operation())
+        self.assertEqual((0, 1, 1), (self.driver.commits, self.driver.rollbacks, self.driver.closed))
+
+
+if __name__ == '__main__':
+    unittest.main()
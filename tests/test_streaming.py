@@ -0,0 +1,73 @@
+import types
+import unittest
+
+from graphql import graphql_sync
+
+from tests.helpers.schema import test_schema
+from neo4j_graphql_py import make_executable_schema, neo4j_graphql_stream, export_ndjson
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.driver.closed += 1
+        return False
+
+    def run(self, query, parameters=None):
+        self.driver.queries.append((query, parameters))
+        return iter(self.driver.records)
+
+
+class FakeDriver:
+    def __init__(self, records):
+        self.records = records
+        self.queries = []
+        self.fetch_sizes = []
+        self.closed = 0
+
+    def session(self, fetch_size=None, **config):
+        self.fetch_sizes.append(fetch_size)
+        return FakeSession(self)
+
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.driver = FakeDriver([{'movie': {'title': 'Top Gun', 'year': 1986}},
+                                  {'movie': {'title': 'Heat', 'year': 1995}}])
+        self.returned = []
+
+        def resolve(obj, info, **kwargs):
+            result = neo4j_graphql_stream(obj, info.context, info, fetch_size=50, **kwargs)
+            self.returned.append(result)
+            return result
+
+        self.schema = make_executable_schema(test_schema, {'Query': {'Movie': resolve}})
+
+    def test_list_field_is_streamed(self):
+        result = graphql_sync(self.schema, '{ Movie(year: 1986) { title } }', context_value={'driver': self.driver})
+
+        self.assertIsNone(result.errors)
+        self.assertEqual({'Movie': [{'title': 'Top Gun'}, {'title': 'Heat'}]}, result.data)
+        self.assertIsInstance(self.returned[0], types.GeneratorType)
+        self.assertEqual([50], self.driver.fetch_sizes)
+        self.assertEqual(1, self.driver.closed)
+
+    def test_export_ndjson(self):
+        lines = export_ndjson(self.schema, 'query ($year: Int) { Movie(year: $year) { title year } }',
+                              {'driver': self.driver}, {'year': 1986}, fetch_size=10)
+
+        self.assertEqual(0, len(self.driver.queries))
+        self.assertEqual(['{"title": "Top Gun", "year": 1986}\n', '{"title": "Heat", "year": 1995}\n'], list(lines))
+        self.assertEqual([('MATCH (movie:Movie {year: $year}) RETURN movie { .title , .year } AS movie SKIP $offset',
+                           {'year': 1986, 'offset': 0})], self.driver.queries)
+        self.assertEqual([10], self.driver.fetch_sizes)
+
+
+if __name__ == '__main__':
+    unittest.main()